@@ -0,0 +1,1364 @@
+import asyncio 
+import gc 
+import heapq 
+import os 
+import pickle 
+import string 
+import sys 
+from collections import defaultdict, deque 
+from concurrent.futures import ProcessPoolExecutor 
+from contextlib import contextmanager, nullcontext 
+from functools import partial 
+from itertools import chain 
+from math import log1p 
+from threading import Condition, get_ident, local 
+
+
+_UNMEASURED = nullcontext() # stands in for a measurement when an AutoComplete has no instrumentation 
+
+
+@contextmanager 
+def _gc_paused(): 
+    """ 
+    pauses the cyclic garbage collector while a DAWG is built or unpickled. Millions of new nodes would otherwise set 
+    off collections that walk every node built so far, without ever finding garbage 
+    RETURNS: generator 
+    """ 
+    was_enabled = gc.isenabled() 
+    gc.disable() 
+    try: 
+        yield 
+    finally: 
+        if was_enabled: 
+            gc.enable() 
+
+
+class _ReadWriteLock:  
+    def __init__(self):  
+        """  
+        initialises a lock that any number of readers can hold at once, or one writer alone. A writer waits for the  
+        readers already in, and readers that come after a waiting writer wait for it, so changes aren't starved by a  
+        steady stream of searches. A thread can read again while it reads or writes, but mustn't write while it reads  
+        RETURNS: None  
+        """  
+        self._condition = Condition()  
+        self._readers = 0  
+        self._waiting_writers = 0  
+        self._writer = None # ident of the thread writing  
+        self._local = local() # how deep the current thread is in reading()  
+
+    @contextmanager  
+    def reading(self):  
+        """  
+        holds the lock for reading  
+        RETURNS: generator  
+        """  
+        depth = getattr(self._local, 'depth', 0)  
+        if depth or self._writer == get_ident():  
+            self._local.depth = depth + 1  
+            try:  
+                yield  
+            finally:  
+                self._local.depth = depth  
+            return  
+
+        with self._condition:  
+            while self._writer is not None or self._waiting_writers:  
+                self._condition.wait()  
+            self._readers += 1  
+        self._local.depth = 1  
+        try:  
+            yield  
+        finally:  
+            self._local.depth = 0  
+            with self._condition:  
+                self._readers -= 1  
+                if not self._readers:  
+                    self._condition.notify_all()  
+
+    @contextmanager  
+    def writing(self):  
+        """  
+        holds the lock for writing, once every reader has left  
+        RETURNS: generator  
+        """  
+        with self._condition:  
+            self._waiting_writers += 1  
+            while self._writer is not None or self._readers:  
+                self._condition.wait()  
+            self._waiting_writers -= 1  
+            self._writer = get_ident()  
+        try:  
+            yield  
+        finally:  
+            with self._condition:  
+                self._writer = None  
+                self._condition.notify_all()  
+
+
+def _normalise_words(valid_chars_for_string, valid_chars_for_integer, words): 
+    """ 
+    normalises a chunk of words in a worker process of a parallel build 
+    RETURNS: list 
+    """ 
+    normaliser = Normaliser(valid_chars_for_string=valid_chars_for_string, valid_chars_for_integer=valid_chars_for_integer) 
+    return list(normaliser.normalise_many(words)) 
+
+
+def _build_sub_dawg(entries, top_k_descendants, full_stop_words): 
+    """ 
+    builds the DAWG of a group of words in a worker process of a parallel build. entries are (word, normalised word, 
+    original key, count, normalised synonyms) in insertion order. Rankings of the root's children are returned so the 
+    root of the merged DAWG can be ranked without walking the sub-DAWG again. The result is pickled here, with the 
+    garbage collector paused, rather than by the pool 
+    RETURNS: bytes (pickled root, rankings of its children by letter and values shared between nodes) 
+    """ 
+    with _gc_paused(): 
+        dawg = _DawgNode() 
+        for word, normalised_word, original_key, count, normalised_synonyms in entries: 
+            leaf_node = AutoComplete._insert_normalised_branch(dawg, word, normalised_word, original_key=original_key, \
+            count=count) 
+            for normalised_synonym in normalised_synonyms: 
+                AutoComplete._insert_normalised_branch(dawg, word, normalised_synonym, leaf_node=leaf_node, \
+                add_word=False, count=count) 
+
+        child_rankings = shared_values = None 
+        if top_k_descendants: 
+            shared_values = dawg.get_shared_values() 
+            rankings = dawg.build_top_descendants(top_k_descendants, full_stop_words=full_stop_words, \
+            shared_values=shared_values) 
+            child_rankings = {letter: rankings.get(id(child_node)) for letter, child_node in dawg.children.items()} 
+        return pickle.dumps((dawg, child_rankings, shared_values), protocol=pickle.HIGHEST_PROTOCOL) 
+
+
+class AutoComplete: 
+    def __init__(self, words, synonyms=None, full_stop_words=None, valid_chars_for_string=None, valid_chars_for_integer=None, \
+    minimise_dawg=False, frozen_dawg=None, cache=None, normaliser_cache=None, top_k_descendants=10, build_workers=None, \
+    fuzzy_index=None, dawg=None, instrumentation=None, executor=None, normaliser=None, ranking_weights=None, \
+    indexed_attributes=None): 
+        """ 
+        initialises an AutoComplete with a list of words and synonyms. minimise_dawg holds equal suffixes once when 
+        the DAWG is built, with words kept in tables off the shared nodes (see _MinimisedDawg); a minimised DAWG is 
+        read-only. A frozen_dawg (see load_frozen) is queried as is instead of building one from words, as is a dawg 
+        built already (see load). cache and normaliser_cache take a cache 
+        or a factory called with a capacity (see make_cache) for search results and normalised words respectively. 
+        top_k_descendants is how many of the highest-count descendants each node keeps for prefix completion (0 to 
+        rank them by traversal). With build_workers above 1, the DAWG is built across that many processes, if the 
+        modules can be imported by them (see _can_build_in_processes). 
+        fuzzy_index takes a SymSpellIndex, or a factory for one, to find fuzzy matches by lookup instead of walking 
+        the DAWG, for the max_costs it holds enough deletions for. instrumentation takes a SearchInstrumentation to 
+        record how long each stage of a search takes. executor is where search_async runs searches (by default the 
+        event loop's). A normaliser shared with other AutoCompletes is used instead of making one, in which case any 
+        valid characters given must be its own (a ValueError is raised otherwise) and normaliser_cache is ignored. With 
+        ranking_weights, (distance, count, prefix) weights, results are ranked by a score combining their edit distance, 
+        their last word's count and how much of the query they start with, rather than by edit distance alone. 
+        indexed_attributes are keys of words' values that get_all_descendant_words_for_condition can filter on without 
+        testing every descendant: each node keeps a bitmask of the (attribute, value) pairs below it 
+        RETURNS: None 
+        """ 
+        self._lock = _ReadWriteLock() # searches read while add_word, remove_word and update_count write 
+        self._instrumentation = instrumentation 
+        self._executor = executor 
+        self._in_flight = {} # (event loop, search key) -> [future of the search, number of callers waiting on it] 
+        self._sessions = {} # session -> what its latest search_async call is waiting on 
+        self._dawg = frozen_dawg.root if frozen_dawg else dawg
+        self._minimise_dawg = minimise_dawg 
+        self._top_k_descendants = top_k_descendants 
+        self._ranking_weights = tuple(ranking_weights) if ranking_weights else None 
+        self._indexed_attributes = tuple(indexed_attributes) if indexed_attributes else () 
+        self._attribute_bits = {} # (attribute, value) -> its bit in the attribute index's masks 
+        self._attribute_index = None # node -> mask of the (attribute, value) pairs of the words below it 
+        self._words_by_original_key = None # original key -> word, made the first time a result is scored 
+        self._build_workers = build_workers 
+        self._raw_synonyms = synonyms or {} 
+        self._lfu_cache = make_cache(cache) 
+        self._clean_synonyms, self._partial_synonyms = self._get_clean_and_partial_synonyms() 
+        self._reverse_synonyms = self._get_reverse_synonyms(self._clean_synonyms) 
+        self._full_stop_words = set(full_stop_words) if full_stop_words else None 
+        self.words = words 
+        self.original_key = 'original_key' 
+        self.inf = float('inf') 
+        self.prefix_autofill_part_condition_suffix = ' ' 
+        
+        for name, valid_chars in (('valid_chars_for_string', valid_chars_for_string), \
+        ('valid_chars_for_integer', valid_chars_for_integer)): 
+            if normaliser is not None and valid_chars and frozenset(valid_chars) != getattr(normaliser, name): 
+                raise ValueError(f"the shared normaliser's {name} aren't {''.join(sorted(valid_chars))!r}") 
+        self._owns_normaliser = normaliser is None 
+        self.normaliser = normaliser or Normaliser( 
+        valid_chars_for_string=valid_chars_for_string, 
+        valid_chars_for_integer=valid_chars_for_integer, 
+        cache=normaliser_cache) 
+        if frozen_dawg: 
+            self._word_index = frozen_dawg.word_index # partial synonyms were added to words before freezing 
+        elif dawg: 
+            self._word_index = {word: i for i, word in enumerate(self.words)} 
+        else: 
+            self._update_words_with_partial_synonyms() 
+            self._populate_dawg() 
+        if minimise_dawg and not frozen_dawg: 
+            with _gc_paused(): 
+                self._dawg = _MinimisedDawg(self._dawg).root 
+        self._fuzzy_index = self._populate_fuzzy_index(fuzzy_index() if callable(fuzzy_index) else fuzzy_index) 
+        if self._indexed_attributes and not frozen_dawg and not minimise_dawg: # their nodes are made as they're read 
+            self._attribute_index = self._dawg.build_attribute_masks(lambda node: self._get_attribute_mask(node.word)) 
+
+    @classmethod 
+    def load_frozen(cls, path, words=None, **kwargs): 
+        """ 
+        initialises an AutoComplete over a DAWG written by freeze, memory-mapped read-only so that processes share it 
+        and nothing is rebuilt. Without words, each word's count and original key are read from the file. The 
+        synonyms and stop words it was frozen with are used unless kwargs give others, and prefixes are completed 
+        from the stored rankings unless the stop words differ from those they were ranked with 
+        RETURNS: AutoComplete 
+        """ 
+        frozen_dawg = _FrozenDawg(path) 
+        for name, value in frozen_dawg.metadata.items(): 
+            kwargs.setdefault(name, value) 
+        if set(kwargs.get('full_stop_words') or ()) != set(frozen_dawg.metadata.get('full_stop_words') or ()): 
+            frozen_dawg.has_rankings = False 
+        return cls(frozen_dawg.words if words is None else words, frozen_dawg=frozen_dawg, **kwargs) 
+
+    def freeze(self, path): 
+        """ 
+        writes the DAWG with its rankings, the counts and original keys of words, and the synonyms and stop words to a 
+        compact file for load_frozen 
+        RETURNS: None 
+        """ 
+        with self._lock.reading(): 
+            freeze_dawg(self._dawg, self.words, path, original_key=self.original_key, metadata={ 
+            'synonyms': self._raw_synonyms, 
+            'full_stop_words': sorted(self._full_stop_words) if self._full_stop_words else None}) 
+
+    def save(self, path, cache_entries=1024): 
+        """ 
+        writes a snapshot of the AutoComplete for load: its DAWG and rankings, words, synonym maps and settings, and 
+        the cache_entries most frequently used entries of its search and normaliser caches (unless the normaliser is 
+        shared, as its entries aren't only this AutoComplete's). Words' values must be JSON serialisable 
+        RETURNS: None 
+        """ 
+        with self._lock.reading(), _gc_paused(): 
+            metadata = { 
+            'words': list(self.words.items()), 
+            'synonyms': self._raw_synonyms, 
+            'clean_synonyms': self._clean_synonyms, 
+            'partial_synonyms': self._partial_synonyms, 
+            'reverse_synonyms': self._reverse_synonyms, 
+            'settings': { 
+            'full_stop_words': sorted(self._full_stop_words) if self._full_stop_words else None, 
+            'valid_chars_for_string': ''.join(sorted(self.normaliser.valid_chars_for_string)), 
+            'valid_chars_for_integer': ''.join(sorted(self.normaliser.valid_chars_for_integer)), 
+            'minimise_dawg': self._minimise_dawg, 
+            'top_k_descendants': self._top_k_descendants, 
+            'ranking_weights': self._ranking_weights, 
+            'indexed_attributes': list(self._indexed_attributes) or None}, 
+            'cache': self._get_cache_entries(self._lfu_cache, cache_entries), 
+            'normaliser_cache': self._get_cache_entries(self.normaliser._normalised_lfu_cache, \
+            cache_entries if self._owns_normaliser else 0)} 
+            write_snapshot(path, self._dawg, self.words, metadata, original_key=self.original_key) 
+
+    @classmethod 
+    def load(cls, path, **kwargs): 
+        """ 
+        initialises an AutoComplete from a snapshot written by save, without building the DAWG or its rankings, and 
+        warms its caches with the saved entries. kwargs are passed on for settings a snapshot doesn't hold, such as 
+        the caches or fuzzy_index 
+        RETURNS: AutoComplete 
+        """ 
+        with _gc_paused(): 
+            metadata, dawg = read_snapshot(path) 
+            words = dict(metadata['words']) 
+            dawg.intern_strings({word: word for word in words}) 
+        autocomplete = cls(words, synonyms=metadata['synonyms'], dawg=dawg, **metadata['settings'], **kwargs) 
+        autocomplete._clean_synonyms = metadata['clean_synonyms'] 
+        autocomplete._partial_synonyms = metadata['partial_synonyms'] 
+        autocomplete._reverse_synonyms = metadata['reverse_synonyms'] 
+        autocomplete._set_cache_entries(autocomplete._lfu_cache, metadata['cache']) 
+        autocomplete._set_cache_entries(autocomplete.normaliser._normalised_lfu_cache, metadata['normaliser_cache']) 
+        return autocomplete 
+
+    def memory_report(self): 
+        """ 
+        reports the DAWG's node counts and bytes per component (see _DawgNode.memory_report), with the bytes of the 
+        words' values and the synonym maps and the number of cached entries 
+        RETURNS: dictionary 
+        """ 
+        with self._lock.reading(): 
+            report = self._dawg.memory_report() 
+            sizes = report['bytes'] 
+            sizes['words'] = sys.getsizeof(self.words) + sum(map(sys.getsizeof, self.words.values())) 
+            sizes['synonyms'] = sum(sys.getsizeof(synonyms) + sum(map(sys.getsizeof, synonyms.values())) for synonyms in \
+            (self._raw_synonyms, self._clean_synonyms, self._partial_synonyms, self._reverse_synonyms)) 
+            if self._attribute_index is not None: 
+                sizes['attribute_index'] = sys.getsizeof(self._attribute_index) + \
+                sum(map(sys.getsizeof, {id(mask): mask for mask in self._attribute_index.values()}.values())) 
+            sizes['total'] = sum(size for component, size in sizes.items() if component != 'total') 
+        for name, cache in (('cache', self._lfu_cache), ('normaliser_cache', self.normaliser._normalised_lfu_cache)): 
+            if hasattr(cache, '__len__'): 
+                report[f'{name}_entries'] = len(cache) 
+        return report 
+
+    @staticmethod 
+    def _get_cache_entries(cache, limit): 
+        """ 
+        helper method gets a cache's most frequently used entries, if it can list them 
+        RETURNS: list 
+        """ 
+        if not limit or not hasattr(cache, 'get_entries'): 
+            return [] 
+        return cache.get_entries(limit) 
+
+    @staticmethod 
+    def _set_cache_entries(cache, entries): 
+        """ 
+        helper method warms a cache with saved entries, with their frequencies if it keeps them 
+        RETURNS: None 
+        """ 
+        if hasattr(cache, 'set_entries'): 
+            cache.set_entries(entries) 
+        else: 
+            for key, value, _ in reversed(entries): 
+                cache.set_value(key, value) 
+
+    def _get_clean_and_partial_synonyms(self): 
+        """ 
+        helper method retrieves clean and partial synonyms. Synonyms are words that should produce the same result 
+        RETURNS: dictionary 
+        """ 
+        clean_synonyms = {} # phrases that share little or no words 
+        partial_synonyms = {} # one phrase is a substring of another 
+        
+        for key, synonyms in self._raw_synonyms.items(): 
+            key = key.strip().lower() 
+            _clean, _partial = [], [] 
+            for syn in synonyms: 
+                syn = syn.strip().lower() 
+                if key.startswith(syn):
+                    _partial.append(syn)
+                else:
+                    _clean.append(syn)
+            if _clean:
+                clean_synonyms[key] = _clean
+            if _partial:
+                partial_synonyms[key] = _partial
+
+        return clean_synonyms, partial_synonyms
+
+    def _get_reverse_synonyms(self, synonyms): 
+        """ 
+        helper method retrieves reverse synonyms to be sorted 
+        RETURNS: dictionary 
+        """ 
+        result = {} 
+        if synonyms: 
+            for key, value in synonyms.items(): 
+                for item in value: 
+                    result[item] = key 
+        return result 
+
+    def _get_partial_synonyms_to_words(self): 
+        new_words = {} 
+        for key, value in self.words.items(): 
+            try: 
+                value = value.copy() 
+            except Exception: 
+                new_value = value._asdict() 
+                new_value[self.original_key] = key 
+                value = type(value)(**new_value) 
+            else: 
+                value[self.original_key] = key 
+            for syn_key, syns in self._partial_synonyms.items(): 
+                if key.startswith(syn_key): 
+                    for syn in syns: 
+                        new_key = key.replace(syn_key, syn) 
+                        new_words[new_key] = value 
+        return new_words 
+
+    def _update_words_with_partial_synonyms(self): 
+        """ 
+        helper method adds the partial synonyms of words as words of their own 
+        RETURNS: None 
+        """ 
+        for key, value in self._get_partial_synonyms_to_words().items(): 
+            self.words[key] = value 
+
+    def _populate_dawg(self): 
+        """ 
+        inserts words and their synonyms into the DAWG 
+        RETURNS: None 
+        """ 
+        if not self._dawg: 
+            with self._lock.writing(), _gc_paused(): 
+                self._word_index = {word: i for i, word in enumerate(self.words)} 
+                if self._build_workers and self._build_workers > 1 and self._can_build_in_processes(): 
+                    self._populate_dawg_in_parallel() 
+                    return 
+
+                self._dawg = _DawgNode() 
+                for word, value in self.words.items(): 
+                    self._insert_word_and_synonyms(word, value) 
+                if self._top_k_descendants: 
+                    self._dawg.build_top_descendants(self._top_k_descendants, full_stop_words=self._full_stop_words) 
+
+    @staticmethod 
+    def _can_build_in_processes(): 
+        """ 
+        helper method checks that what a parallel build sends to and gets back from its worker processes can be 
+        pickled, which needs the functions and classes to be in a module that can be imported. When they can't, as 
+        when the modules are run in a namespace of their own rather than imported, the DAWG is built serially 
+        RETURNS: bool 
+        """ 
+        try: 
+            pickle.dumps((_normalise_words, _build_sub_dawg, _DawgNode, _NO_CHILDREN, _OneChild)) 
+        except (pickle.PicklingError, AttributeError, TypeError): 
+            return False 
+        return True 
+
+    def _populate_dawg_in_parallel(self): 
+        """ 
+        helper method builds the DAWG in a pool of build_workers processes. Words and synonyms are normalised in 
+        chunks, then split into groups by the first letter of their paths. Each group is built and ranked by a worker 
+        and its branches are moved under the root. A word's synonyms and the words sharing its value are kept in its 
+        group, so the DAWG comes out as a serial build's would 
+        RETURNS: None 
+        """ 
+        words = list(self.words.items()) 
+        synonyms = [self._clean_synonyms.get(word, []) for word, _ in words] 
+        names = [word for word, _ in words] + list(chain.from_iterable(synonyms)) 
+        chunk_size = len(names) // (self._build_workers * 4) + 1 
+
+        with ProcessPoolExecutor(max_workers=self._build_workers) as executor: 
+            normalise_words = partial(_normalise_words, self.normaliser.valid_chars_for_string, \
+            self.normaliser.valid_chars_for_integer) 
+            normalised_names = list(chain.from_iterable(executor.map(normalise_words, \
+            [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]))) 
+
+            entries = [] 
+            inserted_names = [] # names in insertion order, for insert_word_callback 
+            synonym_position = len(words) 
+            for (word, value), normalised_word, word_synonyms in zip(words, normalised_names, synonyms): 
+                synonym_pairs = zip(word_synonyms, normalised_names[synonym_position:synonym_position + len(word_synonyms)]) 
+                synonym_position += len(word_synonyms) 
+                if not normalised_word: 
+                    continue 
+                synonym_pairs = [(synonym, normalised_synonym) for synonym, normalised_synonym in synonym_pairs \
+                if normalised_synonym] 
+                entries.append((word, normalised_word, value.get(self.original_key), value.get('count', 0), \
+                [normalised_synonym for _, normalised_synonym in synonym_pairs])) 
+                inserted_names.append(word) 
+                inserted_names.extend(synonym for synonym, _ in synonym_pairs) 
+
+            futures = [executor.submit(_build_sub_dawg, group, self._top_k_descendants, self._full_stop_words) \
+            for group in self._group_entries_by_letter(entries)] 
+            results = [pickle.loads(future.result()) for future in futures] 
+
+        branches = {} 
+        rankings = {} 
+        shared_values = set() 
+        for sub_dawg, child_rankings, sub_shared_values in results: 
+            branches.update(sub_dawg.children) 
+            if child_rankings: 
+                rankings.update((id(sub_dawg.children[letter]), ranking) for letter, ranking in child_rankings.items()) 
+                shared_values.update(sub_shared_values) 
+
+        self._dawg = _DawgNode() 
+        letters = dict.fromkeys(path[0] for entry in entries for path in [entry[1], *entry[4]]) # first-insertion order 
+        self._dawg.set_children({letter: branches[letter] for letter in letters}) 
+        self._dawg.intern_strings({word: word for word in self.words}) # nodes were unpickled with copies of words 
+        for name in inserted_names: 
+            self.insert_word_callback(name) 
+
+        if self._top_k_descendants: 
+            self._dawg.set_top_descendants(self._top_k_descendants, rankings, self._full_stop_words or set(), \
+            shared_values) 
+
+    @staticmethod 
+    def _group_entries_by_letter(entries): 
+        """ 
+        helper method splits the entries of a parallel build into groups that can be built apart. Entries whose paths 
+        start with the same letter, that are linked by a synonym or that share a value go in the same group 
+        RETURNS: list 
+        """ 
+        parents = {} # letter -> letter of the same group, the group's own letter pointing to itself 
+
+        def find_group(letter): 
+            while parents.setdefault(letter, letter) != letter: 
+                parents[letter] = parents[parents[letter]] 
+                letter = parents[letter] 
+            return letter 
+
+        value_letters = {} 
+        for word, normalised_word, original_key, _, normalised_synonyms in entries: 
+            group = find_group(normalised_word[0]) 
+            linked_letters = [value_letters.setdefault(original_key or word, group)] 
+            linked_letters.extend(normalised_synonym[0] for normalised_synonym in normalised_synonyms) 
+            for letter in linked_letters: 
+                parents[find_group(letter)] = group 
+
+        groups = defaultdict(list) 
+        for entry in entries: 
+            groups[find_group(entry[1][0])].append(entry) 
+        return list(groups.values()) 
+
+    def _populate_fuzzy_index(self, fuzzy_index): 
+        """ 
+        helper method adds every word to a fuzzy index at the path whose DAWG node holds it, the words a DAWG walk 
+        would find 
+        RETURNS: fuzzy index/None 
+        """ 
+        if fuzzy_index is not None: 
+            for word in self.words: 
+                self._update_fuzzy_index(fuzzy_index, self.normaliser.normalise_node_name(word)) 
+        return fuzzy_index 
+
+    def _update_fuzzy_index(self, fuzzy_index, path): 
+        """ 
+        helper method sets the word a fuzzy index has at a path to the word the DAWG node there holds, if its own path 
+        leads to it 
+        RETURNS: None 
+        """ 
+        node = self._dawg 
+        for letter in path: 
+            node = node.children.get(letter) 
+            if node is None: 
+                break 
+        if path and node is not None and node.word in self._word_index and \
+        self.normaliser.normalise_node_name(node.word) == path: 
+            fuzzy_index.add(path, node.word) 
+        else: 
+            fuzzy_index.remove(path) 
+
+    def _insert_word_and_synonyms(self, word, value, copy_on_write=False): 
+        """ 
+        helper method inserts a word and its clean synonyms, which share the word's leaf node 
+        RETURNS: leaf node 
+        """ 
+        original_key = value.get(self.original_key) 
+        count = value.get('count', 0) 
+        leaf_node = self.insert_word_branch(word, original_key=original_key, count=count, copy_on_write=copy_on_write) 
+        
+        if leaf_node and self._clean_synonyms: 
+            synonyms = self._clean_synonyms.get(word, []) 
+            for synonym in synonyms:
+                self.insert_word_branch(synonym, leaf_node=leaf_node, add_word=False, count=count, copy_on_write=copy_on_write)
+        return leaf_node 
+
+    def insert_word_callback(self, word): 
+        """ 
+        callback function after a word is inserted 
+        RETURNS: None 
+        """ 
+        pass 
+
+    def insert_word_branch(self, word, leaf_node=None, add_word=True, original_key=None, count=0, copy_on_write=False): 
+        """ 
+        inserts a word into the DAWG and updates its present leaf node 
+        RETURNS: leaf node 
+        """ 
+        normalised_word = self.normaliser.normalise_node_name(word) 
+        if not normalised_word: 
+            return 
+        leaf_node = self._insert_normalised_branch(self._dawg, word, normalised_word, leaf_node=leaf_node, \
+        add_word=add_word, original_key=original_key, count=count, copy_on_write=copy_on_write) 
+        self.insert_word_callback(word) 
+        return leaf_node 
+
+    @staticmethod 
+    def _insert_normalised_branch(dawg, word, normalised_word, leaf_node=None, add_word=True, original_key=None, count=0, \
+    copy_on_write=False): 
+        """ 
+        helper method inserts an already normalised word into a DAWG, merging its last letter into leaf_node if given 
+        RETURNS: leaf node 
+        """ 
+        last_char = normalised_word[-1] 
+
+        if leaf_node: 
+            temp_leaf_node = dawg.insert_dawg_node(word=word, normalised_word=normalised_word[:-1], \
+            add_word=add_word, original_key=original_key, count=count, insert_count=True, copy_on_write=copy_on_write) 
+            if temp_leaf_node.children and last_char in temp_leaf_node.children: 
+                temp_leaf_node.children[last_char].word = leaf_node.word 
+            else: # merge into leaf node if it doesn't have children 
+                temp_leaf_node.set_child(last_char, leaf_node, copy_on_write=copy_on_write) 
+
+        else: 
+            leaf_node = dawg.insert_dawg_node(word=word, normalised_word=normalised_word, \
+            original_key=original_key, count=count, insert_count=True, copy_on_write=copy_on_write) 
+        return leaf_node 
+
+    def add_word(self, word, value=None): 
+        """ 
+        adds a word (with its count and original key in value) and its clean synonyms to the live DAWG, or replaces 
+        the value of a word that's already there 
+        RETURNS: None 
+        """ 
+        value = {} if value is None else value 
+        with self._lock.writing(): 
+            self._check_mutable() 
+            if word in self.words: 
+                self._remove_word(word) 
+            self.words[word] = value 
+            self._word_index[word] = next(reversed(self._word_index.values()), -1) + 1 
+            self._insert_word_and_synonyms(word, value, copy_on_write=True) 
+            self._after_word_change(word) 
+
+    def remove_word(self, word): 
+        """ 
+        removes a word and its clean synonyms from the live DAWG 
+        RETURNS: bool (False if the word wasn't there) 
+        """ 
+        with self._lock.writing(): 
+            self._check_mutable() 
+            if word not in self.words: 
+                return False 
+            self._remove_word(word) 
+            self._after_word_change(word) 
+            return True 
+
+    def update_count(self, word, count): 
+        """ 
+        updates the count of a word in place 
+        RETURNS: bool (False if the word isn't in the DAWG) 
+        """ 
+        with self._lock.writing(): 
+            self._check_mutable() 
+            node = self._get_word_node(word) 
+            if node is None: 
+                return False 
+            self.words[word]['count'] = count 
+            node.count = int(count) 
+            self._after_word_change(word) 
+            return True 
+
+    def _check_mutable(self): 
+        """ 
+        helper method raises if the DAWG can't be changed in place, as frozen and minimised DAWGs are read-only 
+        RETURNS: None 
+        """ 
+        if isinstance(self._dawg, _FrozenDawgNode): 
+            raise TypeError("a frozen DAWG is read-only") 
+        if isinstance(self._dawg, _MinimisedDawgNode): 
+            raise TypeError("a minimised DAWG is read-only") 
+
+    def _get_word_paths(self, word): 
+        """ 
+        helper method gets the normalised paths of a word and its clean synonyms 
+        RETURNS: list 
+        """ 
+        paths = [self.normaliser.normalise_node_name(word)] 
+        paths.extend(self.normaliser.normalise_node_name(synonym) for synonym in self._clean_synonyms.get(word, [])) 
+        return [path for path in paths if path] 
+
+    def _get_word_node(self, word): 
+        """ 
+        helper method finds the node holding a word 
+        RETURNS: node/None 
+        """ 
+        node = self._dawg 
+        for letter in self.normaliser.normalise_node_name(word): 
+            node = node.children.get(letter) 
+            if node is None: 
+                return None 
+        return node if node.word == word else None 
+
+    def _remove_word(self, word): 
+        """ 
+        helper method clears a word's node and prunes the branches of it and its synonyms that lead nowhere else 
+        RETURNS: None 
+        """ 
+        node = self._get_word_node(word) 
+        if node is not None: 
+            node.word = node.original_key = None 
+            node.count = 0 
+            for path in self._get_word_paths(word): 
+                self._dawg.remove_dawg_branch(path) 
+        del self.words[word] 
+        self._word_index.pop(word, None) 
+
+    def _after_word_change(self, word): 
+        """ 
+        helper method refreshes the rankings along a changed word's paths and invalidates the cached searches it 
+        could have changed 
+        RETURNS: None 
+        """ 
+        self._words_by_original_key = None 
+        paths = self._get_word_paths(word) 
+        linked_paths = self._get_linked_paths(paths) 
+        if self._top_k_descendants: 
+            get_path = lambda node: self.normaliser.normalise_node_name(node.word) 
+            for path in paths[:1] + [path[:-1] for path in paths[1:]] + [path for path, _ in linked_paths]: 
+                self._dawg.refresh_top_descendants(path, self._top_k_descendants, get_path, \
+                full_stop_words=self._full_stop_words) 
+        if self._fuzzy_index is not None: 
+            for path in paths: 
+                self._update_fuzzy_index(self._fuzzy_index, path) 
+        paths.extend(reached_path for _, reached_path in linked_paths) 
+        if self._attribute_index is not None: 
+            self._index_attributes_along_paths(word, paths) 
+        self._lfu_cache.invalidate(lambda key, result: self._is_search_affected(key, result, word, paths)) 
+
+    def _get_attribute_mask(self, word): 
+        """ 
+        helper method gets the bits of the indexed (attribute, value) pairs of a word's value, giving pairs not seen 
+        before the next free bits 
+        RETURNS: integer 
+        """ 
+        word_info = self.words.get(word) if word else None 
+        mask = 0 
+        if word_info: 
+            for attribute in self._indexed_attributes: 
+                if attribute in word_info: 
+                    pair = (attribute, word_info[attribute]) 
+                    bit = self._attribute_bits.get(pair) 
+                    if bit is None: 
+                        bit = self._attribute_bits[pair] = 1 << len(self._attribute_bits) 
+                    mask |= bit 
+        return mask 
+
+    def _index_attributes_along_paths(self, word, paths): 
+        """ 
+        helper method adds a changed word's bits to the masks of the nodes along the paths it's reached by. The bits 
+        of a removed or replaced value are left, as a mask only has to cover the words below a node to skip it safely 
+        RETURNS: None 
+        """ 
+        mask = self._get_attribute_mask(word) 
+        if not mask: 
+            return 
+        attribute_index = self._attribute_index 
+        for path in paths: 
+            node = self._dawg 
+            attribute_index[node] = attribute_index.get(node, 0) | mask 
+            for letter in path: 
+                node = node.children.get(letter) 
+                if node is None: 
+                    break 
+                attribute_index[node] = attribute_index.get(node, 0) | mask 
+
+    def _get_linked_paths(self, paths): 
+        """ 
+        helper method finds the other ways into changed paths: a synonym shares its word's leaf node, so everything 
+        below a word is also below each of its synonyms. Synonyms of the words along the paths are followed in turn, 
+        each once, so synonyms looping back up their own branch end the search 
+        RETURNS: list of (path to the synonym's parent node, path the change is reached by) 
+        """ 
+        linked_paths = [] 
+        seen_synonym_paths = set(paths) 
+        paths = list(paths) 
+        while paths: 
+            path = paths.pop() 
+            node = self._dawg 
+            for depth, letter in enumerate(path, 1): 
+                node = node.children.get(letter) 
+                if node is None: 
+                    break 
+                for synonym_path in self._get_word_paths(node.word)[1:] if node.word else []: 
+                    if synonym_path not in seen_synonym_paths: 
+                        seen_synonym_paths.add(synonym_path) 
+                        reached_path = synonym_path + path[depth:] 
+                        paths.append(reached_path) 
+                        linked_paths.append((synonym_path[:-1], reached_path)) 
+        return linked_paths 
+
+    def _is_search_affected(self, key, result, word, paths): 
+        """ 
+        helper method checks if a cached search could change with a word: if it returned the word, if any of its 
+        tokens shares a first letter with, or is within max_cost edits of a prefix of, one of the word's paths, or if 
+        the search completes from the root, as it does when a part of the query matches no prefix. The root is above 
+        every path, so its descendants can change with any word 
+        RETURNS: bool 
+        """ 
+        query, max_cost, _ = key.rsplit('-', 2) 
+        max_cost = int(max_cost) 
+        if any(word in output_items for output_items in result): 
+            return True 
+        tokens = list(filter(None, query.split(' '))) 
+        for token in tokens: 
+            for path in paths: 
+                if token[0] == path[0] or self._get_prefix_distance(token, path) < max_cost: 
+                    return True 
+        return any(self._prefix_autofill(' '.join(tokens[i:]))[2] is self._dawg for i in range(len(tokens))) 
+
+    @staticmethod 
+    def _get_prefix_distance(word, other_word): 
+        """ 
+        helper method finds the smallest Levenshtein distance between a word and any prefix of another word 
+        RETURNS: integer 
+        """ 
+        row = list(range(len(word) + 1)) 
+        min_distance = row[-1] 
+        for letter in other_word: 
+            prev_row, row = row, [row[0] + 1] 
+            for i in range(1, len(word) + 1): 
+                row.append(min(row[i - 1] + 1, prev_row[i] + 1, prev_row[i - 1] + (word[i - 1] != letter))) 
+            min_distance = min(min_distance, row[-1]) 
+        return min_distance 
+
+    def _sort_words(self, word, max_cost, size, memo=None): 
+        """ 
+        helper method to sort results based on a given word's size and cost in terms of Levenshtein distance, or by 
+        score with ranking_weights, in which case only the best size results are kept in a heap as they're found 
+        RETURNS: generator 
+        """ 
+        results, find_steps = self._find_words(word, max_cost, size, memo=memo)
+        if self._instrumentation: 
+            self._instrumentation.record_find_steps(find_steps) 
+        unique_results = self._get_unique_results(results) 
+        if self._ranking_weights: 
+            for _, output_items in heapq.nsmallest(size, unique_results, key=partial(self._get_result_score, word)): 
+                yield output_items 
+            return 
+        for count, (_, output_items) in enumerate(unique_results, 1): 
+            yield output_items 
+            if count >= size: 
+                return 
+
+    def _get_unique_results(self, results): 
+        """ 
+        helper method replaces synonyms in results with the words they stand for and drops repeated results 
+        RETURNS: generator of (distance, result), closest first 
+        """ 
+        seen_results = set() 
+        for distance in sorted(results): 
+            for output_items in results[distance]: 
+                with self._measure(SearchStage.synonym_reversal): 
+                    for i, item in enumerate(output_items): 
+                        reversed_item = self._reverse_synonyms.get(item) 
+                        if reversed_item: 
+                            output_items[i] = reversed_item 
+                output_key = tuple(output_items) 
+                if output_key not in seen_results: 
+                    seen_results.add(output_key) 
+                    yield distance, output_items 
+
+    def _get_result_score(self, word, distance_and_result): 
+        """ 
+        helper method scores a result by ranking_weights, lower being better: its edit distance, less the log of its 
+        last word's count and the share of the query it starts with 
+        RETURNS: float 
+        """ 
+        distance, output_items = distance_and_result 
+        distance_weight, count_weight, prefix_weight = self._ranking_weights 
+        value = self.words.get(self._get_output_word(output_items[-1])) if output_items else None 
+        count = int(value.get('count') or 0) if isinstance(value, dict) else 0 
+        result = self.normaliser.normalise_node_name(' '.join(output_items)) 
+        prefix_length = len(os.path.commonprefix((word, result))) 
+        return distance_weight * distance - count_weight * log1p(max(0, count)) - prefix_weight * prefix_length / len(word) 
+
+    def _get_output_word(self, output): 
+        """ 
+        helper method finds the word a result's output stands for: itself if it's a word, or else the word it's the 
+        original key of 
+        RETURNS: string/None 
+        """ 
+        if output in self.words: 
+            return output 
+        words_by_original_key = self._words_by_original_key 
+        if words_by_original_key is None: 
+            words_by_original_key = self._words_by_original_key = {value[self.original_key]: word \
+            for word, value in self.words.items() if isinstance(value, dict) and value.get(self.original_key)} 
+        return words_by_original_key.get(output) 
+
+    def search_for_similar_words(self, word, max_cost=2, size=5): 
+        """ 
+        searches for words similar to the given word within a Levenshtein distance and size. 
+        RETURNS: list 
+        """ 
+        with self._trace(word): 
+            with self._measure(SearchStage.normalisation): 
+                word = self.normaliser.normalise_node_name(word) 
+            if not word: 
+                return [] 
+            key = f'{word}-{max_cost}-{size}' 
+            result = self._get_cached_result(key) 
+            if result == -1: 
+                result = self._search_and_cache(key, word, max_cost, size) 
+            return result 
+
+    def _search_and_cache(self, key, word, max_cost, size): 
+        """ 
+        helper method searches for a normalised word that isn't cached and caches its result 
+        RETURNS: list 
+        """ 
+        with self._lock.reading(): # a change can't come between the search and caching its result 
+            result = list(self._sort_words(word, max_cost, size)) 
+            with self._measure(SearchStage.cache): 
+                self._lfu_cache.set_value(key, result) 
+        return result 
+
+    async def search_async(self, word, max_cost=2, size=5, session=None): 
+        """ 
+        searches as search_for_similar_words does without blocking the event loop: cached results are returned 
+        straight away and anything else is searched in the executor. Concurrent identical searches share one 
+        computation. A search made for a session cancels the session's previous one if it's still waiting, e.g. when 
+        a newer keystroke supersedes it; the shared computation is only cancelled once nobody waits on it, and can't 
+        be stopped once the executor has started it 
+        RETURNS: list 
+        """ 
+        if session is not None: 
+            superseded = self._sessions.pop(session, None) 
+            if superseded is not None: 
+                superseded.cancel() 
+        word = self.normaliser.normalise_node_name(word) 
+        if not word: 
+            return [] 
+        key = f'{word}-{max_cost}-{size}' 
+        result = self._get_cached_result(key) 
+        if result != -1: 
+            return result 
+
+        loop = asyncio.get_running_loop() 
+        flight_key = (loop, key) 
+        flight = self._in_flight.get(flight_key) 
+        if flight is None: 
+            future = loop.run_in_executor(self._executor, self._search_and_cache, key, word, max_cost, size) 
+            flight = self._in_flight[flight_key] = [future, 0] 
+            future.add_done_callback(partial(self._end_flight, flight_key, flight)) 
+        flight[1] += 1 
+        waiter = asyncio.shield(flight[0]) # so a caller giving up doesn't cancel the search for the others 
+        if session is not None: 
+            self._sessions[session] = waiter 
+        try: 
+            return await waiter 
+        finally: 
+            if session is not None and self._sessions.get(session) is waiter: 
+                del self._sessions[session] 
+            flight[1] -= 1 
+            if not flight[1] and not flight[0].done(): # every caller gave up 
+                flight[0].cancel() 
+                self._end_flight(flight_key, flight, flight[0]) 
+
+    def _end_flight(self, flight_key, flight, future): 
+        """ 
+        helper method forgets a search_async computation once it's finished or cancelled 
+        RETURNS: None 
+        """ 
+        if self._in_flight.get(flight_key) is flight: 
+            del self._in_flight[flight_key] 
+
+    def _measure(self, stage): 
+        """ 
+        helper method times a stage of a search if the AutoComplete has instrumentation 
+        RETURNS: context manager 
+        """ 
+        if self._instrumentation is None: 
+            return _UNMEASURED 
+        return self._instrumentation.measure(stage) 
+
+    def _trace(self, word): 
+        """ 
+        helper method records a whole search if the AutoComplete has instrumentation 
+        RETURNS: context manager 
+        """ 
+        if self._instrumentation is None: 
+            return _UNMEASURED 
+        return self._instrumentation.trace(word) 
+
+    def _get_cached_result(self, key): 
+        """ 
+        helper method looks a search up in the cache, as a measured stage 
+        RETURNS: list (-1 if the search isn't cached) 
+        """ 
+        with self._measure(SearchStage.cache): 
+            result = self._lfu_cache.get_value(key) 
+        if result != -1 and self._instrumentation: 
+            self._instrumentation.record_cache_hit() 
+        return result 
+
+    def search_many(self, words, max_cost=2, size=5): 
+        """ 
+        searches for words similar to each of the given words, as search_for_similar_words does. Identical queries are 
+        answered once, and queries sharing a prefix reuse each other's DAWG walks, fuzzy ones included 
+        RETURNS: list of lists, in the order of words 
+        """ 
+        with self._trace(words): 
+            with self._measure(SearchStage.normalisation): 
+                normalised_words = list(self.normaliser.normalise_many(words)) 
+            results = {'': []} 
+            uncached_words = [] 
+            for word in sorted(set(normalised_words) - {''}): 
+                result = self._get_cached_result(f'{word}-{max_cost}-{size}') 
+                if result == -1: 
+                    uncached_words.append(word) 
+                else: 
+                    results[word] = result 
+
+            with self._lock.reading(): # a change can't come between the searches and caching their results 
+                memo = {} 
+                fuzzy_words = set() 
+                for word in uncached_words: # walks the DAWG once for all the fuzzy words that share a prefix 
+                    with self._measure(SearchStage.prefix_autofill): 
+                        matched_prefix_of_last_word, rest_of_word, _, matched_words = self._prefix_autofill(word=word, memo=memo) 
+                    last_word = matched_prefix_of_last_word + rest_of_word 
+                    if len(rest_of_word) >= 3 and last_word.strip() and \
+                    not self._is_stop_word_condition(matched_words, matched_prefix_of_last_word): 
+                        fuzzy_words.add(self._split_fuzzy_word(last_word)[0]) 
+                if fuzzy_words: 
+                    with self._measure(SearchStage.fuzzy_scan): 
+                        self._prefetch_fuzzy_words(fuzzy_words, max_cost, memo) 
+
+                for word in uncached_words: 
+                    results[word] = list(self._sort_words(word, max_cost, size, memo=memo)) 
+                    with self._measure(SearchStage.cache): 
+                        self._lfu_cache.set_value(f'{word}-{max_cost}-{size}', results[word]) 
+            return [results[word] for word in normalised_words] 
+
+    @staticmethod
+    def _len_results(results):
+        return sum(map(len, results.values()))
+
+    @staticmethod
+    def _is_enough_results(results, size):
+        return AutoComplete._len_results(results) >= size
+
+    def _is_stop_word_condition(self, matched_words, matched_prefix_of_last_word): 
+        """ 
+        helper method checks if the stop word condition is met 
+        RETURNS: bool 
+        """ 
+        return (self._full_stop_words and matched_words and matched_words[-1] in self._full_stop_words and not matched_prefix_of_last_word)
+
+    def _find_words(self, word, max_cost, size, call_count=0, memo=None): 
+        """ 
+        helper method finds similar words via fuzzy string matching. A memo dictionary shares DAWG walks between the 
+        queries of a batch 
+        RETURNS: tuple 
+        """ 
+        results = defaultdict(list) 
+        fuzzy_matches = defaultdict(list) 
+        rest_of_results = {} 
+        fuzzy_matches_len = 0 
+        fuzzy_min_distance = min_distance = self.inf 
+        with self._measure(SearchStage.prefix_autofill): 
+            matched_prefix_of_last_word, rest_of_word, new_node, matched_words = self._prefix_autofill(word=word, memo=memo) 
+        last_word = matched_prefix_of_last_word + rest_of_word 
+
+        if matched_words: 
+            results[0] = [matched_words.copy()]
+            min_distance = 0 
+            if self._is_stop_word_condition(matched_words, matched_prefix_of_last_word): 
+                find_steps = [FindStep.start] 
+                return results, find_steps 
+
+        if len(rest_of_word) < 3: 
+            find_steps = [FindStep.descendant_only] 
+            self._add_descendant_words_to_results(node=new_node, size=size, matched_words=matched_words, results=results, distance=1, \
+            memo=memo) 
+        else: 
+            find_steps = [FindStep.fuzzy_try] 
+            new_word, fuzzy_rest_of_word = self._split_fuzzy_word(last_word) 
+
+            with self._measure(SearchStage.fuzzy_scan): 
+                fuzzy_words = self._get_fuzzy_words(new_word, max_cost, memo=memo) 
+            for _word, dist in fuzzy_words: 
+                fuzzy_matches_len += 1 
+                _value = self.words[_word].get(self.original_key, _word) 
+                fuzzy_matches[dist].append(_value) 
+                fuzzy_min_distance = min(fuzzy_min_distance, dist) 
+
+                if fuzzy_matches_len >= size or dist < 2: 
+                    break 
+
+            if fuzzy_matches_len: 
+                find_steps.append(FindStep.fuzzy_found) 
+                if fuzzy_rest_of_word: 
+                    call_count += 1 
+                    if call_count < 2: 
+                        rest_of_results, rest_find_steps = self._find_words(word=fuzzy_rest_of_word, max_cost=max_cost, \
+                        size=size, call_count=call_count, memo=memo) 
+                        find_steps.append({FindStep.rest_of_fuzzy: rest_find_steps}) 
+
+                for _word in fuzzy_matches[fuzzy_min_distance]: 
+                    if rest_of_results: 
+                        rest_of_results_min_key = min(rest_of_results.keys()) 
+                        for _rest_of_matched_word in rest_of_results[rest_of_results_min_key]: 
+                            results[fuzzy_min_distance].append(matched_words + [_word] + _rest_of_matched_word) 
+                    else: 
+                        results[fuzzy_min_distance].append(matched_words + [_word]) 
+                        with self._measure(SearchStage.prefix_autofill): 
+                            _matched_prefix_of_last_word_b, not_used_rest_of_word, fuzzy_new_node, _matched_words_b = \
+                            self._prefix_autofill(word=_word, memo=memo) 
+                        if self._is_stop_word_condition(matched_words=_matched_words_b, matched_prefix_of_last_word=_matched_prefix_of_last_word_b): 
+                            break 
+                        self._add_descendant_words_to_results(node=fuzzy_new_node, size=size, matched_words=matched_words, \
+                        results=results, distance=fuzzy_min_distance, memo=memo) 
+
+            if matched_words and not self._is_enough_results(results, size):
+                find_steps.append(FindStep.not_enough_results_add_some_descandants) 
+                total_min_distance = min(min_distance, fuzzy_min_distance) 
+                self._add_descendant_words_to_results(node=new_node, size=size, matched_words=matched_words, results=results, \
+                distance=total_min_distance+1, memo=memo) 
+
+        return results, find_steps 
+
+    @staticmethod 
+    def _split_fuzzy_word(last_word): 
+        """ 
+        helper method splits the part of a word to fuzzy match (at least 5 characters' worth of chunks) from the rest 
+        RETURNS: tuple 
+        """ 
+        word_chunks = deque(filter(lambda x: x, last_word.split(' '))) 
+        new_word = word_chunks.popleft() 
+
+        while len(new_word) < 5 and word_chunks:
+            new_word = f'{new_word} {word_chunks.popleft()}'
+        return new_word, ' '.join(word_chunks) 
+
+    def _get_fuzzy_words(self, word, max_cost, memo=None): 
+        """ 
+        helper method walks the DAWG for words less than max_cost Levenshtein edits away, only following branches 
+        that can still match, or looks them up in the fuzzy index. Words reached through a synonym's path are skipped 
+        RETURNS: list of (word, distance) in the order of self.words 
+        """ 
+        if memo is not None: 
+            key = ('fuzzy_words', word, max_cost) 
+            if key not in memo: 
+                self._prefetch_fuzzy_words([word], max_cost, memo) 
+            return memo[key] 
+        fuzzy_words = self._prefetch_fuzzy_words([word], max_cost, {}) 
+        return fuzzy_words[('fuzzy_words', word, max_cost)] 
+
+    def _prefetch_fuzzy_words(self, words, max_cost, memo): 
+        """ 
+        helper method fills the memo with the fuzzy words of several words. Words which are prefixes of a longer one 
+        share its DAWG walk, unless the fuzzy index can look them up 
+        RETURNS: dictionary (the memo) 
+        """ 
+        if self._fuzzy_index is not None and self._fuzzy_index.can_lookup(max_cost): 
+            for word in words: 
+                matches = self._fuzzy_index.lookup(word, max_cost) 
+                memo[('fuzzy_words', word, max_cost)] = sorted(matches.items(), key=lambda item: self._word_index[item[0]]) 
+            return memo 
+
+        groups = [] 
+        for word in sorted(words, reverse=True): # a word comes straight after the words it's a prefix of 
+            if groups and groups[-1][0].startswith(word): 
+                groups[-1].append(word) 
+            else: 
+                groups.append([word]) 
+
+        for group in groups: 
+            fuzzy_words = {word: {} for word in group} 
+            for word, path, node, dist in self._dawg.get_similar_nodes_for_prefixes(group, max_cost): 
+                _word = node.word 
+                if _word in self._word_index and path == self.normaliser.normalise_node_name(_word): 
+                    fuzzy_words[word][_word] = dist 
+            for word, matches in fuzzy_words.items(): 
+                memo[('fuzzy_words', word, max_cost)] = sorted(matches.items(), key=lambda item: self._word_index[item[0]]) 
+        return memo 
+
+    def _prefix_autofill(self, word, node=None, memo=None): 
+        """ 
+        helper method attempts to predict the rest of a word 
+        RETURNS: tuple 
+        """ 
+        if memo is not None: 
+            key = ('prefix_autofill', word, node) 
+            if key not in memo: 
+                memo[key] = self._prefix_autofill(word, node) 
+            return memo[key] 
+
+        len_prev_rest_of_last_word = self.inf 
+        matched_words = [] 
+        matched_words_set = set()  
+
+        def _add_words(words): 
+            """ 
+            helper method adds words to undergo prefix autofill 
+            RETURNS: bool 
+            """ 
+            is_added = False 
+            for word in words: 
+                if word not in matched_words_set: 
+                    matched_words.append(word) 
+                    matched_words_set.add(word) 
+                    is_added = True 
+            return is_added 
+
+        matched_prefix_of_last_word, rest_of_word, node, matched_words_part, matched_condition_ever, matched_condition_in_branch = \
+        self._prefix_autofill_part(word, node) 
+        _add_words(matched_words_part) 
+        result = (matched_prefix_of_last_word, rest_of_word, node, matched_words) 
+        len_rest_of_last_word = len(rest_of_word) 
+        
+        while len_rest_of_last_word and len_rest_of_last_word < len_prev_rest_of_last_word: 
+            word = matched_prefix_of_last_word + rest_of_word 
+            word = word.strip() 
+            len_prev_rest_of_last_word = len_rest_of_last_word 
+            matched_prefix_of_last_word, rest_of_word, node, matched_words_part, matched_condition_ever, \
+            matched_condition_in_branch = self._prefix_autofill_part(word, node=self._dawg, matched_condition_ever=matched_condition_ever, \
+            matched_condition_in_branch=matched_condition_in_branch) 
+            is_added = _add_words(matched_words_part) 
+
+            if is_added is False: 
+                break 
+            len_rest_of_last_word = len(rest_of_word) 
+            result = (matched_prefix_of_last_word, rest_of_word, node, matched_words) 
+
+        return result 
+
+    def prefix_autofill_part_condition(self, node): 
+        pass 
+
+    def _add_to_matched_words(self, node, matched_words, matched_condition_in_branch, matched_condition_ever, matched_prefix_of_last_word): 
+        """ 
+        helper method verifies matched words 
+        RETURNS: tuple 
+        """ 
+        if matched_words: 
+            last_matched_word = matched_words[-1].replace(self.prefix_autofill_part_condition_suffix, '') 
+            if node.value.startswith(last_matched_word): 
+                matched_words.pop() 
+        value = node.value 
+
+        if self.prefix_autofill_part_condition_suffix: 
+            if self._node_word_info_matches_condition(node, self.prefix_autofill_part_condition): 
+                matched_condition_in_branch = True 
+                if matched_condition_ever and matched_prefix_of_last_word: 
+                    value = f"{matched_prefix_of_last_word}{self.prefix_autofill_part_condition_suffix}" 
+
+        matched_words.append(value) 
+        return matched_words, matched_condition_in_branch 
+
+    def _prefix_autofill_part(self, word, node=None, matched_condition_ever=False, matched_condition_in_branch=False): 
+        """ 
+        helper method builds a prefix by matching characters in the word with the nodes 
+        RETURNS: tuple 
+        """ 
+        node = node or self._dawg 
+        que = deque(word) 
+        matched_prefix_of_last_word = '' 
+        matched_words = [] 
+        nodes_that_words_were_extracted = set() 
+        
+        while que: 
+            char = que.popleft()  
+            if node.children: 
+                if char not in node.children: 
+                    space_child = node.children.get(' ') 
+                    if space_child and char in space_child.children: 
+                        node = space_child 
+                    else: 
+                        que.appendleft(char) 
+                        break 
+
+                node = node.children[char] 
+                if char != ' ' or matched_prefix_of_last_word: 
+                    matched_prefix_of_last_word += char 
+                if node.word: 
+                    if que: 
+                        next_char = que[0] 
+                        if next_char != ' ': 
+                            continue 
+                    matched_words, matched_condition_in_branch = self._add_to_matched_words(node, matched_words, matched_condition_in_branch, \
+                    matched_condition_ever, matched_prefix_of_last_word) 
+                    nodes_that_words_were_extracted.add(node) 
+                    matched_prefix_of_last_word = '' 
+            else:				 
+                if char == ' ':
+                    node = self._dawg 
+                    if matched_condition_in_branch: 
+                        matched_condition_ever = True 
+                else: 
+                    que.appendleft(char) 
+                    break 
+
+        if not que and node.word and node not in nodes_that_words_were_extracted: 
+            matched_words, matched_condition_in_branch = self._add_to_matched_words(node, matched_words, matched_condition_in_branch, \
+            matched_condition_ever, matched_prefix_of_last_word) 
+            matched_prefix_of_last_word = ''
+            
+        rest_of_word = "".join(que) 
+        if matched_condition_in_branch: 
+            matched_condition_ever = True
+        return matched_prefix_of_last_word, rest_of_word, node, matched_words, matched_condition_ever, matched_condition_in_branch 
+
+    def _add_descendant_words_to_results(self, node, size, matched_words, results, distance, should_traverse=True, memo=None): 
+        """ 
+        helper method adds descendant words to results 
+        RETURNS: integer 
+        """ 
+        with self._measure(SearchStage.descendant_expansion): 
+            key = ('descendant_words', node, size, should_traverse) 
+            if memo is not None and key in memo: 
+                descendant_words = memo[key] 
+            else: 
+                descendant_words = list(node.get_descendant_words(size, should_traverse, full_stop_words=self._full_stop_words)) 
+                if memo is not None: 
+                    memo[key] = descendant_words 
+            extended = _extend_and_repeat(matched_words, descendant_words) 
+            if extended: 
+                results[distance].extend(extended) 
+        return distance 
+
+    @staticmethod 
+    def _word_info_matches_attribute_filter(attribute_filter, word_info): 
+        """ 
+        helper method checks if a word's value has every attribute of a filter, with the value (or one of the values) 
+        the filter gives 
+        RETURNS: bool 
+        """ 
+        for attribute, wanted in attribute_filter.items(): 
+            if attribute not in word_info: 
+                return False 
+            value = word_info[attribute] 
+            if not (value in wanted if isinstance(wanted, (set, frozenset, list, tuple)) else value == wanted): 
+                return False 
+        return True 
+
+    def _get_attribute_node_filter(self, attribute_filter): 
+        """ 
+        helper method turns a filter whose attributes are all indexed into a test of whether a node's mask has one of 
+        the wanted bits of each attribute. Nodes added since the index was built have no mask and are visited 
+        RETURNS: function/None (None if the filter can't use the index) 
+        """ 
+        attribute_index = self._attribute_index 
+        if attribute_index is None or not attribute_filter or \
+        any(attribute not in self._indexed_attributes for attribute in attribute_filter): 
+            return None 
+        wanted_masks = [] 
+        for attribute, wanted in attribute_filter.items(): 
+            values = wanted if isinstance(wanted, (set, frozenset, list, tuple)) else (wanted,) 
+            wanted_mask = 0 
+            for value in values: 
+                wanted_mask |= self._attribute_bits.get((attribute, value), 0) 
+            if not wanted_mask: # no word has any of the values 
+                return lambda node: False 
+            wanted_masks.append(wanted_mask) 
+        if len(wanted_masks) == 1: 
+            wanted_mask = wanted_masks[0] 
+            return lambda node: attribute_index.get(node, -1) & wanted_mask 
+        return lambda node: all(attribute_index.get(node, -1) & wanted_mask for wanted_mask in wanted_masks) 
+
+    def _node_word_info_matches_condition(self, node, condition): 
+        """ 
+        helper method checks if a node word satisfies a condition 
+        RETURNS: bool 
+        """ 
+        _word = node.word 
+        word_info = self.words.get(_word) 
+        if word_info: 
+            return condition(word_info) 
+        else: 
+            return False 
+
+    def get_all_descendant_words_for_condition(self, word, size, condition): 
+        """ 
+        returns all descendant words which satisfy a condition: a function of a word's value, or a filter mapping 
+        attributes of the value to the value (or a set, list or tuple of the values) each must have. A filter on 
+        indexed_attributes only is answered from the attribute index, skipping every subtree without a matching word 
+        RETURNS: list 
+        """ 
+        new_tokens = [] 
+        node_filter = None 
+        if not callable(condition): 
+            node_filter = self._get_attribute_node_filter(condition) 
+            condition = partial(self._word_info_matches_attribute_filter, condition) 
+
+        with self._lock.reading(): 
+            matched_prefix_of_last_word, rest_of_word, node, matched_words_part, matched_condition_ever, \
+            matched_condition_in_branch = self._prefix_autofill_part(word=word)
+            if not rest_of_word and self._node_word_info_matches_condition(node, condition):
+                found_nodes_gen = node.get_descendant_nodes(size, insert_count=True, node_filter=node_filter) 
+                for node in found_nodes_gen:
+                    if self._node_word_info_matches_condition(node, condition):
+                        new_tokens.append(node.word)
+        return new_tokens
@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean
+
+
+_CONSONANTS = 'bcdfghjklmnprstvwz'
+_VOWELS = 'aeiou'
+_MODULES = ('helper/levenshtein_distance.py', 'data_structures/lfu_cache.py', 'data_structures/cache_policies.py',
+'autocomplete/misc.py', 'autocomplete/normaliser.py', 'autocomplete/symspell.py', 'autocomplete/dawg.py',
+'autocomplete/frozen_dawg.py', 'autocomplete/minimised_dawg.py', 'autocomplete/snapshot.py',
+'autocomplete/instrumentation.py', 'autocomplete/autocomplete.py') # in the order they use each other's names
+
+
+def load_modules(paths=_MODULES):
+    """
+    runs the modules AutoComplete is built from, given relative to the package's source directory, and adds their
+    names to this module's, as they use each other's names without importing them
+    RETURNS: None
+    """
+    source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    namespace = {'__name__': 'netro'}
+    for path in paths:
+        path = os.path.join(source_directory, path)
+        with open(path, encoding='utf-8') as f:
+            exec(compile(f.read(), path, 'exec'), namespace)
+    globals().update((name, value) for name, value in namespace.items() if not name.startswith('__'))
+
+
+def make_vocabulary(size, seed=0):
+    """
+    generates a reproducible vocabulary of size words for benchmarking: phrases of one to three pronounceable tokens,
+    with Pareto distributed counts so a few words dominate prefix rankings as they do in real data
+    RETURNS: dictionary (word -> {'count': integer})
+    """
+    rng = random.Random(seed)
+    syllables = [consonant + vowel for consonant in _CONSONANTS for vowel in _VOWELS]
+    words = {}
+    while len(words) < size:
+        word = ' '.join(''.join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(rng.choices((1, 2, 3), (6, 3, 1))[0]))
+        words[word] = {'count': int(rng.paretovariate(1.2))}
+    return words
+
+
+def load_vocabulary(size, seed=0, directory=None):
+    """
+    returns the vocabulary make_vocabulary generates, read from or written to a JSON file in directory so that every
+    run of a benchmark is over the same words
+    RETURNS: dictionary
+    """
+    if directory is None:
+        return make_vocabulary(size, seed)
+    path = os.path.join(directory, f'vocabulary_{size}_{seed}.json')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    words = make_vocabulary(size, seed)
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(words, f)
+    return words
+
+
+def make_queries(words, n, seed=0):
+    """
+    picks n distinct prefix queries, prefixes of words that only need their descendants added
+    (FindStep.descendant_only), and n distinct fuzzy queries, words with a letter changed at least three letters
+    before their end so the rest goes through the Levenshtein search (FindStep.fuzzy_try)
+    RETURNS: tuple (prefix queries, fuzzy queries)
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted(words)
+    prefix_queries, fuzzy_queries = set(), set()
+    for _ in range(n * 20):
+        if len(prefix_queries) >= n and len(fuzzy_queries) >= n:
+            break
+        word = rng.choice(vocabulary)
+        if len(prefix_queries) < n:
+            prefix_queries.add(word[:rng.randint(1, len(word))])
+        if len(fuzzy_queries) < n and len(word) >= 6:
+            i = rng.randint(1, len(word) - 3)
+            fuzzy_queries.add(word[:i] + rng.choice(_CONSONANTS.replace(word[i], '')) + word[i + 1:])
+    return sorted(prefix_queries), sorted(fuzzy_queries)
+
+
+def _get_latencies(search, queries, max_cost, size):
+    """
+    helper function times each query on its own
+    RETURNS: list of seconds
+    """
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query, max_cost, size)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _summarise_latencies(latencies):
+    """
+    helper function summarises latencies as milliseconds
+    RETURNS: dictionary
+    """
+    latencies = sorted(latencies)
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {'queries': len(latencies), 'mean_ms': mean(latencies) * 1000, 'p50_ms': percentile(0.5),
+    'p95_ms': percentile(0.95), 'p99_ms': percentile(0.99), 'max_ms': latencies[-1] * 1000}
+
+
+def _get_throughput(search, queries, max_cost, size, threads):
+    """
+    helper function runs the queries across a pool of threads
+    RETURNS: float (queries per second)
+    """
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        list(executor.map(lambda query: search(query, max_cost, size), queries))
+        return len(queries) / (time.perf_counter() - start)
+
+
+def benchmark_build(words, measure_memory=True, **kwargs):
+    """
+    times building an AutoComplete over words, and if measure_memory is set builds it again under tracemalloc for
+    the peak memory allocated while building, since tracing slows the build down too much to time them together
+    RETURNS: tuple (AutoComplete, dictionary)
+    """
+    start = time.perf_counter()
+    autocomplete = AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+    result = {'words': len(words), 'build_s': time.perf_counter() - start}
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+            result['build_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return autocomplete, result
+
+
+def benchmark_searches(autocomplete, prefix_queries, fuzzy_queries, max_cost=2, size=5, threads=4):
+    """
+    measures search latency and throughput on a built AutoComplete, whose cache must be large enough to hold every
+    query: prefix and fuzzy queries on an empty cache (misses), then all of them again (hits), then the throughput of
+    threads searching concurrently, with an empty cache and then a warm one. The FindSteps of the uncached searches
+    are counted to check that the queries take the paths they're meant to
+    RETURNS: dictionary
+    """
+    search = autocomplete.search_for_similar_words
+    queries = prefix_queries + fuzzy_queries
+    autocomplete._lfu_cache.invalidate(lambda key, value: True)
+
+    previous_instrumentation = autocomplete._instrumentation
+    instrumentation = autocomplete._instrumentation = SearchInstrumentation()
+    prefix_latencies = _get_latencies(search, prefix_queries, max_cost, size)
+    prefix_find_steps = instrumentation.stats()['find_steps']
+    instrumentation.reset()
+    fuzzy_latencies = _get_latencies(search, fuzzy_queries, max_cost, size)
+    fuzzy_find_steps = instrumentation.stats()['find_steps']
+    autocomplete._instrumentation = previous_instrumentation
+    hit_latencies = _get_latencies(search, queries, max_cost, size)
+
+    autocomplete._lfu_cache.invalidate(lambda key, value: True)
+    miss_throughput = _get_throughput(search, queries, max_cost, size, threads)
+    hit_throughput = _get_throughput(search, queries, max_cost, size, threads)
+    return {
+        'prefix': dict(_summarise_latencies(prefix_latencies), find_steps=prefix_find_steps),
+        'fuzzy': dict(_summarise_latencies(fuzzy_latencies), find_steps=fuzzy_find_steps),
+        'cache_miss': _summarise_latencies(prefix_latencies + fuzzy_latencies),
+        'cache_hit': _summarise_latencies(hit_latencies),
+        'threads': threads,
+        'cache_miss_qps': miss_throughput,
+        'cache_hit_qps': hit_throughput,
+    }
+
+
+def run_benchmarks(sizes=(10000, 100000, 1000000), queries=200, threads=4, seed=0, vocabulary_directory=None, \
+measure_memory=True, max_cost=2, size=5, **kwargs):
+    """
+    benchmarks building and searching an AutoComplete for each vocabulary size. kwargs are passed to AutoComplete,
+    so settings such as fuzzy_index or build_workers can be compared on the same words and queries
+    RETURNS: list of dictionaries
+    """
+    results = []
+    for vocabulary_size in sizes:
+        words = load_vocabulary(vocabulary_size, seed, vocabulary_directory)
+        prefix_queries, fuzzy_queries = make_queries(words, queries, seed)
+        capacity = 2 * (len(prefix_queries) + len(fuzzy_queries))
+        build_kwargs = dict(kwargs)
+        build_kwargs.setdefault('cache', lambda _capacity, capacity=capacity: LFUCache(max(_capacity, capacity)))
+        autocomplete, result = benchmark_build(words, measure_memory=measure_memory, **build_kwargs)
+        result.update(benchmark_searches(autocomplete, prefix_queries, fuzzy_queries, max_cost, size, threads))
+        results.append(result)
+    return results
+
+
+def format_results(results):
+    """
+    formats benchmark results as a table with a row per vocabulary size
+    RETURNS: string
+    """
+    columns = [('words', lambda r: r['words']), ('build s', lambda r: r['build_s']),
+    ('peak MB', lambda r: r.get('build_peak_mb', float('nan'))), ('prefix p50', lambda r: r['prefix']['p50_ms']),
+    ('prefix p99', lambda r: r['prefix']['p99_ms']), ('fuzzy p50', lambda r: r['fuzzy']['p50_ms']),
+    ('fuzzy p99', lambda r: r['fuzzy']['p99_ms']), ('miss mean', lambda r: r['cache_miss']['mean_ms']),
+    ('hit mean', lambda r: r['cache_hit']['mean_ms']), ('miss qps', lambda r: r['cache_miss_qps']),
+    ('hit qps', lambda r: r['cache_hit_qps'])]
+    lines = [' '.join(f'{name:>11}' for name, _ in columns)]
+    for result in results:
+        lines.append(' '.join(f'{get(result):>11.4g}' for _, get in columns))
+    return '\n'.join(lines) + '\n(latencies in ms)'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmarks AutoComplete over synthetic vocabularies')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=200, help='prefix and fuzzy queries each')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--vocabulary-directory', help='where generated vocabularies are kept between runs')
+    parser.add_argument('--no-memory', action='store_true', help='skips the second, traced build')
+    parser.add_argument('--json', help='also writes the results to this file')
+    args = parser.parse_args()
+    load_modules()
+    benchmark_results = run_benchmarks(args.sizes, args.queries, args.threads, args.seed, args.vocabulary_directory, \
+    not args.no_memory)
+    print(format_results(benchmark_results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(benchmark_results, f, indent=2)
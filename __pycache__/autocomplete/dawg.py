@@ -0,0 +1,461 @@
+import sys 
+from collections import defaultdict, deque
+from itertools import islice
+from operator import itemgetter
+
+
+class _NoChildren(dict): 
+    """ 
+    read-only empty children shared by every node without children 
+    """ 
+    __slots__ = () 
+
+    def _read_only(self, *args, **kwargs): 
+        raise TypeError("a node's children are changed with set_child or set_children") 
+
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = _read_only 
+
+    def __reduce__(self): 
+        return '_NO_CHILDREN' 
+
+
+_NO_CHILDREN = _NoChildren() 
+
+
+class _OneChild: 
+    """ 
+    read-only children of a node with a single child, the most common kind of node, held without a dictionary 
+    """ 
+    __slots__ = ('letter', 'node') 
+
+    def __init__(self, letter, node): 
+        self.letter = letter 
+        self.node = node 
+
+    def __len__(self): 
+        return 1 
+
+    def __contains__(self, letter): 
+        return letter == self.letter 
+
+    def __getitem__(self, letter): 
+        if letter == self.letter: 
+            return self.node 
+        raise KeyError(letter) 
+
+    def __iter__(self): 
+        return iter((self.letter,)) 
+
+    def get(self, letter, default=None): 
+        return self.node if letter == self.letter else default 
+
+    def keys(self): 
+        return (self.letter,) 
+
+    def values(self): 
+        return (self.node,) 
+
+    def items(self): 
+        return ((self.letter, self.node),) 
+
+
+class _DawgNode: 
+    __slots__ = ('word', 'original_key', 'count', 'children', 'top_descendants') 
+
+    def __init__(self): 
+        """ 
+        initialises a DAWG node with a word and children. children is a shared empty mapping, a _OneChild or, from two 
+        children on, a dictionary, and is only changed through set_child and set_children. top_descendants holds the 
+        highest-count descendant nodes, set by build_top_descendants 
+        RETURNS: None 
+        """ 
+        self.word = None 
+        self.original_key = None 
+        self.children = _NO_CHILDREN 
+        self.count = 0 
+        self.top_descendants = None 
+
+    def set_child(self, letter, child_node, copy_on_write=False): 
+        """ 
+        adds or replaces the child at a letter. copy_on_write replaces a children dictionary instead of adding to it 
+        RETURNS: None 
+        """ 
+        children = self.children 
+        if type(children) is dict: 
+            if copy_on_write: 
+                self.children = {**children, letter: child_node} 
+            else: 
+                children[letter] = child_node 
+        elif not children or letter in children: 
+            self.children = _OneChild(letter, child_node) 
+        else: 
+            self.children = {children.letter: children.node, letter: child_node} 
+
+    def set_children(self, children): 
+        """ 
+        replaces every child, in the order of a mapping of letters to nodes 
+        RETURNS: None 
+        """ 
+        if not children: 
+            self.children = _NO_CHILDREN 
+        elif len(children) == 1: 
+            self.children = _OneChild(*next(iter(children.items()))) 
+        else: 
+            self.children = dict(children) 
+
+    def __getitem__(self, key):
+        return self.children[key]
+
+    def __repr__(self):
+        return f"{list(self.children.keys())}, {self.word}"
+
+    @property 
+    def value(self): 
+        """ 
+        returns a DAWG node's value as either its original key or word 
+        RETURNS: string 
+        """ 
+        return self.original_key or self.word 
+
+    def insert_dawg_node(self, word, normalised_word, add_word=True, original_key=None, count=0, insert_count=True, \
+    copy_on_write=False): 
+        """
+        inserts a word into the DAWG. copy_on_write replaces children dictionaries instead of adding to them, so 
+        threads reading the DAWG at the same time never see one change size 
+        RETURNS: string 
+        """ 
+        node = self 
+        for letter in normalised_word: 
+            child_node = node.children.get(letter) 
+            if child_node is None: 
+                child_node = _DawgNode() 
+                node.set_child(sys.intern(letter), child_node, copy_on_write=copy_on_write) 
+            node = child_node 
+        if add_word: 
+            node.word = word 
+            node.original_key = original_key 
+            if insert_count: 
+                node.count = int(count) # converts any str to int 
+        return node 
+
+    def _get_nodes_bottom_up(self): 
+        """ 
+        helper method gets this node and every node below it once, each after all of its children. A child that loops 
+        back to a node still being visited is skipped. Nodes are told apart by equality rather than id, as a frozen 
+        DAWG makes a new object for a node each time it's read, whose id can be reused once it's collected 
+        RETURNS: generator 
+        """ 
+        expanded = set() 
+        stack = [(self, False)] 
+        while stack: 
+            node, is_expanded = stack.pop() 
+            if is_expanded: 
+                yield node 
+                continue 
+            if node in expanded: 
+                continue 
+            expanded.add(node) 
+            stack.append((node, True)) 
+            for child_node in node.children.values(): 
+                if child_node not in expanded: 
+                    stack.append((child_node, False)) 
+
+    def build_top_descendants(self, k, full_stop_words=None, shared_values=None): 
+        """ 
+        stores on every node its k highest-count descendant nodes, ranked as get_descendant_words would rank them, so 
+        completing a prefix is a lookup. Rankings are merged bottom-up from each child's. Nodes with a stop word below 
+        them, or whose ranking lost entries to duplicates, are left to be ranked by traversal. shared_values defaults 
+        to the values held by more than one node below this one 
+        RETURNS: dictionary (id of a node -> its ranking) 
+        """ 
+        full_stop_words = full_stop_words if full_stop_words else set() 
+        rankings = {} # id of a node -> (ranked entries, is_truncated), or None if it can't be precomputed 
+        if shared_values is None: 
+            shared_values = self.get_shared_values() 
+        for node in self._get_nodes_bottom_up(): 
+            node.set_top_descendants(k, rankings, full_stop_words, shared_values) 
+        return rankings 
+
+    def get_shared_values(self): 
+        """ 
+        gets the values held by more than one node below this one 
+        RETURNS: set 
+        """ 
+        value_nodes = defaultdict(set) 
+        for node in self._get_nodes_bottom_up(): 
+            if node.value: 
+                value_nodes[node.value].add(node) 
+        return {value for value, nodes in value_nodes.items() if len(nodes) > 1} 
+
+    def build_attribute_masks(self, get_mask): 
+        """ 
+        gets a bitmask for every node below this one: the union of get_mask(node) over the node and everything below 
+        it, so a subtree whose mask lacks a bit holds no word with it. A node whose children loop back up its branch 
+        gets every bit, as its subtree can't be summed bottom-up. Equal masks are stored once 
+        RETURNS: dictionary (node -> mask) 
+        """ 
+        masks = {} 
+        distinct_masks = {} 
+        for node in self._get_nodes_bottom_up(): 
+            mask = get_mask(node) 
+            for child_node in node.children.values(): 
+                mask |= masks.get(child_node, -1) # missing if the child loops back up the branch 
+            masks[node] = distinct_masks.setdefault(mask, mask) 
+        return masks 
+
+    def intern_strings(self, strings): 
+        """ 
+        makes every node below this one hold the string in strings equal to its word and original key, adding those it 
+        lacks, so a string read back from a snapshot or another process is stored once rather than once per copy 
+        RETURNS: None 
+        """ 
+        for node in self._get_nodes_bottom_up(): 
+            if node.word is not None: 
+                node.word = strings.setdefault(node.word, node.word) 
+            if node.original_key is not None: 
+                node.original_key = strings.setdefault(node.original_key, node.original_key) 
+
+    def memory_report(self): 
+        """ 
+        counts the nodes below this one by how many children they have, and the bytes taken by the nodes, their 
+        children mappings, their top descendants and the strings they hold. Shared objects are counted once, and are 
+        kept until the report is done so that their ids aren't reused 
+        RETURNS: dictionary 
+        """ 
+        counts = {'nodes': 0, 'word_nodes': 0, 'leaf_nodes': 0, 'single_child_nodes': 0, 'multi_child_nodes': 0, 'edges': 0} 
+        sizes = {'nodes': 0, 'children': 0, 'top_descendants': 0, 'strings': 0} 
+        seen_objects = {} # id -> object 
+
+        def add_size(component, obj): 
+            if obj is not None and id(obj) not in seen_objects: 
+                seen_objects[id(obj)] = obj 
+                sizes[component] += sys.getsizeof(obj) 
+
+        for node in self._get_nodes_bottom_up(): 
+            n_children = len(node.children) 
+            counts['nodes'] += 1 
+            counts['word_nodes'] += node.word is not None 
+            counts['edges'] += n_children 
+            counts['leaf_nodes' if not n_children else 'single_child_nodes' if n_children == 1 else 'multi_child_nodes'] += 1 
+            add_size('nodes', node) 
+            if node.children is not _NO_CHILDREN: 
+                add_size('children', node.children) 
+            add_size('top_descendants', node.top_descendants) 
+            add_size('strings', node.word) 
+            add_size('strings', node.original_key) 
+        return dict(counts, bytes=dict(sizes, total=sum(sizes.values()))) 
+
+    def set_top_descendants(self, k, rankings, full_stop_words, shared_values): 
+        """ 
+        ranks this node's top descendants from its children's rankings and adds its own ranking to rankings 
+        RETURNS: None 
+        """ 
+        rankings[id(self)] = ranking = self._rank_descendants(self, k, rankings, full_stop_words, shared_values) 
+        if ranking: 
+            self.top_descendants = tuple(entry[3] for entry in ranking[0]) 
+        elif self.top_descendants is not None: 
+            self.top_descendants = None 
+
+    @staticmethod 
+    def _rank_descendants(node, k, rankings, full_stop_words, shared_values): 
+        """ 
+        helper method merges the rankings of a node's children into its own. Entries are (-count, depth, path of child 
+        positions, node, is from a truncated ranking), which sort in the breadth-first order get_descendant_nodes uses. 
+        A value held by several nodes is ranked by the one met first, as get_descendant_nodes does 
+        RETURNS: tuple/None 
+        """ 
+        candidates = [] 
+        is_truncated = False 
+        for i, child_node in enumerate(node.children.values()): 
+            child_ranking = rankings.get(id(child_node)) # missing if the child loops back up the branch 
+            if child_ranking is None or child_node.value in full_stop_words: 
+                return None 
+            child_entries, child_is_truncated = child_ranking 
+            is_truncated = is_truncated or child_is_truncated 
+            if child_node.value: 
+                candidates.append((-child_node.count, 1, (i,), child_node, False)) 
+            for neg_count, depth, path, descendant, _ in child_entries: 
+                candidates.append((neg_count, depth + 1, (i,) + path, descendant, child_is_truncated)) 
+
+        first_met = {} 
+        for entry in candidates: 
+            value = entry[3].value 
+            if value in shared_values: 
+                if is_truncated: # the node met first might be in a truncated part 
+                    return None 
+                if value not in first_met or entry[1:3] < first_met[value][1:3]: 
+                    first_met[value] = entry 
+
+        candidates.sort(key=itemgetter(0, 1, 2)) 
+        entries = [] 
+        seen_nodes = set() 
+        for entry in candidates: 
+            if len(entries) == k: 
+                return entries, True 
+            descendant = entry[3] 
+            if descendant in seen_nodes or descendant.value in first_met and first_met[descendant.value][3] is not descendant: 
+                if entry[4]: # the child's ranking has one entry fewer than it needs here 
+                    return None 
+                continue 
+            seen_nodes.add(descendant) 
+            entries.append(entry) 
+        return entries, is_truncated and len(entries) == k 
+
+    def remove_dawg_branch(self, normalised_word): 
+        """ 
+        removes the nodes at the end of a path that no longer lead to any word, replacing children dictionaries as 
+        insert_dawg_node does with copy_on_write 
+        RETURNS: None 
+        """ 
+        nodes = [self] 
+        for letter in normalised_word: 
+            node = nodes[-1].children.get(letter) 
+            if node is None: 
+                return 
+            nodes.append(node) 
+
+        for i in range(len(normalised_word), 0, -1): 
+            node = nodes[i] 
+            if node.word or node.children: 
+                return 
+            parent_node = nodes[i - 1] 
+            parent_node.set_children({letter: child_node for letter, child_node in parent_node.children.items() \
+            if letter != normalised_word[i - 1]}) 
+
+    def refresh_top_descendants(self, normalised_word, k, get_path, full_stop_words=None): 
+        """ 
+        recomputes the top descendants of the nodes along a path, deepest first, after a word below them was inserted, 
+        removed or recounted. Each ranking is merged from the children's, with get_path giving a word node's path so 
+        descendants are placed in breadth-first order. Where that can't be done exactly, as around synonyms sharing a 
+        node, the node is left to be ranked by traversal 
+        RETURNS: None 
+        """ 
+        full_stop_words = full_stop_words if full_stop_words else set() 
+        nodes = [self] 
+        for letter in normalised_word: 
+            node = nodes[-1].children.get(letter) 
+            if node is None: 
+                break 
+            nodes.append(node) 
+
+        for depth in range(len(nodes) - 1, -1, -1): 
+            nodes[depth].top_descendants = self._merge_top_descendants(nodes[depth], normalised_word[:depth], k, \
+            get_path, full_stop_words) 
+
+    @staticmethod 
+    def _merge_top_descendants(node, node_path, k, get_path, full_stop_words): 
+        """ 
+        helper method merges the top descendants of a node's children. Entries are (-count, depth, child position, 
+        position in the child's ranking, node); the last two keep breadth-first order among equal counts and depths 
+        RETURNS: tuple/None 
+        """ 
+        candidates = [] 
+        for i, (letter, child_node) in enumerate(node.children.items()): 
+            top_descendants = child_node.top_descendants 
+            if top_descendants is None or child_node.value in full_stop_words: 
+                return None 
+            child_path = node_path + letter 
+            if child_node.value: 
+                candidates.append((-child_node.count, 1, i, -1, child_node)) 
+            for position, descendant in enumerate(top_descendants): 
+                descendant_path = get_path(descendant) 
+                if not descendant_path.startswith(child_path): 
+                    return None 
+                candidates.append((-descendant.count, len(descendant_path) - len(node_path), i, position, descendant)) 
+
+        if len({entry[4].value for entry in candidates}) != len(candidates): # duplicates may have pushed entries out 
+            return None 
+        candidates.sort(key=itemgetter(0, 1, 2, 3)) 
+        return tuple(entry[4] for entry in candidates[:k]) 
+
+    def get_similar_nodes(self, word, max_cost): 
+        """ 
+        gets word-carrying descendant nodes whose path is less than max_cost Levenshtein edits from a word. One distance 
+        row is carried per node and branches whose row minimum reaches max_cost are pruned 
+        RETURNS: generator 
+        """ 
+        for _, path, node, dist in self.get_similar_nodes_for_prefixes([word], max_cost): 
+            yield path, node, dist 
+
+    def get_similar_nodes_for_prefixes(self, words, max_cost): 
+        """ 
+        does get_similar_nodes for several words in one walk, where each word is a prefix of the longest. A word's 
+        distance row is the start of the longest word's row, so one row per node serves them all 
+        RETURNS: generator of (word, path, node, distance) 
+        """ 
+        longest_word = max(words, key=len) 
+        len_word = len(longest_word) 
+        word_lengths = [(word, len(word)) for word in words] 
+        stack = [(self, '', list(range(len_word + 1)))] 
+
+        while stack: 
+            node, path, prev_row = stack.pop() 
+            for letter, child_node in node.children.items(): 
+                row = [prev_row[0] + 1] 
+                for i in range(1, len_word + 1): 
+                    if longest_word[i - 1] == letter: 
+                        row.append(prev_row[i - 1]) 
+                    else: 
+                        row.append(1 + min(row[i - 1], prev_row[i], prev_row[i - 1])) 
+
+                child_path = path + letter 
+                if child_node.word: 
+                    for word, len_prefix in word_lengths: 
+                        if row[len_prefix] < max_cost: 
+                            yield word, child_path, child_node, row[len_prefix] 
+                if min(row) < max_cost: # a row's minimum never decreases further down the branch 
+                    stack.append((child_node, child_path, row)) 
+
+    def get_descendant_nodes(self, size, should_traverse=True, full_stop_words=None, insert_count=True, node_filter=None): 
+        """ 
+        gets descendant nodes of a DAWG node. A node for which node_filter, if given, is false is skipped with 
+        everything below it 
+        RETURNS: None 
+        """ 
+        if insert_count is True: 
+            size = float('inf') 
+
+        que = deque() 
+        unique_nodes = {self} 
+        found_nodes_set = set() 
+        full_stop_words = full_stop_words if full_stop_words else set() 
+
+        for letter, child_node in self.children.items(): 
+            if child_node not in unique_nodes and (node_filter is None or node_filter(child_node)): 
+                unique_nodes.add(child_node) 
+                que.append((letter, child_node)) 
+                
+        while que: 
+            letter, child_node = que.popleft() 
+            child_value = child_node.value 
+            if child_value: 
+                if child_value in full_stop_words: 
+                    should_traverse = False 
+                if child_value not in found_nodes_set: 
+                    found_nodes_set.add(child_value) 
+                    yield child_node 
+                    if len(found_nodes_set) > size: 
+                        break 
+
+            if should_traverse: 
+                for letter, grand_child_node in child_node.children.items(): 
+                    if grand_child_node not in unique_nodes and (node_filter is None or node_filter(grand_child_node)): 
+                        unique_nodes.add(grand_child_node) 
+                        que.append((letter, grand_child_node))  
+
+    def get_descendant_words(self, size, should_traverse=True, full_stop_words=None, insert_count=True): 
+        """ 
+        gets descendant words of a DAWG node 
+        RETURNS: iterator 
+        """ 
+        top_descendants = self.top_descendants 
+        if insert_count is True and should_traverse and top_descendants is not None and len(top_descendants) > size: 
+            return map(lambda node: node.value, top_descendants[:size + 1]) 
+
+        found_nodes_gen = self.get_descendant_nodes(size, should_traverse=should_traverse, full_stop_words=full_stop_words, \
+        insert_count=insert_count) 
+        if insert_count is True: 
+            found_nodes = sorted(found_nodes_gen, key=lambda node: node.count, reverse=True)[:size + 1] 
+        else: 
+            found_nodes = islice(found_nodes_gen, size) 
+        return map(lambda word: word.value, found_nodes) 
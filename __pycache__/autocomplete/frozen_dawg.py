@@ -0,0 +1,346 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+
+_MAGIC = b'NETRODWG'
+_VERSION = 2
+_HEADER = struct.Struct('<8sIcxxxIIIIII') # magic, version, byte order, nodes, edges, words, strings, ranked nodes, metadata
+_ALIGNMENT = 8
+
+
+def _string_id(strings, string_ids, string):
+    """
+    helper function returns the id of a string in the string table, adding it if it's new
+    RETURNS: integer
+    """
+    if string is None:
+        return -1
+    string_id = string_ids.get(string)
+    if string_id is None:
+        string_id = string_ids[string] = len(strings)
+        strings.append(string)
+    return string_id
+
+
+def freeze_dawg(root, words, path, original_key='original_key', metadata=None):
+    """
+    serialises a built DAWG into flat arrays (node offsets, edge labels, child indices, counts, each node's top
+    descendants as node indices and a string table for words and original keys) which _FrozenDawg can memory-map.
+    Words take the first string ids in the order of words. metadata, such as the synonyms the DAWG was built with,
+    is stored as JSON
+    RETURNS: None
+    """
+    with open(path, 'wb') as f:
+        write_frozen_dawg(f, root, words, original_key=original_key, metadata=metadata)
+
+
+def write_frozen_dawg(f, root, words, original_key='original_key', metadata=None):
+    """
+    writes the arrays of freeze_dawg to a binary file at its current position, which must be a multiple of 8 bytes
+    RETURNS: list (the nodes, in the order of their indices)
+    """
+    strings = list(words)
+    string_ids = {word: i for i, word in enumerate(strings)}
+    word_counts = array('q')
+    word_original_key_ids = array('i')
+    for word, value in words.items():
+        word_counts.append(int(value.get('count', 0)))
+        word_original_key_ids.append(_string_id(strings, string_ids, value.get(original_key)))
+
+    node_ids = {root: 0} # frozen nodes compare by index, so a frozen DAWG can be written again
+    nodes = [root]
+    node_offsets = array('I', [0])
+    edge_labels = array('I')
+    edge_children = array('I')
+    node_counts = array('q')
+    node_word_ids = array('i')
+    node_original_key_ids = array('i')
+
+    for node in nodes: # nodes grows as unseen children are numbered, so this is a breadth-first walk
+        for letter, child_node in node.children.items():
+            child_id = node_ids.get(child_node)
+            if child_id is None:
+                child_id = node_ids[child_node] = len(nodes)
+                nodes.append(child_node)
+            edge_labels.append(ord(letter))
+            edge_children.append(child_id)
+        node_offsets.append(len(edge_labels))
+        node_counts.append(int(node.count))
+        node_word_ids.append(_string_id(strings, string_ids, node.word))
+        node_original_key_ids.append(_string_id(strings, string_ids, node.original_key))
+
+    top_offsets = array('I', [0])
+    top_node_ids = array('I')
+    ranked_nodes = bytearray(len(nodes)) # 0 for a node left to be ranked by traversal
+    for i, node in enumerate(nodes):
+        if node.top_descendants is not None:
+            ranked_nodes[i] = 1
+            top_node_ids.extend(node_ids[descendant] for descendant in node.top_descendants)
+        top_offsets.append(len(top_node_ids))
+
+    string_offsets = array('I', [0])
+    encoded_strings = []
+    for string in strings:
+        encoded = string.encode('utf-8')
+        encoded_strings.append(encoded)
+        string_offsets.append(string_offsets[-1] + len(encoded))
+    sorted_word_ids = array('I', sorted(range(len(words)), key=strings.__getitem__))
+    encoded_metadata = json.dumps(metadata or {}, separators=(',', ':')).encode('utf-8')
+
+    sections = [node_offsets, edge_labels, edge_children, node_counts, node_word_ids, node_original_key_ids,
+    top_offsets, top_node_ids, ranked_nodes, word_counts, word_original_key_ids, sorted_word_ids, string_offsets,
+    b''.join(encoded_strings), encoded_metadata]
+    byte_order = b'<' if sys.byteorder == 'little' else b'>'
+    f.write(_HEADER.pack(_MAGIC, _VERSION, byte_order, len(nodes), len(edge_labels), len(words), len(strings),
+    len(top_node_ids), len(encoded_metadata)))
+    for section in sections:
+        data = section.tobytes() if isinstance(section, array) else bytes(section)
+        f.write(data)
+        f.write(b'\0' * (-len(data) % _ALIGNMENT))
+    return nodes
+
+
+class _FrozenDawg:
+    def __init__(self, path, offset=0):
+        """
+        initialises a read-only DAWG over a file written by freeze_dawg, or over the arrays write_frozen_dawg wrote
+        at an offset into a file. The file is memory-mapped and its arrays are read in place, so processes loading
+        the same file share one physical copy. has_rankings can be cleared to rank every prefix by traversal, e.g.
+        when the DAWG is searched with other stop words than it was ranked with
+        RETURNS: None
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, byte_order, n_nodes, n_edges, n_words, n_strings, n_top_nodes, n_metadata_bytes = \
+        _HEADER.unpack_from(self._buffer, offset)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} isn't a version {_VERSION} frozen DAWG")
+        if byte_order != (b'<' if sys.byteorder == 'little' else b'>'):
+            raise ValueError(f"{path} was frozen on a machine with a different byte order")
+
+        self._position = offset + _HEADER.size
+        self.node_offsets = self._section('I', n_nodes + 1)
+        self.edge_labels = self._section('I', n_edges)
+        self.edge_children = self._section('I', n_edges)
+        self.node_counts = self._section('q', n_nodes)
+        self.node_word_ids = self._section('i', n_nodes)
+        self.node_original_key_ids = self._section('i', n_nodes)
+        self.top_offsets = self._section('I', n_nodes + 1)
+        self.top_node_ids = self._section('I', n_top_nodes)
+        self.ranked_nodes = self._section('B', n_nodes)
+        self.word_counts = self._section('q', n_words)
+        self.word_original_key_ids = self._section('i', n_words)
+        self.sorted_word_ids = self._section('I', n_words)
+        self.string_offsets = self._section('I', n_strings + 1)
+        self.string_blob = self._section('B', self.string_offsets[-1])
+        self.metadata = json.loads(bytes(self._section('B', n_metadata_bytes)))
+        self.has_rankings = True
+
+        self.root = _FrozenDawgNode(self, 0)
+        self.words = _FrozenWords(self)
+        self.word_index = _FrozenWordIndex(self)
+
+    def _section(self, typecode, length):
+        """
+        helper method casts the next section of the file into a typed view without copying it
+        RETURNS: memoryview
+        """
+        n_bytes = array(typecode).itemsize * length
+        section = self._buffer[self._position:self._position + n_bytes].cast(typecode)
+        self._position += n_bytes + (-n_bytes % _ALIGNMENT)
+        return section
+
+    def get_string(self, string_id):
+        """
+        returns a string from the string table, or None for a missing (-1) id
+        RETURNS: string
+        """
+        if string_id < 0:
+            return None
+        return str(self.string_blob[self.string_offsets[string_id]:self.string_offsets[string_id + 1]], 'utf-8')
+
+    def find_word_id(self, word):
+        """
+        finds the id of a word through the sorted word ids
+        RETURNS: integer (-1 if not found)
+        """
+        if not isinstance(word, str):
+            return -1
+        i = bisect_left(self.sorted_word_ids, word, key=self.get_string)
+        if i < len(self.sorted_word_ids) and self.get_string(self.sorted_word_ids[i]) == word:
+            return self.sorted_word_ids[i]
+        return -1
+
+    def thaw(self):
+        """
+        copies the frozen DAWG and its rankings into ordinary _DawgNodes, which can be changed again
+        RETURNS: list (the nodes, in the order of their indices)
+        """
+        string_offsets = self.string_offsets.tolist()
+        string_blob = self.string_blob.tobytes()
+        strings = [str(string_blob[start:end], 'utf-8') for start, end in zip(string_offsets, string_offsets[1:])]
+        node_offsets = self.node_offsets.tolist()
+        edge_labels = list(map(chr, self.edge_labels.tolist()))
+        edge_children = self.edge_children.tolist()
+
+        nodes = [_DawgNode() for _ in range(len(self.node_counts))]
+        for i, (node, count, word_id, original_key_id) in enumerate(zip(nodes, self.node_counts.tolist(),
+        self.node_word_ids.tolist(), self.node_original_key_ids.tolist())):
+            node.count = count
+            if word_id >= 0:
+                node.word = strings[word_id]
+            if original_key_id >= 0:
+                node.original_key = strings[original_key_id]
+            start, end = node_offsets[i], node_offsets[i + 1]
+            if start != end:
+                node.set_children({edge_labels[e]: nodes[edge_children[e]] for e in range(start, end)})
+
+        top_offsets = self.top_offsets.tolist()
+        top_node_ids = self.top_node_ids.tolist()
+        for i in self._get_ranked_node_indices():
+            nodes[i].top_descendants = tuple(nodes[j] for j in top_node_ids[top_offsets[i]:top_offsets[i + 1]])
+        return nodes
+
+    def _get_ranked_node_indices(self):
+        """
+        helper method gets the indices of the nodes that have their top descendants stored
+        RETURNS: list
+        """
+        if not self.has_rankings:
+            return []
+        return [i for i, is_ranked in enumerate(self.ranked_nodes.tobytes()) if is_ranked]
+
+    def close(self):
+        """
+        releases the memory map. Nodes taken from this DAWG mustn't be used afterwards
+        RETURNS: None
+        """
+        for name in ('node_offsets', 'edge_labels', 'edge_children', 'node_counts', 'node_word_ids',
+        'node_original_key_ids', 'top_offsets', 'top_node_ids', 'ranked_nodes', 'word_counts', 'word_original_key_ids',
+        'sorted_word_ids', 'string_offsets', 'string_blob', '_buffer'):
+            getattr(self, name).release()
+        self._mmap.close()
+
+
+class _FrozenDawgNode(_DawgNode):
+    __slots__ = ('_frozen', '_index')
+
+    def __init__(self, frozen, index):
+        """
+        initialises a read-only view of one node in a _FrozenDawg. It answers to the same attributes as a _DawgNode,
+        so the traversal methods work unchanged
+        RETURNS: None
+        """
+        self._frozen = frozen
+        self._index = index
+
+    def __eq__(self, other):
+        return isinstance(other, _FrozenDawgNode) and self._index == other._index and self._frozen is other._frozen
+
+    def __hash__(self):
+        return self._index
+
+    @property
+    def word(self):
+        return self._frozen.get_string(self._frozen.node_word_ids[self._index])
+
+    @property
+    def original_key(self):
+        return self._frozen.get_string(self._frozen.node_original_key_ids[self._index])
+
+    @property
+    def count(self):
+        return self._frozen.node_counts[self._index]
+
+    @property
+    def children(self):
+        return _FrozenChildren(self._frozen, self._index)
+
+    @property
+    def top_descendants(self):
+        frozen = self._frozen
+        if not frozen.has_rankings or not frozen.ranked_nodes[self._index]:
+            return None
+        top_node_ids = frozen.top_node_ids[frozen.top_offsets[self._index]:frozen.top_offsets[self._index + 1]]
+        return tuple(_FrozenDawgNode(frozen, i) for i in top_node_ids)
+
+    def insert_dawg_node(self, *args, **kwargs):
+        raise TypeError("a frozen DAWG is read-only")
+
+
+class _FrozenChildren(Mapping):
+    def __init__(self, frozen, index):
+        """
+        initialises a mapping of edge labels to the child nodes of a frozen node. Edges keep the order the children
+        were inserted in, so traversals and ties in rankings come out the same as on the built DAWG
+        RETURNS: None
+        """
+        self._frozen = frozen
+        self._start = frozen.node_offsets[index]
+        self._end = frozen.node_offsets[index + 1]
+
+    def __getitem__(self, letter):
+        if not isinstance(letter, str) or len(letter) != 1:
+            raise KeyError(letter)
+        code = ord(letter)
+        edge_labels = self._frozen.edge_labels
+        for i in range(self._start, self._end):
+            if edge_labels[i] == code:
+                return _FrozenDawgNode(self._frozen, self._frozen.edge_children[i])
+        raise KeyError(letter)
+
+    def __iter__(self):
+        for i in range(self._start, self._end):
+            yield chr(self._frozen.edge_labels[i])
+
+    def __len__(self):
+        return self._end - self._start
+
+
+class _FrozenWords(Mapping):
+    def __init__(self, frozen):
+        """
+        initialises a read-only stand-in for AutoComplete.words holding each word's count and original key
+        RETURNS: None
+        """
+        self._frozen = frozen
+
+    def __getitem__(self, word):
+        word_id = self._frozen.find_word_id(word)
+        if word_id < 0:
+            raise KeyError(word)
+        value = {'count': self._frozen.word_counts[word_id]}
+        original_key = self._frozen.get_string(self._frozen.word_original_key_ids[word_id])
+        if original_key is not None:
+            value['original_key'] = original_key
+        return value
+
+    def __contains__(self, word):
+        return self._frozen.find_word_id(word) >= 0
+
+    def __iter__(self):
+        for word_id in range(len(self)):
+            yield self._frozen.get_string(word_id)
+
+    def __len__(self):
+        return len(self._frozen.word_counts)
+
+
+class _FrozenWordIndex(_FrozenWords):
+    def __getitem__(self, word):
+        """
+        returns the position a word had in the words it was frozen from
+        RETURNS: integer
+        """
+        word_id = self._frozen.find_word_id(word)
+        if word_id < 0:
+            raise KeyError(word)
+        return word_id
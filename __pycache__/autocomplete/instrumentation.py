@@ -0,0 +1,160 @@
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from enum import Enum
+from threading import Lock, local
+from time import perf_counter
+
+
+class SearchStage(Enum):
+    """
+    stages of AutoComplete.search_for_similar_words that SearchInstrumentation times
+    """
+    search = 0 # the whole search
+    normalisation = 1 # normalising the query
+    cache = 2 # looking the query up in the cache and storing its result
+    prefix_autofill = 3 # matching the query's prefix against the DAWG
+    fuzzy_scan = 4 # finding fuzzy matches of the rest of the query
+    descendant_expansion = 5 # adding the descendant words of matched nodes
+    synonym_reversal = 6 # replacing synonyms in results with the words they stand for
+
+
+class SearchTrace:
+    def __init__(self, word):
+        """
+        initialises the record of one search: the seconds and number of calls spent in each stage, the FindSteps it
+        went through and whether its result came from the cache
+        RETURNS: None
+        """
+        self.word = word
+        self.seconds = Counter()
+        self.calls = Counter()
+        self.find_steps = []
+        self.cache_hit = False
+
+    def __repr__(self):
+        stages = ', '.join(f"{stage.name}={seconds * 1000:.3f}ms" for stage, seconds in self.seconds.items())
+        return f"SearchTrace({self.word!r}, {stages})"
+
+
+class SearchInstrumentation:
+    # upper bounds, in seconds, of the histogram buckets; a last bucket takes anything slower
+    default_bucket_bounds = (0.00001, 0.00003, 0.0001, 0.0003, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0)
+
+    def __init__(self, callback=None, bucket_bounds=None):
+        """
+        initialises an opt-in recorder for AutoComplete searches. Every stage keeps a call count, total time and
+        latency histogram, and FindSteps are counted. callback, if given, is called with the SearchTrace of each
+        search once it finishes, e.g. to export it to a metrics pipeline or log the slow ones
+        RETURNS: None
+        """
+        self.callback = callback
+        self.bucket_bounds = tuple(bucket_bounds or self.default_bucket_bounds)
+        self._lock = Lock()
+        self._local = local() # the trace of the search running on each thread
+        self.reset()
+
+    def reset(self):
+        """
+        clears every count, total and histogram
+        RETURNS: None
+        """
+        with self._lock:
+            self._calls = Counter()
+            self._seconds = Counter()
+            self._histograms = {stage: [0] * (len(self.bucket_bounds) + 1) for stage in SearchStage}
+            self._find_steps = Counter()
+
+    @contextmanager
+    def measure(self, stage):
+        """
+        times the block it wraps as a call of a stage
+        RETURNS: generator
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def record(self, stage, seconds):
+        """
+        records a call of a stage that took a number of seconds
+        RETURNS: None
+        """
+        with self._lock:
+            self._calls[stage] += 1
+            self._seconds[stage] += seconds
+            self._histograms[stage][bisect_left(self.bucket_bounds, seconds)] += 1
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.calls[stage] += 1
+            trace.seconds[stage] += seconds
+
+    def record_find_steps(self, find_steps):
+        """
+        counts the FindSteps of a search, including those of the searches for the rest of a fuzzy word
+        RETURNS: None
+        """
+        flat_steps = list(self._flatten_find_steps(find_steps))
+        with self._lock:
+            self._find_steps.update(flat_steps)
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.find_steps.extend(flat_steps)
+
+    def record_cache_hit(self):
+        """
+        marks the running search as answered from the cache
+        RETURNS: None
+        """
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.cache_hit = True
+
+    @staticmethod
+    def _flatten_find_steps(find_steps):
+        """
+        helper method gets the FindSteps of a search and of the searches nested in it
+        RETURNS: generator
+        """
+        for step in find_steps:
+            if isinstance(step, dict):
+                for nested_step, nested_steps in step.items():
+                    yield nested_step
+                    yield from SearchInstrumentation._flatten_find_steps(nested_steps)
+            else:
+                yield step
+
+    @contextmanager
+    def trace(self, word):
+        """
+        records a search as a SearchTrace, timed as SearchStage.search, and passes it to the callback. Searches
+        started within it, as by search_many, are recorded in the same trace
+        RETURNS: generator (the trace)
+        """
+        if getattr(self._local, 'trace', None) is not None:
+            yield self._local.trace
+            return
+        trace = self._local.trace = SearchTrace(word)
+        try:
+            with self.measure(SearchStage.search):
+                yield trace
+        finally:
+            self._local.trace = None
+        if self.callback:
+            self.callback(trace)
+
+    def stats(self):
+        """
+        returns the call count, total seconds and histogram of each stage, and the count of each FindStep. A
+        histogram is a list of (upper bound in seconds, calls) pairs, the last bound being infinity
+        RETURNS: dictionary
+        """
+        bounds = self.bucket_bounds + (float('inf'),)
+        with self._lock:
+            stages = {stage.name: {
+            'calls': self._calls[stage],
+            'seconds': self._seconds[stage],
+            'histogram': list(zip(bounds, self._histograms[stage]))} for stage in SearchStage}
+            return {'stages': stages, 'find_steps': {step.name: count for step, count in self._find_steps.items()}}
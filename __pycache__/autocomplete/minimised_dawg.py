@@ -0,0 +1,275 @@
+import sys
+from array import array
+from collections.abc import Mapping
+
+
+_MIN_RANKED_WORDS = 64 # prefixes with fewer words below them are ranked by traversal, which is cheap for so few
+
+
+class _SuffixNode:
+    __slots__ = ('letters', 'children', 'has_word', 'size')
+
+    def __init__(self, letters, children, has_word, size):
+        """
+        initialises a node of a minimised DAWG's shared graph: the letters of its edges in order, the child along each
+        (a _SuffixNode, or a _SuffixLink for an edge a synonym added to a node elsewhere in the DAWG), whether the
+        position it's reached at holds a word and how many positions below it, itself included, hold one. The words
+        themselves are kept off the node, so the nodes of equal suffixes are one node
+        RETURNS: None
+        """
+        self.letters = letters
+        self.children = children
+        self.has_word = has_word
+        self.size = size
+
+
+class _SuffixLink:
+    __slots__ = ('node', 'base')
+
+    def __init__(self, base):
+        """
+        initialises an edge to the position a synonym shares with its word: the shared node reached there, set once
+        the graph is built, and the number of words before it
+        RETURNS: None
+        """
+        self.node = None
+        self.base = base
+
+
+def _holds_word(node):
+    """
+    helper function checks if a node of a built DAWG holds anything for a word
+    RETURNS: bool
+    """
+    return node.word is not None or node.original_key is not None or node.count != 0
+
+
+class _MinimisedDawg:
+    def __init__(self, root, min_ranked_words=_MIN_RANKED_WORDS):
+        """
+        initialises a read-only DAWG in which equal suffixes are held once, from a built (and ranked) DAWG. Positions
+        are numbered in depth-first order and each word's word, original key and count are kept in tables at the
+        number of words before it, which every node works out from its parent's as it's reached, so nodes merged
+        into one still hold their own words. Edges that synonyms added to another branch are kept as links to the
+        position they lead to. Rankings are kept for positions with more than min_ranked_words words below them, or
+        a link, and the rest are ranked by traversal
+        RETURNS: None
+        """
+        bases = {} # node of the built DAWG -> number of words before it
+        nodes = [] # nodes of the built DAWG in depth-first order
+        edges = {} # node -> list of (letter, child node, whether the child was first reached through this edge)
+        self.words = []
+        self.original_keys = []
+        self.counts = array('q')
+        stack = [(None, None, root)]
+        while stack:
+            parent_node, letter, node = stack.pop()
+            if parent_node is not None:
+                is_first = node not in bases
+                edges[parent_node].append((letter, node, is_first))
+                if not is_first:
+                    continue
+            bases[node] = len(self.counts)
+            nodes.append(node)
+            edges[node] = []
+            if _holds_word(node):
+                self.words.append(node.word)
+                self.original_keys.append(node.original_key)
+                self.counts.append(int(node.count))
+            stack.extend((node, letter, child_node) for letter, child_node in reversed(node.children.items()))
+
+        register = {} # (holds a word, letters, children) -> the one node for them
+        shared_nodes = {} # node of the built DAWG -> its node in the shared graph
+        links = {} # node of the built DAWG -> link to it
+        has_links = set() # nodes of the built DAWG with a link below them
+        for node in reversed(nodes): # children come before their parents
+            letters = []
+            children = []
+            size = _holds_word(node)
+            for letter, child_node, is_first in edges.pop(node):
+                letters.append(letter)
+                if is_first:
+                    children.append(shared_nodes[child_node])
+                    size += shared_nodes[child_node].size
+                    if child_node in has_links:
+                        has_links.add(node)
+                else:
+                    link = links.get(child_node)
+                    if link is None:
+                        link = links[child_node] = _SuffixLink(bases[child_node])
+                    children.append(link)
+                    has_links.add(node)
+            key = (_holds_word(node), ''.join(letters), tuple(children))
+            shared_node = register.get(key)
+            if shared_node is None:
+                shared_node = register[key] = _SuffixNode(sys.intern(key[1]), key[2], key[0], size)
+            shared_nodes[node] = shared_node
+        for node, link in links.items():
+            link.node = shared_nodes[node]
+
+        self.rankings = {} # (shared node, number of words before the position) -> its top descendants as the same
+        for node in nodes:
+            if node.top_descendants is not None and (shared_nodes[node].size > min_ranked_words or node in has_links):
+                self.rankings[(shared_nodes[node], bases[node])] = tuple((shared_nodes[descendant], bases[descendant]) \
+                for descendant in node.top_descendants)
+        self.root = _MinimisedDawgNode(self, shared_nodes[root], 0)
+
+    def get_shared_nodes(self):
+        """
+        gets every node of the shared graph once
+        RETURNS: list
+        """
+        shared_nodes = [self.root._node]
+        seen_nodes = set(shared_nodes)
+        for shared_node in shared_nodes: # grows as unseen children are found, so this is a breadth-first walk
+            for child in shared_node.children:
+                if type(child) is _SuffixLink:
+                    child = child.node
+                if child not in seen_nodes:
+                    seen_nodes.add(child)
+                    shared_nodes.append(child)
+        return shared_nodes
+
+    def memory_report(self):
+        """
+        counts the nodes of the shared graph by how many children they have, and the bytes taken by the nodes and
+        links, their letters and children, the rankings, the tables of words' data and the strings they hold. Shared
+        objects are counted once
+        RETURNS: dictionary
+        """
+        counts = {'nodes': 0, 'word_nodes': len(self.counts), 'leaf_nodes': 0, 'single_child_nodes': 0,
+        'multi_child_nodes': 0, 'edges': 0}
+        sizes = {'nodes': 0, 'children': 0, 'top_descendants': 0, 'word_tables': 0, 'strings': 0}
+        seen_ids = set()
+
+        def add_size(component, obj):
+            if obj is not None and id(obj) not in seen_ids:
+                seen_ids.add(id(obj))
+                sizes[component] += sys.getsizeof(obj)
+
+        for shared_node in self.get_shared_nodes():
+            n_children = len(shared_node.children)
+            counts['nodes'] += 1
+            counts['edges'] += n_children
+            counts['leaf_nodes' if not n_children else 'single_child_nodes' if n_children == 1 else 'multi_child_nodes'] += 1
+            add_size('nodes', shared_node)
+            add_size('children', shared_node.letters)
+            add_size('children', shared_node.children)
+            for child in shared_node.children:
+                if type(child) is _SuffixLink:
+                    add_size('nodes', child)
+        add_size('top_descendants', self.rankings)
+        for key, ranking in self.rankings.items():
+            add_size('top_descendants', key)
+            add_size('top_descendants', ranking)
+            for entry in ranking:
+                add_size('top_descendants', entry)
+        for table in (self.words, self.original_keys, self.counts):
+            add_size('word_tables', table)
+        for string in self.words + self.original_keys:
+            add_size('strings', string)
+        return dict(counts, bytes=dict(sizes, total=sum(sizes.values())))
+
+
+class _MinimisedDawgNode(_DawgNode):
+    __slots__ = ('_dawg', '_node', '_base')
+
+    def __init__(self, dawg, node, base):
+        """
+        initialises a read-only view of the position a shared node is reached at in a _MinimisedDawg, given by the
+        number of words before it. It answers to the same attributes as a _DawgNode, so the traversal methods work
+        unchanged
+        RETURNS: None
+        """
+        self._dawg = dawg
+        self._node = node
+        self._base = base
+
+    def __eq__(self, other):
+        return isinstance(other, _MinimisedDawgNode) and self._node is other._node and self._base == other._base
+
+    def __hash__(self):
+        return hash((id(self._node), self._base))
+
+    @property
+    def word(self):
+        return self._dawg.words[self._base] if self._node.has_word else None
+
+    @property
+    def original_key(self):
+        return self._dawg.original_keys[self._base] if self._node.has_word else None
+
+    @property
+    def count(self):
+        return self._dawg.counts[self._base] if self._node.has_word else 0
+
+    @property
+    def children(self):
+        return _MinimisedChildren(self._dawg, self._node, self._base)
+
+    @property
+    def top_descendants(self):
+        ranking = self._dawg.rankings.get((self._node, self._base))
+        if ranking is None:
+            return None
+        return tuple(_MinimisedDawgNode(self._dawg, node, base) for node, base in ranking)
+
+    def insert_dawg_node(self, *args, **kwargs):
+        raise TypeError("a minimised DAWG is read-only")
+
+    def memory_report(self):
+        """
+        reports on the whole minimised DAWG (see _MinimisedDawg.memory_report), as its nodes are shared
+        RETURNS: dictionary
+        """
+        return self._dawg.memory_report()
+
+
+class _MinimisedChildren(Mapping):
+    def __init__(self, dawg, node, base):
+        """
+        initialises a mapping of edge labels to the child positions of a position in a _MinimisedDawg, in the order
+        the children were inserted. A child's number of words before it is its parent's, plus its parent's word, plus
+        the words below the children before it
+        RETURNS: None
+        """
+        self._dawg = dawg
+        self._node = node
+        self._base = base
+
+    def __getitem__(self, letter):
+        i = self._node.letters.find(letter) if isinstance(letter, str) and len(letter) == 1 else -1
+        if i < 0:
+            raise KeyError(letter)
+        children = self._node.children
+        child = children[i]
+        if type(child) is _SuffixLink:
+            return _MinimisedDawgNode(self._dawg, child.node, child.base)
+        base = self._base + self._node.has_word
+        for sibling in children[:i]:
+            if type(sibling) is _SuffixNode:
+                base += sibling.size
+        return _MinimisedDawgNode(self._dawg, child, base)
+
+    def __contains__(self, letter):
+        return isinstance(letter, str) and len(letter) == 1 and letter in self._node.letters
+
+    def __iter__(self):
+        return iter(self._node.letters)
+
+    def __len__(self):
+        return len(self._node.letters)
+
+    def items(self):
+        items = []
+        base = self._base + self._node.has_word
+        for letter, child in zip(self._node.letters, self._node.children):
+            if type(child) is _SuffixLink:
+                items.append((letter, _MinimisedDawgNode(self._dawg, child.node, child.base)))
+            else:
+                items.append((letter, _MinimisedDawgNode(self._dawg, child, base)))
+                base += child.size
+        return items
+
+    def values(self):
+        return [child_node for _, child_node in self.items()]
@@ -0,0 +1,121 @@
+import re 
+import string 
+
+
+_DASH_RUN_PATTERN = re.compile('-{2,}') 
+
+
+class _NodeNameTable(dict): 
+    """ 
+    str.translate table which keeps a set of valid characters and deletes any other, remembering each character it's 
+    asked about so that later lookups of it don't call back into Python 
+    """ 
+    def __init__(self, valid_chars): 
+        super().__init__((ord(char), ord(char)) for char in valid_chars) 
+        self._invalid_ascii = bytes(i for i in range(128) if chr(i) not in valid_chars) 
+
+    def __missing__(self, codepoint): 
+        self[codepoint] = None 
+        return None 
+
+    def remove_invalid_chars(self, name): 
+        """ 
+        deletes the invalid characters of a name, as bytes when it's ASCII since bytes.translate is much faster 
+        RETURNS: string 
+        """ 
+        if name.isascii(): 
+            return name.encode('ascii').translate(None, self._invalid_ascii).decode('ascii') 
+        return name.translate(self) 
+
+
+class Normaliser:
+    def __init__(self, valid_chars_for_string=None, valid_chars_for_integer=None, cache=None): 
+        """
+        initialises a Normaliser with sets of valid characters and a cache (or cache factory, see make_cache) for 
+        normalised names 
+        RETURNS: None 
+        """ 
+        self.valid_chars_for_string = frozenset(valid_chars_for_string or string.ascii_letters.lower()) 
+        self.valid_chars_for_integer = frozenset(valid_chars_for_integer or string.digits) 
+        self.valid_chars_for_node_name = frozenset({' ', '-', ':', '_'}).union(self.valid_chars_for_string, self.valid_chars_for_integer) 
+        self._normalised_lfu_cache = make_cache(cache) 
+        self.max_word_length = 40
+        self._node_name_table = _NodeNameTable(self.valid_chars_for_node_name) 
+        self._extra_chars_tables = {} 
+        string_chars, integer_chars = self._get_char_class(self.valid_chars_for_string), self._get_char_class(self.valid_chars_for_integer) 
+        # the gap between a letter and a digit, which can only be found if there's a digit. A dash that's both isn't 
+        # split from a dash before it, since it's collapsed into that one 
+        boundary = f'(?<={string_chars})(?={integer_chars})|(?<={integer_chars})(?={string_chars})' 
+        if '-' in self.valid_chars_for_string and '-' in self.valid_chars_for_integer: 
+            boundary = f'(?!(?<=-)-)(?:{boundary})' 
+        self._boundary_pattern = re.compile(boundary) 
+        self._boundary_check = re.compile(integer_chars) 
+
+    @staticmethod 
+    def _get_char_class(chars): 
+        """ 
+        helper method returns a regular expression character class matching any of a set of characters 
+        RETURNS: string 
+        """ 
+        return f"[{''.join(map(re.escape, sorted(chars)))}]" 
+
+    def normalise_many(self, names, extra_chars=None): 
+        """ 
+        lazily normalises every name of an iterable, as normalise_node_name does 
+        RETURNS: generator 
+        """ 
+        for name in names: 
+            yield self.normalise_node_name(name, extra_chars=extra_chars) 
+
+    def normalise_node_name(self, name, extra_chars=None):
+        """ 
+        removes invalid characters from a node's name, before caching it 
+        RETURNS: string 
+        """ 
+        if name is None: 
+            return '' 
+        name = name[:self.max_word_length] 
+        key = name if extra_chars is None else f"{name}{extra_chars}" 
+        result = self._normalised_lfu_cache.get_value(key) 
+        if result == -1: 
+            result = self._get_normalised_node_name(name, extra_chars=extra_chars) 
+            self._normalised_lfu_cache.set_value(key, result) 
+        return result 
+
+    def remove_any_special_character(self, name): 
+        """ 
+        remove any special characters from a node's name 
+        RETURNS: string 
+        """ 
+        if name is None: 
+            return '' 
+        name = name.lower()[:self.max_word_length] 
+        if '--' in name: 
+            name = _DASH_RUN_PATTERN.sub('-', name) 
+        return self._node_name_table.remove_invalid_chars(name).strip() 
+
+    def _get_normalised_node_name(self, name, extra_chars=None): 
+        """ 
+        helper method returns the normalised form of the node's name 
+        RETURNS: string 
+        """ 
+        name = result = name.lower() 
+        if self._boundary_check.search(name): 
+            result = self._boundary_pattern.sub(' ', result) 
+        if '--' in result: 
+            result = _DASH_RUN_PATTERN.sub('-', result) 
+        if name[:1] == '-' == name[-1:]: # a leading dash is dropped when the name also ends with one 
+            result = result[1:] 
+        return self._get_node_name_table(extra_chars).remove_invalid_chars(result).strip() 
+
+    def _get_node_name_table(self, extra_chars=None): 
+        """ 
+        helper method returns the str.translate table keeping the valid characters of a node's name and extra_chars 
+        RETURNS: _NodeNameTable 
+        """ 
+        if not extra_chars: 
+            return self._node_name_table 
+        table = self._extra_chars_tables.get(extra_chars) 
+        if table is None: 
+            table = self._extra_chars_tables[extra_chars] = _NodeNameTable(self.valid_chars_for_node_name.union(extra_chars)) 
+        return table 
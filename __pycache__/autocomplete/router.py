@@ -0,0 +1,253 @@
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+
+
+_SHARD_NAME_PATTERN = re.compile(r'\w[\w.-]*')
+
+
+class _ShardCache:
+    def __init__(self, cache, name):
+        """
+        initialises one shard's view of a cache shared by every shard of an AutoCompleteRouter, keeping the shard's
+        keys apart by pairing them with its name
+        RETURNS: None
+        """
+        self.cache = cache
+        self.name = name
+
+    def get_value(self, key):
+        return self.cache.get_value((self.name, key))
+
+    def set_value(self, key, value):
+        return self.cache.set_value((self.name, key), value)
+
+    def invalidate(self, predicate):
+        """
+        removes every one of the shard's keys for which predicate(key, value) is true
+        RETURNS: integer (number of keys removed)
+        """
+        return self.cache.invalidate(lambda key, value: key[0] == self.name and predicate(key[1], value))
+
+    def get_entries(self, limit=None):
+        """
+        returns up to limit of the shard's (key, value, frequency) entries, as the shared cache orders them
+        RETURNS: list
+        """
+        entries = [(key[1], value, freq) for key, value, freq in self.cache.get_entries() if key[0] == self.name]
+        return entries[:limit]
+
+    def set_entries(self, entries):
+        self.cache.set_entries([((self.name, key), value, freq) for key, value, freq in entries])
+
+
+class AutoCompleteRouter:
+    def __init__(self, directory, normaliser=None, cache=None, cache_capacity=65536, max_shards=None, max_bytes=None, \
+    idle_seconds=None, timer=time.monotonic, **kwargs):
+        """
+        initialises a router over named AutoComplete shards, e.g. one per tenant, whose snapshots (see
+        AutoComplete.save) are kept in directory as <name>.snapshot. Shards are loaded the first time they're used and
+        share one Normaliser, so a shard whose snapshot was saved with other valid characters isn't loaded, and one
+        search cache (a cache or factory, see make_cache) holding at most cache_capacity results of every shard
+        together. The least recently used shards are evicted while more than max_shards are loaded or the bytes their
+        AutoCompletes take once loaded (see AutoComplete.memory_report) total more than max_bytes, and any unused for
+        idle_seconds are evicted too. The cache's results aren't counted in max_bytes, so cache_capacity bounds them.
+        kwargs are passed to AutoComplete.load
+        RETURNS: None
+        """
+        self.directory = directory
+        self.normaliser = normaliser or Normaliser()
+        self.cache = make_cache(cache, capacity=cache_capacity)
+        self.max_shards = max_shards
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.timer = timer
+        self._load_kwargs = kwargs
+        self._shards = OrderedDict() # name -> [AutoComplete, bytes it takes, last used], least recently used first
+        self._lock = Lock()
+        self._load_locks = {} # name -> [lock, number of threads holding or waiting on it]
+        self.loads = self.evictions = 0
+
+    def __len__(self):
+        return len(self._shards)
+
+    def __contains__(self, name):
+        return name in self._shards or os.path.exists(self.get_snapshot_path(name))
+
+    def get_snapshot_path(self, name):
+        """
+        returns the path of a shard's snapshot, checking that its name can't point outside the directory
+        RETURNS: string
+        """
+        if not isinstance(name, str) or not _SHARD_NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"{name!r} isn't a valid shard name")
+        return os.path.join(self.directory, f'{name}.snapshot')
+
+    def get(self, name):
+        """
+        returns a shard, loading it from its snapshot if it isn't loaded
+        RETURNS: AutoComplete
+        """
+        autocomplete = self._use(name)
+        if autocomplete is not None:
+            return autocomplete
+        with self._loading(name): # so concurrent first uses of a shard load it once
+            autocomplete = self._use(name)
+            if autocomplete is None:
+                path = self.get_snapshot_path(name)
+                if not os.path.exists(path):
+                    raise KeyError(name)
+                autocomplete = self._load(name, path)
+                self.loads += 1
+        return autocomplete
+
+    def add(self, name, autocomplete, cache_entries=1024):
+        """
+        saves an AutoComplete as a shard's snapshot and makes it the loaded shard, replacing any shard of that name.
+        The AutoComplete is loaded back from the snapshot so that it uses the router's Normaliser and cache
+        RETURNS: AutoComplete (the shard)
+        """
+        path = self.get_snapshot_path(name)
+        os.makedirs(self.directory, exist_ok=True)
+        autocomplete.save(path, cache_entries=cache_entries)
+        with self._loading(name):
+            self.evict(name)
+            return self._load(name, path)
+
+    def save(self, name, cache_entries=1024):
+        """
+        saves a loaded shard's snapshot, e.g. after words have been added to it, so the changes outlive its eviction
+        RETURNS: None
+        """
+        with self._lock:
+            autocomplete = self._shards[name][0]
+        autocomplete.save(self.get_snapshot_path(name), cache_entries=cache_entries)
+
+    def evict(self, name):
+        """
+        unloads a shard and drops its cached results; its snapshot is kept to load it again
+        RETURNS: bool (whether it was loaded)
+        """
+        with self._lock:
+            shard = self._shards.pop(name, None)
+        if shard is None:
+            return False
+        self.cache.invalidate(lambda key, value: key[0] == name)
+        self.evictions += 1
+        return True
+
+    def evict_idle(self):
+        """
+        unloads every shard that hasn't been used for idle_seconds
+        RETURNS: list (names of the shards evicted)
+        """
+        if self.idle_seconds is None:
+            return []
+        deadline = self.timer() - self.idle_seconds
+        with self._lock:
+            idle_names = [name for name, (_, _, last_used) in self._shards.items() if last_used <= deadline]
+        return [name for name in idle_names if self.evict(name)]
+
+    @contextmanager
+    def _loading(self, name):
+        """
+        helper method holds a shard's load lock while the shard is loaded, dropping the lock once no thread holds or
+        waits on it, so there are only locks for the shards being loaded
+        RETURNS: generator
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, [Lock(), 0])
+            load_lock[1] += 1
+        try:
+            with load_lock[0]:
+                yield
+        finally:
+            with self._lock:
+                load_lock[1] -= 1
+                if not load_lock[1]:
+                    del self._load_locks[name]
+
+    def _load(self, name, path):
+        """
+        helper method loads a shard from its snapshot with the router's Normaliser and cache, which raises a
+        ValueError if the snapshot's valid characters aren't the Normaliser's, and adds it
+        RETURNS: AutoComplete
+        """
+        autocomplete = AutoComplete.load(path, cache=_ShardCache(self.cache, name), normaliser=self.normaliser, \
+        **self._load_kwargs)
+        self._add_shard(name, autocomplete, autocomplete.memory_report()['bytes']['total'])
+        return autocomplete
+
+    def _use(self, name):
+        """
+        helper method gets a loaded shard, marking it as the most recently used, and evicts idle shards
+        RETURNS: AutoComplete (None if it isn't loaded)
+        """
+        with self._lock:
+            shard = self._shards.get(name)
+            if shard is not None:
+                shard[2] = self.timer()
+                self._shards.move_to_end(name)
+            oldest = next(iter(self._shards.values()), None)
+        if self.idle_seconds is not None and oldest is not None and oldest[2] <= self.timer() - self.idle_seconds:
+            self.evict_idle()
+        return shard and shard[0]
+
+    def _add_shard(self, name, autocomplete, size):
+        """
+        helper method adds a loaded shard and evicts the least recently used others while over max_shards or max_bytes
+        RETURNS: None
+        """
+        with self._lock:
+            self._shards[name] = [autocomplete, size, self.timer()]
+            self._shards.move_to_end(name)
+            victims = []
+            shard_count, total_bytes = len(self._shards), sum(shard[1] for shard in self._shards.values())
+            for victim_name, (_, victim_size, _) in self._shards.items():
+                if victim_name == name or not (self.max_shards is not None and shard_count > self.max_shards or \
+                self.max_bytes is not None and total_bytes > self.max_bytes):
+                    break
+                victims.append(victim_name)
+                shard_count -= 1
+                total_bytes -= victim_size
+        for victim_name in victims:
+            self.evict(victim_name)
+
+    def search_for_similar_words(self, name, word, max_cost=2, size=5):
+        """
+        searches a shard as AutoComplete.search_for_similar_words does
+        RETURNS: list
+        """
+        return self.get(name).search_for_similar_words(word, max_cost, size)
+
+    def search_many(self, name, words, max_cost=2, size=5):
+        """
+        searches a shard as AutoComplete.search_many does
+        RETURNS: list of lists
+        """
+        return self.get(name).search_many(words, max_cost, size)
+
+    async def search_async(self, name, word, max_cost=2, size=5, session=None):
+        """
+        searches a shard as AutoComplete.search_async does, loading it in the default executor if it isn't loaded
+        RETURNS: list
+        """
+        autocomplete = self._use(name)
+        if autocomplete is None:
+            autocomplete = await asyncio.get_running_loop().run_in_executor(None, self.get, name)
+        return await autocomplete.search_async(word, max_cost, size, session=session)
+
+    def stats(self):
+        """
+        returns the loaded shards with the bytes they took when loaded, load and eviction counters and the shared
+        caches' stats
+        RETURNS: dictionary
+        """
+        with self._lock:
+            shards = {name: shard[1] for name, shard in self._shards.items()}
+        return {'shards': shards, 'bytes': sum(shards.values()), 'loads': self.loads, 'evictions': self.evictions,
+        'cache': self.cache.stats(), 'normaliser_cache': self.normaliser._normalised_lfu_cache.stats()}
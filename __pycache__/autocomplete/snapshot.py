@@ -0,0 +1,54 @@
+import json
+import struct
+
+
+_SNAPSHOT_MAGIC = b'NETROSNP'
+_SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct('<8sI4xQQ') # magic, version, metadata offset, DAWG offset
+_ALIGNMENT = 8
+
+
+def _write_aligned(f, data):
+    """
+    helper function writes bytes to a file, padded so the next section starts on an aligned offset
+    RETURNS: None
+    """
+    f.write(data)
+    f.write(b'\0' * (-len(data) % _ALIGNMENT))
+
+
+def write_snapshot(path, root, words, metadata, original_key='original_key'):
+    """
+    writes a snapshot of an AutoComplete: a header, its metadata (words with their values, synonym maps, settings
+    and cache entries) as JSON and the DAWG's arrays, rankings included, as written by write_frozen_dawg. Nothing is
+    pickled, so a snapshot can't run code when it's loaded
+    RETURNS: None
+    """
+    with open(path, 'wb') as f:
+        f.write(b'\0' * _SNAPSHOT_HEADER.size)
+        metadata_offset = f.tell()
+        _write_aligned(f, json.dumps(metadata, separators=(',', ':')).encode('utf-8'))
+
+        dawg_offset = f.tell()
+        write_frozen_dawg(f, root, words, original_key=original_key)
+
+        f.seek(0)
+        f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, metadata_offset, dawg_offset))
+
+
+def read_snapshot(path):
+    """
+    reads a snapshot written by write_snapshot back into its metadata and a DAWG of ordinary nodes
+    RETURNS: tuple (metadata, root)
+    """
+    with open(path, 'rb') as f:
+        magic, version, metadata_offset, dawg_offset = _SNAPSHOT_HEADER.unpack(f.read(_SNAPSHOT_HEADER.size))
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError(f"{path} isn't a version {_SNAPSHOT_VERSION} AutoComplete snapshot")
+        metadata = json.loads(f.read(dawg_offset - metadata_offset).rstrip(b'\0'))
+
+    frozen_dawg = _FrozenDawg(path, offset=dawg_offset)
+    try:
+        return metadata, frozen_dawg.thaw()[0]
+    finally:
+        frozen_dawg.close()
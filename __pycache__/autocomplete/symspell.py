@@ -0,0 +1,79 @@
+class SymSpellIndex:
+    def __init__(self, max_distance=1):
+        """
+        initialises a symmetric delete (SymSpell) index, which maps every string reachable from a word's path by up to
+        max_distance deletions back to the paths it came from. Two paths within max_distance edits of each other
+        always share such a string, so fuzzy candidates come from a few dictionary lookups and are then verified
+        RETURNS: None
+        """
+        self.max_distance = max_distance
+        self._deletes = {} # deletion of a path -> paths it was made from
+        self._words = {} # path -> word held at it
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, path):
+        return path in self._words
+
+    def can_lookup(self, max_cost):
+        """
+        checks if the index holds enough deletions to find every word less than max_cost edits away
+        RETURNS: bool
+        """
+        return max_cost - 1 <= self.max_distance
+
+    def add(self, path, word):
+        """
+        adds a word at its normalised path, replacing the word held there before
+        RETURNS: None
+        """
+        if path not in self._words:
+            for deletion in self._get_deletions(path, self.max_distance):
+                self._deletes.setdefault(deletion, []).append(path)
+        self._words[path] = word
+
+    def remove(self, path):
+        """
+        removes the word held at a path
+        RETURNS: None
+        """
+        if self._words.pop(path, None) is None:
+            return
+        for deletion in self._get_deletions(path, self.max_distance):
+            paths = self._deletes[deletion]
+            paths.remove(path)
+            if not paths:
+                del self._deletes[deletion]
+
+    def lookup(self, word, max_cost):
+        """
+        gets the words whose paths are less than max_cost Levenshtein edits from a word
+        RETURNS: dictionary (word -> distance)
+        """
+        max_distance = max_cost - 1
+        if max_distance < 0:
+            return {}
+        candidates = set()
+        for deletion in self._get_deletions(word, max_distance):
+            candidates.update(self._deletes.get(deletion, ()))
+
+        matches = {}
+        for path in candidates:
+            dist = banded_levenshtein_distance(word, path, max_distance)
+            if dist <= max_distance:
+                matches[self._words[path]] = dist
+        return matches
+
+    @staticmethod
+    def _get_deletions(word, max_distance):
+        """
+        helper method gets the strings made by deleting up to max_distance characters from a word, itself included
+        RETURNS: set
+        """
+        deletions = {word}
+        frontier = {word}
+        for _ in range(max_distance):
+            frontier = {_word[:i] + _word[i + 1:] for _word in frontier for i in range(len(_word))}
+            deletions |= frontier
+        return deletions
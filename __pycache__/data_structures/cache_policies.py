@@ -0,0 +1,387 @@
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+
+
+def make_cache(cache=None, capacity=2048):
+    """
+    resolves a cache argument into a cache: None gives the default LFUCache, a class or other callable is called as a
+    factory with the capacity and anything else is taken to be a cache already
+    RETURNS: cache
+    """
+    if cache is None:
+        return LFUCache(capacity)
+    if callable(cache):
+        return cache(capacity)
+    return cache
+
+
+class CachePolicy(metaclass=ABCMeta):
+    """
+    abstract base class for the caches AutoComplete and Normaliser can be given. Like LFUCache, get_value returns -1
+    for a miss. Subclasses implement _get and _set, which are called under the cache's lock
+    """
+    _missing = object()
+
+    def __init__(self, capacity):
+        """
+        initialises a cache with a capacity, a lock and hit/miss/eviction counters
+        RETURNS: None
+        """
+        self.capacity = capacity
+        self.lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def _get(self, key):
+        """
+        returns the cached value for a key, or CachePolicy._missing
+        RETURNS: object
+        """
+        pass
+
+    @abstractmethod
+    def _set(self, key, value):
+        """
+        caches a value for a key, evicting as the policy decides
+        RETURNS: None
+        """
+        pass
+
+    @abstractmethod
+    def _items(self):
+        """
+        returns a list of the cached (key, value) pairs
+        RETURNS: list
+        """
+        pass
+
+    @abstractmethod
+    def _delete(self, key):
+        """
+        removes a cached key
+        RETURNS: None
+        """
+        pass
+
+    def get_value(self, key):
+        """
+        retrieves the value associated with a given key from the cache
+        RETURNS: object (-1 if the key isn't cached)
+        """
+        with self.lock:
+            value = self._get(key)
+            if value is self._missing:
+                self.misses += 1
+                return -1
+            self.hits += 1
+            return value
+
+    def set_value(self, key, value):
+        """
+        sets the value associated with the given key in the cache
+        RETURNS: None
+        """
+        if self.capacity <= 0:
+            return -1
+        with self.lock:
+            self._set(key, value)
+
+    def invalidate(self, predicate):
+        """
+        removes every cached key for which predicate(key, value) is true, e.g. when the data behind them changes
+        RETURNS: integer (number of keys removed)
+        """
+        with self.lock:
+            keys = [key for key, value in self._items() if predicate(key, value)]
+            for key in keys:
+                self._delete(key)
+            return len(keys)
+
+    def get_entries(self, limit=None):
+        """
+        returns up to limit (key, value, frequency) entries, e.g. to warm another cache. Policies that don't count
+        uses give every entry a frequency of 1 and list the most recently cached first
+        RETURNS: list
+        """
+        with self.lock:
+            return [(key, value, 1) for key, value in reversed(self._items())][:limit]
+
+    def set_entries(self, entries):
+        """
+        caches (key, value, frequency) entries in the order that leaves the first ones the least likely to be evicted
+        RETURNS: None
+        """
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            for key, value, _ in reversed(list(entries)[:self.capacity]):
+                self._set(key, value)
+
+    def stats(self):
+        """
+        returns hit, miss and eviction counters to compare policies and sizes
+        RETURNS: dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self),
+        'capacity': self.capacity}
+
+
+class LRUCache(CachePolicy):
+    def __init__(self, capacity):
+        """
+        initialises a least recently used (LRU) cache
+        RETURNS: None
+        """
+        super().__init__(capacity)
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.cache)
+
+    def _get(self, key):
+        value = self.cache.get(key, self._missing)
+        if value is not self._missing:
+            self.cache.move_to_end(key)
+        return value
+
+    def _set(self, key, value):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.capacity:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        self.cache[key] = value
+
+    def _items(self):
+        return list(self.cache.items())
+
+    def _delete(self, key):
+        del self.cache[key]
+
+
+class AgingLFUCache(CachePolicy):
+    def __init__(self, capacity, aging_period=None):
+        """
+        initialises a least frequently used cache whose frequencies are halved every aging_period insertions
+        (by default the capacity), so keys that were popular once don't stay pinned after traffic moves on
+        RETURNS: None
+        """
+        super().__init__(capacity)
+        self.aging_period = aging_period or max(1, capacity)
+        self.cache = {} # key -> [value, frequency]
+        self.buckets = {} # frequency -> OrderedDict of keys, least recently used first
+        self.min_freq = 0
+        self._insertions = 0
+
+    def __len__(self):
+        return len(self.cache)
+
+    def _touch(self, key, entry):
+        """
+        helper method moves a key to the next frequency bucket
+        RETURNS: None
+        """
+        freq = entry[1]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        entry[1] = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _age(self):
+        """
+        helper method halves every frequency, keeping the recency order within each bucket
+        RETURNS: None
+        """
+        buckets = {}
+        for freq in sorted(self.buckets):
+            for key in self.buckets[freq]:
+                new_freq = max(1, freq // 2)
+                self.cache[key][1] = new_freq
+                buckets.setdefault(new_freq, OrderedDict())[key] = None
+        self.buckets = buckets
+        self.min_freq = min(buckets) if buckets else 0
+
+    def _get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return self._missing
+        self._touch(key, entry)
+        return entry[0]
+
+    def _set(self, key, value):
+        entry = self.cache.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._touch(key, entry)
+            return
+
+        if len(self.cache) >= self.capacity:
+            victim, _ = self.buckets[self.min_freq].popitem(last=False)
+            if not self.buckets[self.min_freq]:
+                del self.buckets[self.min_freq]
+            del self.cache[victim]
+            self.evictions += 1
+        self.cache[key] = [value, 1]
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_freq = 1
+
+        self._insertions += 1
+        if self._insertions % self.aging_period == 0:
+            self._age()
+
+    def _items(self):
+        return [(key, entry[0]) for key, entry in self.cache.items()]
+
+    def _delete(self, key):
+        freq = self.cache.pop(key)[1]
+        del self.buckets[freq][key]
+        if not self.buckets[freq]:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = min(self.buckets) if self.buckets else 0
+
+
+class _CountMinSketch:
+    def __init__(self, width, depth=4):
+        """
+        initialises a count-min sketch of small saturating counters used to estimate how often keys are requested.
+        Every counter is halved once width * 10 increments have been made, so estimates follow recent traffic
+        RETURNS: None
+        """
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        self.seeds = [0x9E3779B1 * (i + 1) for i in range(depth)]
+        self.sample_size = width * 10
+        self.additions = 0
+
+    def _indexes(self, key):
+        key_hash = hash(key)
+        return [((key_hash ^ seed) * 0x85EBCA6B >> 7) % self.width for seed in self.seeds]
+
+    def increment(self, key):
+        for row, i in zip(self.rows, self._indexes(key)):
+            if row[i] < 15:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.rows = [[count >> 1 for count in row] for row in self.rows]
+            self.additions //= 2
+
+    def estimate(self, key):
+        return min(row[i] for row, i in zip(self.rows, self._indexes(key)))
+
+
+class TinyLFUCache(CachePolicy):
+    def __init__(self, capacity, window_ratio=0.01, protected_ratio=0.8):
+        """
+        initialises a W-TinyLFU cache: new keys go into a small LRU window, and a key leaving the window only enters
+        the segmented LRU main area if a frequency sketch says it's requested more often than the main area's victim
+        RETURNS: None
+        """
+        super().__init__(capacity)
+        self.window_capacity = min(capacity, max(1, int(capacity * window_ratio))) # the segments add up to capacity
+        main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(main_capacity * protected_ratio)
+        self.probation_capacity = main_capacity - self.protected_capacity
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = _CountMinSketch(max(16, capacity))
+
+    def __len__(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def _get(self, key):
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        return self._missing
+
+    def _promote(self, key, value):
+        """
+        helper method moves a key from probation to protected, demoting protected's oldest key if it's full
+        RETURNS: None
+        """
+        self.protected[key] = value
+        if len(self.protected) > self.protected_capacity:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+
+    def _set(self, key, value):
+        for segment in (self.window, self.protected, self.probation):
+            if key in segment:
+                segment[key] = value
+                segment.move_to_end(key)
+                return
+
+        self.sketch.increment(key)
+        self.window[key] = value
+        if len(self.window) <= self.window_capacity:
+            return
+
+        candidate_key, candidate_value = self.window.popitem(last=False)
+        if len(self.probation) + len(self.protected) < self.probation_capacity + self.protected_capacity:
+            self.probation[candidate_key] = candidate_value
+            return
+
+        victims = self.probation or self.protected # both empty if the window takes the whole capacity
+        if victims:
+            victim_key = next(iter(victims))
+            if self.sketch.estimate(candidate_key) > self.sketch.estimate(victim_key):
+                del victims[victim_key]
+                self.probation[candidate_key] = candidate_value
+        self.evictions += 1
+
+    def _items(self):
+        return [*self.window.items(), *self.probation.items(), *self.protected.items()]
+
+    def _delete(self, key):
+        for segment in (self.window, self.probation, self.protected):
+            segment.pop(key, None)
+
+
+class TTLCache(LRUCache):
+    def __init__(self, capacity, ttl=300, timer=time.monotonic):
+        """
+        initialises an LRU cache whose entries expire ttl seconds after they're set
+        RETURNS: None
+        """
+        super().__init__(capacity)
+        self.ttl = ttl
+        self.timer = timer
+
+    def _get(self, key):
+        entry = super()._get(key)
+        if entry is self._missing:
+            return entry
+        value, expires_at = entry
+        if self.timer() >= expires_at:
+            del self.cache[key]
+            self.evictions += 1
+            return self._missing
+        return value
+
+    def _set(self, key, value):
+        super()._set(key, (value, self.timer() + self.ttl))
+
+    def _items(self):
+        return [(key, entry[0]) for key, entry in self.cache.items()]
@@ -0,0 +1,333 @@
+from threading import Lock
+
+
+class CacheNode:
+    __slots__ = ('key', 'value', 'freq_node', 'pre', 'nxt')
+
+    def __init__(self, key, value):
+        """
+        initialises a CacheNode with a key and value
+        RETURNS: None
+        """
+        self.key = key
+        self.value = value
+        self.freq_node = None
+        self.pre = None # previous CacheNode
+        self.nxt = None # next CacheNode
+
+    def remove_cache_node(self):
+        """
+        removes the current CacheNode from its FreqNode's linked list
+        RETURNS: None
+        """
+        if self.freq_node.cache_head is self.freq_node.cache_tail:
+            self.freq_node.cache_head = self.freq_node.cache_tail = None
+        elif self.freq_node.cache_head is self:
+            self.nxt.pre = None
+            self.freq_node.cache_head = self.nxt
+        elif self.freq_node.cache_tail is self:
+            self.pre.nxt = None
+            self.freq_node.cache_tail = self.pre
+        else:
+            self.pre.nxt = self.nxt
+            self.nxt.pre = self.pre
+
+        self.pre = self.nxt = self.freq_node = None
+
+
+class FreqNode:
+    __slots__ = ('freq', 'pre', 'nxt', 'cache_head', 'cache_tail')
+
+    def __init__(self, freq):
+        """
+        initialises a doubly linked list
+        RETURNS: None
+        """
+        self.freq = freq
+        self.pre = None # previous FreqNode
+        self.nxt = None # next FreqNode
+        self.cache_head = None # CacheNode head under this linked list
+        self.cache_tail = None # CacheNode tail under this linked list
+
+    def is_empty(self):
+        """
+        checks if the current FreqNode holds no CacheNodes
+        RETURNS: bool
+        """
+        return self.cache_head is None
+
+    def remove_freq_node(self):
+        """
+        removes the current FreqNode from the linked list
+        RETURNS: pointer
+        """
+        if self.pre:
+            self.pre.nxt = self.nxt
+        if self.nxt:
+            self.nxt.pre = self.pre
+
+        pre, nxt = self.pre, self.nxt
+        self.pre = self.nxt = self.cache_head = self.cache_tail = None
+
+        return pre, nxt
+
+    def pop_head_cache(self):
+        """
+        removes and returns the CacheNode head of the linked list
+        RETURNS: pointer
+        """
+        cache_head = self.cache_head
+        if cache_head is not None:
+            cache_head.remove_cache_node()
+        return cache_head
+
+    def append_cache_to_tail(self, cache_node):
+        """
+        appends cache node to linked list's tail
+        RETURNS: None
+        """
+        cache_node.freq_node = self
+        cache_node.nxt = None
+        if self.cache_tail is None:
+            cache_node.pre = None
+            self.cache_head = self.cache_tail = cache_node
+        else:
+            cache_node.pre = self.cache_tail
+            self.cache_tail.nxt = cache_node
+            self.cache_tail = cache_node
+
+    def insert_after_current_freq_node(self, freq_node):
+        """
+        inserts a FreqNode after the current one
+        RETURNS: None
+        """
+        freq_node.pre = self
+        freq_node.nxt = self.nxt
+        if self.nxt:
+            self.nxt.pre = freq_node
+        self.nxt = freq_node
+
+    def insert_before_current_freq_node(self, freq_node):
+        """
+        inserts a FreqNode before the current one
+        RETURNS: None
+        """
+        if self.pre:
+            self.pre.nxt = freq_node
+        freq_node.pre = self.pre
+        freq_node.nxt = self
+        self.pre = freq_node
+
+
+class LFUCache:
+    def __init__(self, capacity, shards=1):
+        """
+        initialises a least frequently used (LFU) cache with a given capacity and the head of the frequency linked list.
+        With more than one shard, keys are spread by hash over independent caches that each have their own lock, so
+        concurrent threads rarely wait on each other
+        RETURNS: None
+        """
+        self.capacity = capacity
+        self.shards = max(1, shards)
+        self.cache = {}
+        self.freq_link_head = None
+        self.lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+        self._shards = None
+        if self.shards > 1:
+            self._shards = [LFUCache(capacity // self.shards + (i < capacity % self.shards)) for i in range(self.shards)]
+
+    def __len__(self):
+        if self._shards:
+            return sum(map(len, self._shards))
+        return len(self.cache)
+
+    def _get_shard(self, key):
+        """
+        helper method returns the shard responsible for a key
+        RETURNS: LFUCache
+        """
+        return self._shards[hash(key) % self.shards]
+
+    def get_value(self, key):
+        """
+        retrieves the value associated with a given key from the cache, updating the frequency of the CacheNode and linked list
+        RETURNS: string/integer (-1 if the key isn't cached)
+        """
+        if self._shards:
+            return self._get_shard(key).get_value(key)
+        with self.lock:
+            cache_node = self.cache.get(key)
+            if cache_node is None:
+                self.misses += 1
+                return -1
+            self.hits += 1
+            self.move_forward(cache_node, cache_node.freq_node)
+            return cache_node.value
+
+    def set_value(self, key, value):
+        """
+        sets the value associated with the given key in the cache, evicting the least frequently used key (the least
+        recently used one among ties) when it's full
+        RETURNS: None
+        """
+        if self._shards:
+            return self._get_shard(key).set_value(key, value)
+        with self.lock:
+            if self.capacity <= 0:
+                return -1
+
+            cache_node = self.cache.get(key)
+            if cache_node is None:
+                if len(self.cache) >= self.capacity:
+                    self.dump_cache()
+                self.create_cache_node(key, value)
+            else:
+                cache_node.value = value
+                self.move_forward(cache_node, cache_node.freq_node)
+
+    def invalidate(self, predicate):
+        """
+        removes every cached key for which predicate(key, value) is true, e.g. when the data behind them changes
+        RETURNS: integer (number of keys removed)
+        """
+        if self._shards:
+            return sum(shard.invalidate(predicate) for shard in self._shards)
+        with self.lock:
+            removed = 0
+            for key, cache_node in list(self.cache.items()):
+                if predicate(key, cache_node.value):
+                    self._remove_cache_node(cache_node)
+                    removed += 1
+            return removed
+
+    def _remove_cache_node(self, cache_node):
+        """
+        helper method removes a CacheNode from the cache and its FreqNode, dropping the FreqNode if it's left empty
+        RETURNS: None
+        """
+        del self.cache[cache_node.key]
+        freq_node = cache_node.freq_node
+        cache_node.remove_cache_node()
+        if freq_node.is_empty():
+            if self.freq_link_head is freq_node:
+                self.freq_link_head = freq_node.nxt
+            freq_node.remove_freq_node()
+
+    def _get_freq_node(self, freq):
+        """
+        helper method finds the FreqNode for a frequency, inserting it into the linked list if there's none
+        RETURNS: FreqNode
+        """
+        pre, freq_node = None, self.freq_link_head
+        while freq_node and freq_node.freq < freq:
+            pre, freq_node = freq_node, freq_node.nxt
+        if freq_node and freq_node.freq == freq:
+            return freq_node
+
+        new_freq_node = FreqNode(freq)
+        if pre:
+            pre.insert_after_current_freq_node(new_freq_node)
+        else:
+            if self.freq_link_head:
+                self.freq_link_head.insert_before_current_freq_node(new_freq_node)
+            self.freq_link_head = new_freq_node
+        return new_freq_node
+
+    def get_entries(self, limit=None):
+        """
+        returns up to limit (key, value, frequency) entries, most frequently used first, e.g. to warm another cache
+        RETURNS: list
+        """
+        if self._shards:
+            entries = [entry for shard in self._shards for entry in shard.get_entries(limit)]
+        else:
+            with self.lock:
+                entries = [(key, cache_node.value, cache_node.freq_node.freq) for key, cache_node in self.cache.items()]
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        return entries[:limit]
+
+    def set_entries(self, entries):
+        """
+        caches (key, value, frequency) entries with their frequencies, keeping the most frequent ones that fit
+        RETURNS: None
+        """
+        if self._shards:
+            shard_entries = [[] for _ in self._shards]
+            for entry in entries:
+                shard_entries[hash(entry[0]) % self.shards].append(entry)
+            for shard, _entries in zip(self._shards, shard_entries):
+                shard.set_entries(_entries)
+            return
+        with self.lock:
+            entries = sorted(entries, key=lambda entry: entry[2], reverse=True)[:max(0, self.capacity)]
+            for key, value, freq in reversed(entries):
+                cache_node = self.cache.get(key)
+                if cache_node is not None:
+                    self._remove_cache_node(cache_node)
+                elif len(self.cache) >= self.capacity:
+                    self.dump_cache()
+                cache_node = self.cache[key] = CacheNode(key, value)
+                self._get_freq_node(max(1, freq)).append_cache_to_tail(cache_node)
+
+    def stats(self):
+        """
+        returns hit, miss and eviction counters, summed over every shard, to help size the cache
+        RETURNS: dictionary
+        """
+        caches = self._shards or [self]
+        return {
+            'hits': sum(cache.hits for cache in caches),
+            'misses': sum(cache.misses for cache in caches),
+            'evictions': sum(cache.evictions for cache in caches),
+            'size': len(self),
+            'capacity': self.capacity,
+        }
+
+    def move_forward(self, cache_node, freq_node):
+        """
+        moves a candidate node to the next FreqNode in the linked list
+        RETURNS: None
+        """
+        target_freq_node = freq_node.nxt
+        if not target_freq_node or target_freq_node.freq != freq_node.freq + 1:
+            target_freq_node = FreqNode(freq_node.freq + 1)
+            freq_node.insert_after_current_freq_node(target_freq_node)
+
+        cache_node.remove_cache_node()
+        target_freq_node.append_cache_to_tail(cache_node)
+
+        if freq_node.is_empty():
+            if self.freq_link_head is freq_node:
+                self.freq_link_head = target_freq_node
+            freq_node.remove_freq_node()
+
+    def dump_cache(self):
+        """
+        removes the least frequently used CacheNode from the cache
+        RETURNS: None
+        """
+        head_freq_node = self.freq_link_head
+        cache_node = head_freq_node.pop_head_cache()
+        del self.cache[cache_node.key]
+        self.evictions += 1
+
+        if head_freq_node.is_empty():
+            self.freq_link_head = head_freq_node.nxt
+            head_freq_node.remove_freq_node()
+
+    def create_cache_node(self, key, value):
+        """
+        creates a new CacheNode and add it to the cache
+        RETURNS: None
+        """
+        cache_node = CacheNode(key, value)
+        self.cache[key] = cache_node
+
+        if not self.freq_link_head or self.freq_link_head.freq != 1:
+            new_freq_node = FreqNode(1)
+            if self.freq_link_head:
+                self.freq_link_head.insert_before_current_freq_node(new_freq_node)
+            self.freq_link_head = new_freq_node
+
+        self.freq_link_head.append_cache_to_tail(cache_node)
@@ -0,0 +1,204 @@
+try: 
+    import numpy as np 
+except ImportError: # only levenshtein_distances needs numpy 
+    np = None 
+
+
+def levenshtein_distance(token1, token2): 
+    """ 
+    calculates minimum number of single-character edits to convert one string 
+    into another 
+    RETURNS: int 
+    """ 
+
+    len_token1 = len(token1) 
+    len_token2 = len(token2) 
+
+# only need the previous row values are necessary for computation 
+
+    if len_token1 > len_token2: 
+        token1, token2 = token2, token1 
+        len_token1, len_token2 = len_token2, len_token1
+
+    distances = list(range(len_token1 + 1)) 
+
+    for j in range(1, len_token2 + 1): 
+        prev_diagonal = distances[0] # current value of distance_vector[0] 
+        distances[0] = j # update to the current position in token2 
+
+        for i in range(1, len_token1 + 1):	 
+            current_diagonal = distances[i] 
+            if token1[i - 1] == token2[j - 1]: # if the current characters from tokens 1 and 2 are the same  
+                distances[i] = prev_diagonal 
+            else: 
+                distances[i] = 1 + min(distances[i - 1], distances[i], prev_diagonal) # update based on which one is the minimum value 
+            prev_diagonal = current_diagonal 
+
+    return distances[len_token1] # represents final Levenshtein distance
+
+
+def bit_parallel_levenshtein_distance(token1, token2): 
+    """ 
+    calculates the same distance as levenshtein_distance with Myers' bit-vector algorithm (in Hyyro's formulation). 
+    Each column of the distance table is held as bit vectors of +1/-1 differences over the shorter token, so a column 
+    takes a handful of integer operations. Fastest when the shorter token fits in a machine word (64 characters) 
+    RETURNS: int 
+    """ 
+    if len(token1) > len(token2): 
+        token1, token2 = token2, token1 
+    len_token1 = len(token1) 
+    if not len_token1: 
+        return len(token2) 
+
+    match_masks = {} # character -> bits set at its positions in token1 
+    for i, char in enumerate(token1): 
+        match_masks[char] = match_masks.get(char, 0) | 1 << i 
+
+    mask = (1 << len_token1) - 1 
+    last_bit = 1 << (len_token1 - 1) 
+    positive_vertical, negative_vertical = mask, 0 
+    distance = len_token1 
+
+    for char in token2: 
+        match_mask = match_masks.get(char, 0) 
+        x_vertical = match_mask | negative_vertical 
+        x_horizontal = (((match_mask & positive_vertical) + positive_vertical) ^ positive_vertical) | match_mask 
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical) 
+        negative_horizontal = positive_vertical & x_horizontal 
+
+        if positive_horizontal & last_bit: # the bottom cell of the column went up or down 
+            distance += 1 
+        elif negative_horizontal & last_bit: 
+            distance -= 1 
+
+        positive_horizontal = (positive_horizontal << 1) | 1 # the top row of the table counts up 
+        negative_horizontal <<= 1 
+        positive_vertical = (negative_horizontal | ~(x_vertical | positive_horizontal)) & mask 
+        negative_vertical = positive_horizontal & x_vertical & mask 
+
+    return distance 
+
+
+def banded_levenshtein_distance(token1, token2, max_distance): 
+    """ 
+    calculates levenshtein_distance when it is at most max_distance. Only cells within max_distance of the 
+    diagonal are computed, and it stops as soon as a whole row exceeds max_distance, since a row's minimum never 
+    decreases further down the table 
+    RETURNS: int (max_distance + 1 if the distance is greater than max_distance) 
+    """ 
+    if len(token1) > len(token2): 
+        token1, token2 = token2, token1 
+    len_token1 = len(token1) 
+    len_token2 = len(token2) 
+    too_far = max_distance + 1 
+    if len_token2 - len_token1 > max_distance: 
+        return too_far 
+
+    distances = [i if i <= max_distance else too_far for i in range(len_token1 + 1)] 
+    next_distances = distances[:] 
+
+    for j in range(1, len_token2 + 1): 
+        char = token2[j - 1] 
+        low = max(1, j - max_distance) 
+        high = min(len_token1, j + max_distance) 
+        next_distances[0] = j if j <= max_distance else too_far 
+        row_min = next_distances[0] if low == 1 else too_far 
+        if low > 1: 
+            next_distances[low - 1] = too_far # left edge of the band 
+
+        for i in range(low, high + 1): 
+            distance = min(distances[i - 1] + (token1[i - 1] != char), distances[i] + 1, next_distances[i - 1] + 1, too_far) 
+            next_distances[i] = distance 
+            if distance < row_min: 
+                row_min = distance 
+
+        if high < len_token1: 
+            next_distances[high + 1] = too_far # right edge of the band 
+        if row_min > max_distance: 
+            return too_far 
+        distances, next_distances = next_distances, distances 
+
+    return distances[len_token1] 
+
+
+def encode_strings(strings): 
+    """ 
+    encodes strings as a NumPy matrix of code points, one zero-padded row per string, and an array of their lengths, 
+    for levenshtein_distances 
+    RETURNS: tuple (matrix, lengths) 
+    """ 
+    if np is None: 
+        raise ImportError("encode_strings needs numpy") 
+    strings = list(strings) 
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings)) 
+    codes = np.zeros((len(strings), int(lengths.max(initial=0))), dtype=np.uint32) 
+    for i, string in enumerate(strings): 
+        codes[i, :len(string)] = np.frombuffer(string.encode('utf-32-le'), dtype='<u4') 
+    return codes, lengths 
+
+
+def levenshtein_distances(token, encoded_strings): 
+    """ 
+    calculates the levenshtein_distance from a token to each string encoded by encode_strings, all at once. For a 
+    token of up to 64 characters, the bit-vector algorithm of bit_parallel_levenshtein_distance is run with one 
+    64-bit word per string, stepping through the strings' characters together 
+    RETURNS: NumPy array 
+    """ 
+    if np is None: 
+        raise ImportError("levenshtein_distances needs numpy") 
+    codes, lengths = encoded_strings 
+    len_token = len(token) 
+    if not len_token: 
+        return lengths.copy() 
+    if len_token > 64: 
+        return _levenshtein_distances_by_rows(token, codes, lengths) 
+
+    one = np.uint64(1) 
+    match_masks = np.zeros(codes.shape, dtype=np.uint64) 
+    char_bits = {} 
+    for i, char in enumerate(token): 
+        char_bits[char] = char_bits.get(char, 0) | 1 << i 
+    for char, bits in char_bits.items(): 
+        match_masks[codes == ord(char)] |= np.uint64(bits) 
+
+    mask = np.uint64((1 << len_token) - 1) 
+    last_bit = np.uint64(1 << (len_token - 1)) 
+    positive_vertical = np.full(len(lengths), mask, dtype=np.uint64) 
+    negative_vertical = np.zeros(len(lengths), dtype=np.uint64) 
+    distances = np.full(len(lengths), len_token, dtype=np.int64) 
+
+    for j in range(codes.shape[1]): 
+        match_mask = match_masks[:, j] 
+        is_in_string = j < lengths # past its end, a string's distance stops changing 
+        x_vertical = match_mask | negative_vertical 
+        x_horizontal = (((match_mask & positive_vertical) + positive_vertical) ^ positive_vertical) | match_mask 
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical) 
+        negative_horizontal = positive_vertical & x_horizontal 
+
+        distances += ((positive_horizontal & last_bit) != 0) & is_in_string 
+        distances -= ((negative_horizontal & last_bit) != 0) & is_in_string 
+
+        positive_horizontal = (positive_horizontal << one) | one 
+        negative_horizontal = negative_horizontal << one 
+        positive_vertical = (negative_horizontal | ~(x_vertical | positive_horizontal)) & mask 
+        negative_vertical = positive_horizontal & x_vertical & mask 
+
+    return distances 
+
+
+def _levenshtein_distances_by_rows(token, codes, lengths): 
+    """ 
+    helper function for levenshtein_distances with tokens too long for a 64-bit word, filling the distance table a 
+    row per character of the token for every string at once 
+    RETURNS: NumPy array 
+    """ 
+    n_strings, max_length = codes.shape 
+    distances = np.tile(np.arange(max_length + 1, dtype=np.int64), (n_strings, 1)) 
+    for i, char in enumerate(token, 1): 
+        next_distances = np.empty_like(distances) 
+        next_distances[:, 0] = i 
+        best = np.minimum(distances[:, :-1] + (codes != ord(char)), distances[:, 1:] + 1) # substitution or deletion 
+        for j in range(1, max_length + 1): 
+            next_distances[:, j] = np.minimum(best[:, j - 1], next_distances[:, j - 1] + 1) 
+        distances = next_distances 
+    return distances[np.arange(n_strings), lengths] 
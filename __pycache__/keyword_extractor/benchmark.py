@@ -0,0 +1,124 @@
+import argparse
+import gc
+import json
+import os
+import random
+import time
+
+
+_WORD_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+_MODULES = ('helper/levenshtein_distance.py', 'keyword_extractor/lexical_units.py', 'keyword_extractor/load_text.py',
+'keyword_extractor/yake.py')
+
+
+def load_modules(paths=_MODULES):
+    """
+    runs the modules YAKE is built from, given relative to the package's source directory, and adds their names to
+    this module's, as they use each other's names, and nltk's stopwords, without importing them
+    RETURNS: None
+    """
+    from nltk.corpus import stopwords
+    source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    namespace = {'__name__': 'netro', 'stopwords': stopwords}
+    for path in paths:
+        path = os.path.join(source_directory, path)
+        with open(path, encoding='utf-8') as f:
+            exec(compile(f.read(), path, 'exec'), namespace)
+    globals().update((name, value) for name, value in namespace.items() if not name.startswith('__'))
+
+
+def make_document(n_sentences, sentence_length=12, vocabulary_size=5000, seed=0):
+    """
+    generates a reproducible document of n_sentences sentences of about sentence_length words, drawn from a
+    vocabulary of vocabulary_size words with a few capitalised, for benchmarking keyword extraction
+    RETURNS: string
+    """
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choices(_WORD_LETTERS, k=rng.randint(2, 9))) for _ in range(vocabulary_size)]
+    sentences = []
+    for _ in range(n_sentences):
+        words = rng.choices(vocabulary, k=rng.randint(sentence_length // 2, sentence_length * 3 // 2))
+        words[0] = words[0].capitalize()
+        sentences.append(' '.join(words))
+    return '. '.join(sentences) + '.'
+
+
+def benchmark_offset_stages(text, n=3):
+    """
+    times the stages of YAKE that place words by their offset in the document: loading it, which computes the
+    sentence offsets, selecting n-gram candidates and building the vocabulary. Garbage collection is paused while
+    they run, so that full collections over the growing candidates don't hide how the stages themselves scale
+    RETURNS: dictionary (stage -> seconds)
+    """
+    yake = YAKE()
+    result = {}
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _time_offset_stages(yake, text, n, result)
+    finally:
+        if was_enabled:
+            gc.enable()
+    result['sentences'] = len(yake.sentences)
+    return result
+
+
+def _time_offset_stages(yake, text, n, result):
+    """
+    helper function runs and times each offset stage in turn
+    RETURNS: None
+    """
+    start = time.perf_counter()
+    yake.load_document(text)
+    result['load_document_s'] = time.perf_counter() - start
+    start = time.perf_counter()
+    yake.ngram_selection(n=n)
+    result['ngram_selection_s'] = time.perf_counter() - start
+    start = time.perf_counter()
+    yake._vocabulary_building()
+    result['vocabulary_building_s'] = time.perf_counter() - start
+
+
+def run_keyword_benchmarks(sizes=(1000, 10000, 100000), n=3, seed=0):
+    """
+    benchmarks the offset stages over documents of each number of sentences. Each stage's microseconds per
+    sentence should stay about the same as documents grow, as the offsets are computed once per document
+    RETURNS: list of dictionaries
+    """
+    results = []
+    for n_sentences in sizes:
+        result = benchmark_offset_stages(make_document(n_sentences, seed=seed), n=n)
+        for stage in ('load_document', 'ngram_selection', 'vocabulary_building'):
+            result[f'{stage}_us_per_sentence'] = result[f'{stage}_s'] / n_sentences * 1e6
+        results.append(result)
+    return results
+
+
+def format_keyword_results(results):
+    """
+    formats keyword benchmark results as a table with a row per document size
+    RETURNS: string
+    """
+    columns = [('sentences', 'sentences'), ('load s', 'load_document_s'), ('ngrams s', 'ngram_selection_s'),
+    ('vocab s', 'vocabulary_building_s'), ('load us/s', 'load_document_us_per_sentence'),
+    ('ngrams us/s', 'ngram_selection_us_per_sentence'), ('vocab us/s', 'vocabulary_building_us_per_sentence')]
+    lines = [' '.join(f'{name:>11}' for name, _ in columns)]
+    for result in results:
+        lines.append(' '.join(f'{result[key]:>11.4g}' for _, key in columns))
+    return '\n'.join(lines) + '\n(us/s is microseconds per sentence)'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmarks YAKE over synthetic documents')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='sentences per document')
+    parser.add_argument('--n', type=int, default=3, help='longest n-gram selected')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also writes the results to this file')
+    args = parser.parse_args()
+    load_modules()
+    benchmark_results = run_keyword_benchmarks(args.sizes, args.n, args.seed)
+    print(format_keyword_results(benchmark_results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(benchmark_results, f, indent=2)
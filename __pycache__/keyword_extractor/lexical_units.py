@@ -0,0 +1,38 @@
+
+
+class Sentence: 
+    def __init__(self, words): 
+        """ 
+        initialises Sentence attributes 
+        RETURNS: None 
+        """ 
+        self.words = words # list of tokens in the sentence
+        self.stems = []
+        self.length = len(words) # number of tokens in the sentence 
+        self.offset = 0 # number of tokens in the sentences before this one, set by LoadText.load_document 
+
+
+class Candidate: 
+    def __init__(self): 
+        """ 
+        initialises Candidate attributes 
+        RETURNS: None 
+        """ 
+        self.surface_forms = [] # candidate's surface forms 
+        self.offsets = [] # offsets of the surface form 
+        self.sentence_ids = [] # sentence id of each surface form 
+        self.count = 0 # number of occurrences, which can be more than the surface forms kept when streaming 
+
+
+class Term: 
+    def __init__(self): 
+        """ 
+        initialises the statistics StreamingYAKE keeps for a word of the vocabulary in place of its occurrences 
+        RETURNS: None 
+        """ 
+        self.count = 0 # term frequency 
+        self.acronym_count = 0 # occurrences written in upper case 
+        self.upper_count = 0 # occurrences starting with a capital, other than at the start of a sentence 
+        self.sentence_count = 0 # number of distinct sentences it occurs in 
+        self.last_sentence_id = -1 
+        self.sentence_ids = [] # sample of the ids of the sentences it occurs in
@@ -0,0 +1,150 @@
+import os
+from collections import defaultdict
+from string import punctuation
+
+
+class LoadText(object): 
+    _stoplist = None # loaded the first time a LoadText is made, then shared by every one in the process 
+
+    def __init__(self): 
+        """ 
+        initialises LoadText attributes 
+        RETURNS: None 
+        """ 
+        self.sentences = [] # list of Sentence objects 
+        self.sentence_count = 0 # number of sentences, kept even when they aren't 
+        self.candidates = defaultdict(Candidate) # dict of Candidate objects 
+        self.weights = {} 
+        self.stoplist = self._get_stoplist() 
+
+    @staticmethod 
+    def _get_stoplist(): 
+        """ 
+        helper method loads the English stoplist once per process, as load_document re-initialises for every document 
+        RETURNS: frozenset 
+        """ 
+        if LoadText._stoplist is None: 
+            LoadText._stoplist = frozenset(stopwords.words('english')) 
+        return LoadText._stoplist 
+
+    def _read(self, text): 
+        """ 
+        pre-processes text 
+        RETURNS: list 
+        """ 
+        sentences = [] 
+        for sentence_text in text.split('.'): # split text into sentences 
+            words = re.findall(r'\b\w+\b', sentence_text) # extract words from each 
+            if words: 
+                sentences.append(Sentence(words)) 
+        return sentences 
+
+    @staticmethod 
+    def _read_stream(source, chunk_size=1 << 20): 
+        """ 
+        pre-processes text read chunk_size characters at a time from a path, a text file or an iterable of strings, 
+        splitting it into the sentences _read would. The part of a sentence at the end of a chunk is carried over to 
+        the next, so only one chunk and one sentence are held at a time 
+        RETURNS: generator of Sentence objects 
+        """ 
+        if isinstance(source, (str, os.PathLike)): 
+            with open(source, encoding='utf-8') as f: 
+                yield from LoadText._read_stream(f, chunk_size) 
+            return 
+        chunks = iter(lambda: source.read(chunk_size), '') if hasattr(source, 'read') else source 
+        carried_text = '' 
+        for chunk in chunks: 
+            sentence_texts = (carried_text + chunk).split('.') 
+            carried_text = sentence_texts.pop() 
+            for sentence_text in sentence_texts: 
+                words = re.findall(r'\b\w+\b', sentence_text) 
+                if words: 
+                    yield Sentence(words) 
+        words = re.findall(r'\b\w+\b', carried_text) 
+        if words: 
+            yield Sentence(words) 
+
+    def load_document(self, input): 
+        """ 
+        uses pre-processed text to populate stems 
+        RETURNS: None 
+        """ 
+        self.__init__() 
+        sents = self._read(text=input) 
+        self.sentences = sents # populate the sentences 
+        self.sentence_count = len(sents) 
+        offset = 0 
+        for i, sentence in enumerate(self.sentences): # populate stems and offsets 
+            self.sentences[i].stems = [w.lower() for w in sentence.words] 
+            sentence.offset = offset 
+            offset += sentence.length 
+
+    def add_candidate(self, words, stems, offset, sentence_id): 
+        """ 
+        adds a keyphrase candidate to candidates container 
+        RETURNS: None 
+        """ 
+        lexical_form = ' '.join(stems) 
+        self.candidates[lexical_form].count += 1 
+        self.candidates[lexical_form].surface_forms.append(words) 
+        self.candidates[lexical_form].lexical_form = stems 
+        self.candidates[lexical_form].offsets.append(offset) 
+        self.candidates[lexical_form].sentence_ids.append(sentence_id) 
+
+    def ngram_selection(self, n=2): 
+        """  
+        selects all ngrams of a given length and populates candiates contianers 
+        RETURNS: None 
+        """
+        self.candidates.clear() # resets candidates 
+        for i, sentence in enumerate(self.sentences): 
+            skip = min(n, sentence.length) # limits max n for short sentence 
+            shift = sentence.offset # offset shift for the sentence 
+            for j in range(sentence.length): 
+                for k in range(j + 1, min(j + 1 + skip, sentence.length + 1)): 
+                    self.add_candidate(words=sentence.words[j:k], stems=sentence.stems[j:k], offset=shift + j, sentence_id=i) 
+
+    @staticmethod 
+    def _is_alphanum(word, valid_punctuation='-'): 
+        """ 
+        checks if a word is alpha-numeric (excluding '-') 
+        RETURNS: bool 
+        """ 
+        for punct in valid_punctuation.split(): 
+            word = word.replace(punct, '') 
+        return word.isalnum() 
+
+    def candidate_filtering(self, minimum_length=2, minimum_word_size=2, valid_punctuation='-', maximum_word_number=5, only_alphanum=True): 
+        """filters the candidates containing strings from the stoplist. Only 
+        keeps those containing alpha-numeric characters and whose length exceeds a given number  
+        RETURNS: None 
+        """ 
+        for k in list(self.candidates): # iterates through candidates 
+            v = self.candidates[k] 
+            words = [u.lower() for u in v.surface_forms[0]] # gets words via their-first occurring candidate forms 
+            if not self._is_valid_candidate(words, v.lexical_form, minimum_length, minimum_word_size, valid_punctuation, \
+            maximum_word_number, only_alphanum): 
+                del self.candidates[k] 
+
+    def _is_valid_candidate(self, words, lexical_form, minimum_length=2, minimum_word_size=2, valid_punctuation='-', \
+    maximum_word_number=5, only_alphanum=True): 
+        """ 
+        checks a candidate's lower case words and lexical form against the filters of candidate_filtering. Every 
+        surface form of a candidate has the same lower case words, so any of them can be checked 
+        RETURNS: bool 
+        """ 
+        if set(words).intersection(self.stoplist): # discards if containing tokens that are in the stoplist 
+            return False 
+        elif any(set(u).issubset(set(punctuation)) for u in words): # discards if containing tokens that are only punctuation 
+            return False 
+        elif len(''.join(words)) < minimum_length: # dicards if containing tokens below the minimum number of characters 
+            return False 
+        elif min([len(u) for u in words]) < minimum_word_size: # discards if containing small (1-character) tokens 
+            return False 
+        elif len(lexical_form) > maximum_word_number: 
+            return False 
+
+        if only_alphanum: 
+            if not all([self._is_alphanum(w, valid_punctuation) for w in words]): 
+                return False 
+        return True 
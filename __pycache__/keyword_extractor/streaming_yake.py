@@ -0,0 +1,122 @@
+import random
+from collections import defaultdict
+from itertools import chain
+from statistics import median
+
+try:
+    import numpy as np
+except ImportError: # features are computed with lists instead, more slowly
+    np = None
+
+
+class StreamingYAKE(YAKE):
+    def __init__(self, max_samples=10, max_sentence_samples=1000, chunk_size=1 << 20, seed=0):
+        """
+        initialises a YAKE for documents too large to hold in memory, which load_stream reads chunk_size characters
+        at a time. Each sentence is added to the vocabulary, contexts and candidates as it's read and then dropped:
+        words keep their counts (see Term) rather than their occurrences, contexts are only counted and candidates
+        keep their count with only their first max_samples surface forms, offsets and sentence ids.
+        A word's position is the median of a uniform sample (seeded by seed) of up to max_sentence_samples of the
+        sentences it occurs in, so it's exact for words in no more sentences than that
+        RETURNS: None
+        """
+        super(StreamingYAKE, self).__init__()
+        self.max_samples = max_samples
+        self.max_sentence_samples = max_sentence_samples
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def load_stream(self, source, n=3, window=2):
+        """
+        reads a document from a path, a text file or an iterable of strings, and selects its candidate phrases of up
+        to n words, as load_document and candidate_selection do, while counting its words and their contexts within
+        window words
+        RETURNS: None
+        """
+        YAKE.__init__(self) # clears the previous document, keeping the settings
+        self.words = defaultdict(Term)
+        rng = random.Random(self.seed)
+        offset = 0
+        for i, sentence in enumerate(self._read_stream(source, self.chunk_size)):
+            sentence.stems = [w.lower() for w in sentence.words]
+            sentence.offset = offset
+            offset += sentence.length
+            self._add_sentence_terms(i, sentence, rng)
+            self._add_sentence_contexts(sentence.stems, window)
+            self._add_sentence_candidates(i, sentence, n)
+            self.sentence_count += 1
+
+    def extract_keywords_from_stream(self, source, n=3, top_k=10, window=2):
+        """
+        runs the whole of YAKE over a document read as a stream (see load_stream)
+        RETURNS: list of (keyword, weight) tuples
+        """
+        self.load_stream(source, n=n, window=window)
+        self.candidate_weighting(window=window)
+        return self.get_n_best(n=top_k)
+
+    def _add_sentence_terms(self, sentence_id, sentence, rng):
+        """
+        helper method counts a sentence's words into the vocabulary, as _vocabulary_building and _get_term_stats
+        would from their occurrences
+        RETURNS: None
+        """
+        for j, (word, index) in enumerate(zip(sentence.words, sentence.stems)):
+            term = self.words[index]
+            term.count += 1
+            if word.isupper() and len(index) > 1:
+                term.acronym_count += 1
+            elif word[0].isupper() and j:
+                term.upper_count += 1
+            if term.last_sentence_id != sentence_id:
+                term.last_sentence_id = sentence_id
+                term.sentence_count += 1
+                if len(term.sentence_ids) < self.max_sentence_samples:
+                    term.sentence_ids.append(sentence_id)
+                else: # reservoir sampling keeps every sentence equally likely to be in the sample
+                    k = rng.randrange(term.sentence_count)
+                    if k < self.max_sentence_samples:
+                        term.sentence_ids[k] = sentence_id
+
+    def _add_sentence_candidates(self, sentence_id, sentence, n):
+        """
+        helper method adds a sentence's ngrams of up to n words that candidate_selection would keep, keeping only
+        the first max_samples occurrences of each
+        RETURNS: None
+        """
+        skip = min(n, sentence.length)
+        for j in range(sentence.length):
+            for k in range(j + 1, min(j + 1 + skip, sentence.length + 1)):
+                stems = sentence.stems[j:k]
+                lexical_form = ' '.join(stems)
+                if lexical_form not in self.candidates:
+                    if stems[0] in self.stoplist or stems[-1] in self.stoplist or \
+                    not self._is_valid_candidate(stems, stems):
+                        continue
+                    self.candidates[lexical_form].lexical_form = stems
+                candidate = self.candidates[lexical_form]
+                candidate.count += 1
+                if len(candidate.surface_forms) < self.max_samples:
+                    candidate.surface_forms.append(sentence.words[j:k])
+                    candidate.offsets.append(sentence.offset + j)
+                    candidate.sentence_ids.append(sentence_id)
+
+    def _get_term_arrays(self):
+        """
+        helper method gets the term statistics of the words of the vocabulary from their counts, with each word's
+        median sentence id taken from its sample of sentences. They're lists without NumPy
+        RETURNS: tuple of NumPy arrays (TF, TF_A, TF_U, median sentence id, number of sentences)
+        """
+        terms = list(self.words.values())
+        if np is None:
+            get_counts = lambda attribute: [getattr(term, attribute) for term in terms]
+            return get_counts('count'), get_counts('acronym_count'), get_counts('upper_count'), \
+            [median(term.sentence_ids) for term in terms], get_counts('sentence_count')
+        get_counts = lambda attribute: np.fromiter((getattr(term, attribute) for term in terms), np.int64, len(terms))
+        n_samples = np.fromiter((len(term.sentence_ids) for term in terms), np.int64, len(terms))
+        sampled_sentence_ids = np.fromiter(chain.from_iterable(term.sentence_ids for term in terms), np.int64, n_samples.sum())
+        sampled_word_ids = np.repeat(np.arange(len(terms)), n_samples)
+        order = np.lexsort((sampled_sentence_ids, sampled_word_ids)) # a reservoir sample is out of order once full
+        medians, _ = self._get_median_sentence_ids(sampled_word_ids[order], sampled_sentence_ids[order], len(terms))
+        return get_counts('count'), get_counts('acronym_count'), get_counts('upper_count'), medians, \
+        get_counts('sentence_count')
@@ -0,0 +1,490 @@
+import logging 
+import math 
+import os 
+import re 
+from array import array 
+from collections import Counter, defaultdict 
+from collections.abc import Mapping 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait 
+from statistics import StatisticsError, mean, median, stdev 
+
+try: 
+    import numpy as np 
+except ImportError: # features are computed with lists instead, more slowly 
+    np = None 
+
+
+_keyword_worker = None # the YAKE of a worker process of extract_many 
+_ACRONYM = 1 # casing of a token written in upper case 
+_CAPITALISED = 2 # casing of a token starting with a capital, other than at the start of a sentence 
+_NO_CONTEXT_SIZES = (0, 0, 0, 0) 
+
+
+class _WordFeatures(Mapping): 
+    def __init__(self, word_ids, is_stop, feature_arrays, has_left_context): 
+        """ 
+        initialises a read-only view of YAKE's feature arrays as a dictionary of each word's features 
+        RETURNS: None 
+        """ 
+        self._word_ids = word_ids 
+        self._is_stop = is_stop 
+        self._feature_arrays = feature_arrays 
+        self._has_left_context = has_left_context 
+
+    def __getitem__(self, word): 
+        i = self._word_ids[word] 
+        features = {'isstop': bool(self._is_stop[i])} 
+        for name, values in self._feature_arrays.items(): 
+            if name != 'PL' or self._has_left_context[i]: 
+                features[name] = values[i] if isinstance(values, list) else values[i].item() 
+        return features 
+
+    def __iter__(self): 
+        return iter(self._word_ids) 
+
+    def __len__(self): 
+        return len(self._word_ids) 
+
+
+class YAKE(LoadText): 
+    def __init__(self): 
+        """ 
+        redefines and initialises YAKE 
+        RETURNS: None 
+        """ 
+        super(YAKE, self).__init__() 
+        self.words = {} # vocabulary container, of each word's id 
+        self._token_word_ids = array('q') # id of each token's word 
+        self._token_sentence_ids = array('q') # id of each token's sentence 
+        self._token_casings = bytearray() # casing of each token (_ACRONYM, _CAPITALISED or 0) 
+        self.contexts = defaultdict(lambda: (Counter(), Counter())) # counts of the words in each word's left and right contexts 
+        # numbers of words and of distinct words in each word's left and right contexts 
+        self.context_sizes = defaultdict(lambda: [0, 0, 0, 0]) # [left total, left distinct, right total, right distinct] 
+        self.features = {} # view of each word's features, set by _feature_extraction 
+
+    def candidate_selection(self, n=2): 
+        """ 
+        selects ngrams of a given length as candidate phrases 
+        RETURNS: None 
+        """ 
+        self.ngram_selection(n=n) 
+        self.candidate_filtering() 
+
+        for k in list(self.candidates): # further filters candidates starting/beginning with stopwords 
+            v = self.candidates[k] 
+            if v.surface_forms[0][0].lower() in self.stoplist or v.surface_forms[0][-1].lower() in self.stoplist: 
+                del self.candidates[k] 
+
+    def _vocabulary_building(self): 
+        """ 
+        builds the vocabulary used to weight candidates, giving each word an id and encoding each token as its word's 
+        id, its sentence's id and its casing. Only keeps words containing at least one alpha-numeric character 
+        RETURNS: None 
+        """ 
+        for i, sentence in enumerate(self.sentences): 
+            for j, word in enumerate(sentence.words): 
+                index = word.lower() 
+                word_id = self.words.setdefault(index, len(self.words)) 
+                self._token_word_ids.append(word_id) 
+                self._token_sentence_ids.append(i) 
+                if word.isupper() and len(index) > 1: 
+                    self._token_casings.append(_ACRONYM) 
+                elif word[0].isupper() and j: # not at the start of the sentence 
+                    self._token_casings.append(_CAPITALISED) 
+                else: 
+                    self._token_casings.append(0) 
+
+    def _contexts_building(self, window=2): 
+        """ 
+        builds the contexts used to calculate relatedness. Words occurring within an n word window are considered as context words. 
+        Only words co-occurring in a block (sequence of words that appear in the vocabulary) are considered. 
+        RETURNS: None 
+        """ 
+        for i, sentence in enumerate(self.sentences): 
+            self._add_sentence_contexts([w.lower() for w in sentence.words], window) 
+
+    def _add_sentence_contexts(self, words, window): 
+        """ 
+        helper method counts the context words of each of a sentence's lower case words, keeping the sizes of every 
+        word's contexts as it goes so that none has to be measured later 
+        RETURNS: None 
+        """ 
+        block = [] 
+        for j, word in enumerate(words): 
+            if word not in self.words: 
+                block = [] # word is skipped and block is emptied if word isn't in the vocabulary 
+                continue 
+
+            context = block[max(0, len(block) - window):len(block)] 
+            left_context, word_sizes = self.contexts[word][0], self.context_sizes[word] 
+            word_sizes[0] += len(context) 
+            for w in context: 
+                if w not in left_context: 
+                    word_sizes[1] += 1 
+                left_context[w] += 1 # adds left context 
+
+                right_context = self.contexts[w][1] 
+                context_word_sizes = self.context_sizes[w] 
+                context_word_sizes[2] += 1 
+                if word not in right_context: 
+                    context_word_sizes[3] += 1 
+                right_context[word] += 1 # adds right context 
+            block.append(word) 
+
+    def _get_term_arrays(self): 
+        """ 
+        helper method gets, in the order of word ids, what the features of the words of the vocabulary are computed 
+        from: their term frequencies, acronym and upper case term frequencies, median sentence ids and numbers of 
+        sentences, from the tokens _vocabulary_building encoded. They're lists without NumPy 
+        RETURNS: tuple of NumPy arrays (TF, TF_A, TF_U, median sentence id, number of sentences) 
+        """ 
+        n_words = len(self.words) 
+        if np is None: 
+            return self._get_term_lists(n_words) 
+        token_word_ids = np.frombuffer(self._token_word_ids, dtype=np.int64) 
+        token_sentence_ids = np.frombuffer(self._token_sentence_ids, dtype=np.int64) 
+        token_casings = np.frombuffer(self._token_casings, dtype=np.uint8) 
+        tf = np.bincount(token_word_ids, minlength=n_words) 
+        tf_a = np.bincount(token_word_ids[token_casings == _ACRONYM], minlength=n_words) 
+        tf_u = np.bincount(token_word_ids[token_casings == _CAPITALISED], minlength=n_words) 
+        order = np.argsort(token_word_ids, kind='stable') # tokens are in sentence order, so each word's stay sorted 
+        sorted_word_ids, sorted_sentence_ids = token_word_ids[order], token_sentence_ids[order] 
+        is_first = np.ones(len(order), dtype=bool) # first token of a word in a sentence 
+        is_first[1:] = (sorted_word_ids[1:] != sorted_word_ids[:-1]) | (sorted_sentence_ids[1:] != sorted_sentence_ids[:-1]) 
+        return (tf, tf_a, tf_u) + self._get_median_sentence_ids(sorted_word_ids[is_first], sorted_sentence_ids[is_first], \
+        n_words) 
+
+    def _get_term_lists(self, n_words): 
+        """ 
+        helper method gets what _get_term_arrays does with lists, one token at a time 
+        RETURNS: tuple of lists (TF, TF_A, TF_U, median sentence id, number of sentences) 
+        """ 
+        tf, tf_a, tf_u = [0] * n_words, [0] * n_words, [0] * n_words 
+        sentence_ids = [[] for _ in range(n_words)] # each word's sentences, in order 
+        for word_id, sentence_id, casing in zip(self._token_word_ids, self._token_sentence_ids, self._token_casings): 
+            tf[word_id] += 1 
+            if casing == _ACRONYM: 
+                tf_a[word_id] += 1 
+            elif casing == _CAPITALISED: 
+                tf_u[word_id] += 1 
+            word_sentence_ids = sentence_ids[word_id] 
+            if not word_sentence_ids or word_sentence_ids[-1] != sentence_id: 
+                word_sentence_ids.append(sentence_id) 
+        return tf, tf_a, tf_u, list(map(median, sentence_ids)), list(map(len, sentence_ids)) 
+
+    @staticmethod 
+    def _get_median_sentence_ids(word_ids, sentence_ids, n_words): 
+        """ 
+        helper method gets the median and number of the sentence ids of each word from (word id, sentence id) pairs 
+        sorted by word id and then sentence id, none of them repeated 
+        RETURNS: tuple of NumPy arrays (median sentence id, number of sentences) 
+        """ 
+        n_sentence_ids = np.bincount(word_ids, minlength=n_words) 
+        starts = np.cumsum(n_sentence_ids) - n_sentence_ids 
+        medians = (sentence_ids[starts + (n_sentence_ids - 1) // 2] + sentence_ids[starts + n_sentence_ids // 2]) / 2 
+        return medians, n_sentence_ids 
+
+    def _get_context_arrays(self, words): 
+        """ 
+        helper method gets the number of words and of distinct words in the left and right contexts of words 
+        RETURNS: NumPy array (rows of left totals, left distinct counts, right totals and right distinct counts), or 
+        list of those rows as lists without NumPy 
+        """ 
+        context_sizes = [self.context_sizes.get(word, _NO_CONTEXT_SIZES) for word in words] 
+        if np is None: 
+            return [[sizes[k] for sizes in context_sizes] for k in range(4)] 
+        return np.array(context_sizes, dtype=np.int64).reshape(-1, 4).T 
+
+    def _feature_extraction(self): 
+        """ 
+        computes the weight of individual words in terms of casing, position, frequency, 
+        relatedness to context, and occurrence in different sentences, as arrays indexed by word id over the whole 
+        vocabulary at once (lists without NumPy). features is a view of them per word 
+        RETURNS: None 
+        """ 
+        words = list(self.words) 
+        get_features = self._get_feature_lists if np is None else self._get_feature_arrays 
+        features, is_stop, has_left_context = get_features(words) 
+        self.word_ids = {word: i for i, word in enumerate(words)} 
+        self.is_stop = is_stop 
+        self.feature_arrays = features 
+        self.features = _WordFeatures(self.word_ids, is_stop, features, has_left_context) 
+
+    def _get_feature_arrays(self, words): 
+        """ 
+        helper method computes the features of words, indexed by word id, with NumPy 
+        RETURNS: tuple (dictionary of feature arrays, array of whether each word is a stopword, array of whether each 
+        word has a left context) 
+        """ 
+        tf, tf_a, tf_u, median_sentence_ids, n_sentence_ids = self._get_term_arrays() 
+        left_total, left_distinct, right_total, right_distinct = self._get_context_arrays(words) 
+        is_stop = np.array([word in self.stoplist for word in words], dtype=bool) 
+
+        term_frequency_nsw = tf[~is_stop] # term frequency of non-stopwords 
+        if term_frequency_nsw.size < 2: 
+            raise StatisticsError('stdev requires at least two data points') 
+        mean_term_frequency = term_frequency_nsw.mean() 
+        stdev_term_frequency = term_frequency_nsw.std(ddof=1) 
+        max_term_frequency = tf.max() 
+
+        features = {'TF': tf, 'TF_A': tf_a, 'TF_U': tf_u} 
+        # 1. Casing - importance to acronyms or words starting with a capital 
+        features['CASING'] = np.maximum(tf_a, tf_u) / (1.0 + np.log(tf)) 
+        # 2. Position - importance to words that occurring at the beginning of the document 
+        features['POSITION'] = np.log(np.log(3.0 + median_sentence_ids)) 
+        # 3. Frequency - importance to frequent words 
+        features['FREQUENCY'] = tf / (mean_term_frequency + stdev_term_frequency) 
+        # 4. Relatedness - importance to words that don't stopword characteristics 
+        features['WL'] = np.divide(left_distinct, left_total, out=np.zeros(len(words)), where=left_total > 0) 
+        features['PL'] = left_distinct / max_term_frequency # only set for words with a left context 
+        features['WR'] = np.divide(right_distinct, right_total, out=np.zeros(len(words)), where=right_total > 0) 
+        features['PR'] = right_distinct / max_term_frequency 
+        features['RELATEDNESS'] = 1 + (features['WR'] + features['WL']) * (tf / max_term_frequency) 
+        # 5. Different - importance to words that occur in multiple sentences 
+        features['DIFFERENT'] = n_sentence_ids / self.sentence_count 
+
+        # assembles featues for to weight words 
+        A, B, C, D, E = (features[name] for name in ('CASING', 'POSITION', 'FREQUENCY', 'RELATEDNESS', 'DIFFERENT')) 
+        features['weight'] = (D * B) / (A + (C / D) + (E / D)) 
+        return features, is_stop, left_total > 0 
+
+    def _get_feature_lists(self, words): 
+        """ 
+        helper method computes the same features as _get_feature_arrays with lists, one word at a time, for when 
+        NumPy isn't installed 
+        RETURNS: tuple (dictionary of feature lists, list of whether each word is a stopword, list of whether each 
+        word has a left context) 
+        """ 
+        tf, tf_a, tf_u, median_sentence_ids, n_sentence_ids = self._get_term_arrays() 
+        left_total, left_distinct, right_total, right_distinct = self._get_context_arrays(words) 
+        is_stop = [word in self.stoplist for word in words] 
+
+        term_frequency_nsw = [count for count, stop in zip(tf, is_stop) if not stop] # term frequency of non-stopwords 
+        stdev_term_frequency = stdev(term_frequency_nsw) # raises StatisticsError for fewer than two 
+        mean_term_frequency = mean(term_frequency_nsw) 
+        max_term_frequency = max(tf) 
+
+        features = {'TF': tf, 'TF_A': tf_a, 'TF_U': tf_u} 
+        features['CASING'] = [max(a, u) / (1.0 + math.log(count)) for a, u, count in zip(tf_a, tf_u, tf)] 
+        features['POSITION'] = [math.log(math.log(3.0 + sentence_id)) for sentence_id in median_sentence_ids] 
+        features['FREQUENCY'] = [count / (mean_term_frequency + stdev_term_frequency) for count in tf] 
+        features['WL'] = [distinct / total if total else 0.0 for distinct, total in zip(left_distinct, left_total)] 
+        features['PL'] = [distinct / max_term_frequency for distinct in left_distinct] 
+        features['WR'] = [distinct / total if total else 0.0 for distinct, total in zip(right_distinct, right_total)] 
+        features['PR'] = [distinct / max_term_frequency for distinct in right_distinct] 
+        features['RELATEDNESS'] = [1 + (wr + wl) * (count / max_term_frequency) for wr, wl, count in \
+        zip(features['WR'], features['WL'], tf)] 
+        features['DIFFERENT'] = [n / self.sentence_count for n in n_sentence_ids] 
+        features['weight'] = [(D * B) / (A + (C / D) + (E / D)) for A, B, C, D, E in \
+        zip(*(features[name] for name in ('CASING', 'POSITION', 'FREQUENCY', 'RELATEDNESS', 'DIFFERENT')))] 
+        return features, is_stop, [total > 0 for total in left_total] 
+
+    def candidate_weighting(self, window=2): 
+        """ 
+        calculates weighting as per YAKE paper 
+        RETURNS: None 
+        """ 
+        if not self.candidates: 
+            return 
+        self._vocabulary_building() 
+        self._contexts_building(window=window) 
+        self._feature_extraction() 
+
+        word_ids = self.word_ids 
+        is_stop, term_frequency, word_weight = (values if isinstance(values, list) else values.tolist() for values in \
+        (self.is_stop, self.feature_arrays['TF'], self.feature_arrays['weight'])) 
+        for k, v in self.candidates.items(): # every surface form of a candidate has the same lower case tokens, so one weight 
+            tokens = v.lexical_form 
+            prod_ = 1. 
+            sum_ = 0. 
+
+            for j, token in enumerate(tokens): 
+                word_id = word_ids[token] 
+                if is_stop[word_id]: 
+                    term_stop = token 
+                    prob_t1 = prob_t2 = 0 
+                    if j - 1 >= 0: 
+                        term_left = tokens[j-1] 
+                        prob_t1 = self.contexts[term_left][1][term_stop] / term_frequency[word_ids[term_left]] 
+
+                    if j + 1 < len(tokens): 
+                        term_right = tokens[j+1] 
+                        prob_t2 = self.contexts[term_stop][0][term_right] / term_frequency[word_ids[term_right]] 
+                    prob = prob_t1 * prob_t2 
+                    prod_ *= (1 + (1 - prob)) 
+                    sum_ -= (1 - prob) 
+
+                else: 
+                    prod_ *= word_weight[word_id] 
+                    sum_ += word_weight[word_id] 
+
+            """ set sum_ to -1+eps so 1+sum_ != 0 if the candidate is a one token stopword at the 
+            start or the end of the sentence 
+            """ 
+            if sum_ == -1: 
+                sum_ = -0.99999999999 
+            self.weights[k] = prod_ 
+            self.weights[k] /= v.count * (1 + sum_) 
+
+    def is_redundant(self, candidate, prev, threshold=0.8): 
+        """ 
+        tests if one candidate is redundant with respect to a list of already ones. 
+        A candidate is considered redundant if its Levenshtein distance with another candidate 
+        that is ranked higher in the list exceeds the pre-set threshold. Distances past the largest that could 
+        reach the threshold aren't computed in full.  
+        RETURNS: bool 
+        """ 
+        for prev_candidate in prev: 
+            max_len = max(len(candidate), len(prev_candidate)) 
+            dist = banded_levenshtein_distance(candidate, prev_candidate, int((1.0 - threshold) * max_len) + 1) 
+            dist /= max_len 
+            if (1.0 - dist) > threshold: 
+                return True 
+        return False 
+
+    def get_n_best(self, n=10, redundancy_removal=True, threshold=0.8):
+        """ 
+        yield the n-most relevant candidates
+        RETURNS: list
+        """
+        best = sorted(self.weights, key=self.weights.get, reverse=False)
+    
+        if redundancy_removal:
+            non_redundant_best = []
+            for candidate in best:
+                if self.is_redundant(candidate, non_redundant_best, threshold=threshold):
+                    continue
+                non_redundant_best.append(candidate)
+                if len(non_redundant_best) >= n:
+                    break
+    
+            best = non_redundant_best
+        n_best = [(u, self.weights[u]) for u in best[:min(n, len(best))]]
+        return n_best
+
+    def extract_keywords(self, text, n=3, top_k=10, window=2):
+        """
+        runs the whole of YAKE over one document: loads it, selects candidates of up to n words, weights them and
+        picks the top_k best
+        RETURNS: list of (keyword, weight) tuples
+        """
+        self.load_document(text)
+        self.candidate_selection(n=n)
+        self.candidate_weighting(window=window)
+        return self.get_n_best(n=top_k)
+
+
+def _init_keyword_worker():
+    """
+    helper function makes the one YAKE a worker process of extract_many uses for all its documents, loading the
+    stoplist as it does
+    RETURNS: None
+    """
+    global _keyword_worker
+    _keyword_worker = YAKE()
+
+
+def _extract_keywords_in_worker(text, n, top_k, window):
+    """
+    helper function extracts a document's keywords with the worker process's YAKE
+    RETURNS: list of (keyword, weight) tuples, or Exception
+    """
+    return _extract_keywords(_keyword_worker, text, n, top_k, window)
+
+
+def _extract_keywords(yake, text, n, top_k, window):
+    """
+    helper function extracts a document's keywords for extract_many, so that one document can't stop the rest: a
+    document too short to weigh its words (fewer than two that aren't stopwords) has none, and one that fails
+    otherwise gets the exception raised in place of its keywords
+    RETURNS: list of (keyword, weight) tuples, or Exception
+    """
+    try:
+        return yake.extract_keywords(text, n=n, top_k=top_k, window=window)
+    except StatisticsError:
+        return []
+    except Exception as error:
+        return error
+
+
+def _get_keywords(future):
+    """
+    helper function gets a document's keywords from its worker, or the exception raised if the worker couldn't
+    return them, e.g. as it died
+    RETURNS: list of (keyword, weight) tuples, or Exception
+    """
+    try:
+        return future.result()
+    except Exception as error:
+        return error
+
+
+def _log_error(doc_id, error):
+    """
+    helper function logs a document extract_many couldn't extract keywords from, with the exception raised
+    RETURNS: None
+    """
+    logging.getLogger(__name__).error("couldn't extract the keywords of document %r", doc_id, exc_info=error)
+
+
+def extract_many(documents, n=3, top_k=10, workers=None, ordered=False, window=2, max_pending=None, on_error=None):
+    """
+    extracts the top_k keywords of up to n words from each of a corpus's documents, given as (doc_id, text) pairs or
+    a mapping, across workers processes (by default one per core). Each process keeps one YAKE, so the stoplist is
+    loaded once per process. Results are yielded as documents finish, or in the order of documents if ordered is set.
+    At most max_pending documents (by default 4 per worker) are handed out or held back for ordering at once, so
+    documents can be streamed in, e.g. as a crawler produces pages. A document that fails doesn't stop the rest:
+    one too short to weigh its words yields no keywords, and for any other failure on_error(doc_id, exception) is
+    called (by default the exception is logged) and the document is skipped
+    RETURNS: generator of (doc_id, keywords) tuples, where keywords is a list of (keyword, weight) tuples
+    """
+    if isinstance(documents, Mapping):
+        documents = documents.items()
+    on_error = on_error or _log_error
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yake = YAKE()
+        for doc_id, text in documents:
+            keywords = _extract_keywords(yake, text, n, top_k, window)
+            if isinstance(keywords, Exception):
+                on_error(doc_id, keywords)
+            else:
+                yield doc_id, keywords
+        return
+
+    max_pending = max_pending or 4 * workers
+    documents = enumerate(documents)
+    pending = {} # future -> (position of the document, doc_id)
+    finished = {} # position -> (doc_id, keywords) of documents finished before one ahead of them, if ordered
+    next_position = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_keyword_worker) as executor:
+        try:
+            while True:
+                while len(pending) + len(finished) < max_pending:
+                    document = next(documents, None)
+                    if document is None:
+                        break
+                    position, (doc_id, text) = document
+                    pending[executor.submit(_extract_keywords_in_worker, text, n, top_k, window)] = (position, doc_id)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position, doc_id = pending.pop(future)
+                    keywords = _get_keywords(future)
+                    if isinstance(keywords, Exception):
+                        on_error(doc_id, keywords)
+                        keywords = None # skipped, though if ordered it still takes its turn
+                    if not ordered:
+                        if keywords is not None:
+                            yield doc_id, keywords
+                        continue
+                    finished[position] = (doc_id, keywords)
+                    while next_position in finished:
+                        doc_id, keywords = finished.pop(next_position)
+                        next_position += 1
+                        if keywords is not None:
+                            yield doc_id, keywords
+        finally: # if the caller stops early, documents not started yet are dropped
+            for future in pending:
+                future.cancel()
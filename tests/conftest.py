@@ -0,0 +1,50 @@
+import os
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+
+SOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '__pycache__')
+AUTOCOMPLETE_MODULES = ('helper/levenshtein_distance.py', 'data_structures/lfu_cache.py',
+'data_structures/cache_policies.py', 'autocomplete/misc.py', 'autocomplete/normaliser.py', 'autocomplete/symspell.py',
+'autocomplete/dawg.py', 'autocomplete/frozen_dawg.py', 'autocomplete/minimised_dawg.py', 'autocomplete/snapshot.py',
+'autocomplete/instrumentation.py', 'autocomplete/autocomplete.py', 'autocomplete/router.py')
+KEYWORD_MODULES = ('helper/levenshtein_distance.py', 'keyword_extractor/lexical_units.py',
+'keyword_extractor/load_text.py', 'keyword_extractor/yake.py')
+
+
+def load_modules(paths, module_name='netro', **names):
+    """
+    runs modules one after another in a single module, starting from names, as the package's modules use each
+    other's names without importing them. The module is registered in sys.modules as module_name, so what's
+    defined in it can be pickled by reference and found by forked worker processes, as parallel builds need
+    RETURNS: dictionary (name -> object)
+    """
+    module = ModuleType(module_name)
+    module.__dict__.update(names)
+    sys.modules[module_name] = module
+    for path in paths:
+        path = os.path.join(SOURCE_DIRECTORY, path)
+        with open(path, encoding='utf-8') as f:
+            exec(compile(f.read(), path, 'exec'), module.__dict__)
+    return module.__dict__
+
+
+@pytest.fixture(scope='session')
+def netro():
+    """
+    the autocomplete modules and everything they depend on, as attributes
+    RETURNS: SimpleNamespace
+    """
+    return SimpleNamespace(**load_modules(AUTOCOMPLETE_MODULES))
+
+
+@pytest.fixture(scope='session')
+def keyword_extractor():
+    """
+    the keyword_extractor modules and everything they depend on, including nltk's English stopwords, as attributes
+    RETURNS: SimpleNamespace
+    """
+    corpus = pytest.importorskip('nltk.corpus')
+    return SimpleNamespace(**load_modules(KEYWORD_MODULES, 'netro_keywords', stopwords=corpus.stopwords))
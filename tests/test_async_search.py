@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from test_persistence import make_words
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def hold_searches(autocomplete):
+    """
+    makes an AutoComplete's searches in the executor wait until the returned event is set, counting the searches
+    made by word
+    RETURNS: tuple (threading.Event, dictionary of word -> number of searches)
+    """
+    release = threading.Event()
+    searches = {}
+    search_and_cache = autocomplete._search_and_cache
+
+    def held_search_and_cache(key, word, max_cost, size):
+        searches[word] = searches.get(word, 0) + 1
+        release.wait(5)
+        return search_and_cache(key, word, max_cost, size)
+
+    autocomplete._search_and_cache = held_search_and_cache
+    return release, searches
+
+
+async def wait_for_flights(autocomplete, n):
+    while len(autocomplete._in_flight) < n:
+        await asyncio.sleep(0)
+
+
+def test_concurrent_identical_searches_share_one_computation(netro, executor):
+    words = make_words()
+    expected = netro.AutoComplete(make_words())
+    autocomplete = netro.AutoComplete(words, executor=executor)
+    release, searches = hold_searches(autocomplete)
+    queries = ['abcd', 'Abcd', 'abcd!', 'efgh', 'abcd', 'efgh']
+
+    async def search():
+        tasks = [asyncio.create_task(autocomplete.search_async(query, 2, 5)) for query in queries]
+        await wait_for_flights(autocomplete, 2)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(search())
+    assert results == [expected.search_for_similar_words(query, 2, 5) for query in queries]
+    assert searches == {'abcd': 1, 'efgh': 1}
+    assert autocomplete._in_flight == {}
+    assert asyncio.run(autocomplete.search_async('abcd', 2, 5)) == results[0] # from the cache
+    assert searches == {'abcd': 1, 'efgh': 1}
+
+
+def test_a_sessions_newer_search_cancels_its_older_one(netro, executor):
+    autocomplete = netro.AutoComplete(make_words(), executor=executor)
+    release, searches = hold_searches(autocomplete)
+
+    async def search():
+        older = asyncio.create_task(autocomplete.search_async('abc', 2, 5, session='user'))
+        other = asyncio.create_task(autocomplete.search_async('abc', 2, 5))
+        await wait_for_flights(autocomplete, 1)
+        newer = asyncio.create_task(autocomplete.search_async('abcd', 2, 5, session='user'))
+        await wait_for_flights(autocomplete, 2)
+        release.set()
+        return await asyncio.gather(older, other, newer, return_exceptions=True)
+
+    older, other, newer = asyncio.run(search())
+    assert isinstance(older, asyncio.CancelledError)
+    assert other == autocomplete.search_for_similar_words('abc', 2, 5) # the shared search still finished
+    assert newer == autocomplete.search_for_similar_words('abcd', 2, 5)
+    assert searches == {'abc': 1, 'abcd': 1}
+    assert autocomplete._in_flight == {} and autocomplete._sessions == {}
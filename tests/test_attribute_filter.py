@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from test_persistence import make_words
+
+
+FILTERS = [{'colour': 'red'}, {'colour': {'red', 'blue'}}, {'colour': 'green', 'size': [1, 2]}, {'size': 3},
+{'colour': 'purple'}, {'colour': 'red', 'shape': 'round'}, {'shape': ('round', 'square')}]
+
+
+def make_attributed_words(n=400, seed=0):
+    """
+    generates words as make_words does, most with a colour and a size and some with a shape
+    RETURNS: dictionary (word -> value)
+    """
+    rng = random.Random(seed)
+    words = make_words(n, seed)
+    for value in words.values():
+        if rng.random() < 0.9:
+            value['colour'] = rng.choice(['red', 'green', 'blue'])
+            value['size'] = rng.randint(1, 3)
+        if rng.random() < 0.3:
+            value['shape'] = rng.choice(['round', 'square'])
+    return words
+
+
+def as_condition(attribute_filter):
+    """
+    the function of a word's value that an attribute filter stands for
+    RETURNS: function
+    """
+    def condition(word_info):
+        for attribute, wanted in attribute_filter.items():
+            values = wanted if isinstance(wanted, (set, list, tuple)) else [wanted]
+            if attribute not in word_info or word_info[attribute] not in values:
+                return False
+        return True
+    return condition
+
+
+def get_prefix_words(words):
+    """
+    the words that other words start with, whose descendants a condition is tested on when the word itself meets it
+    RETURNS: list of strings
+    """
+    return sorted({prefix for word in words for prefix in words if word != prefix and word.startswith(prefix)})
+
+
+def assert_filters_match_conditions(indexed, unindexed, ordered=True):
+    for prefix in get_prefix_words(unindexed.words) + ['', 'zz']:
+        for attribute_filter in FILTERS:
+            filtered = indexed.get_all_descendant_words_for_condition(prefix, 10, attribute_filter)
+            expected = unindexed.get_all_descendant_words_for_condition(prefix, 10, as_condition(attribute_filter))
+            assert (filtered if ordered else sorted(filtered)) == (expected if ordered else sorted(expected)), \
+            (prefix, attribute_filter)
+
+
+@pytest.mark.parametrize('indexed_attributes', [None, ['colour'], ['colour', 'size'], ['colour', 'size', 'shape']])
+def test_attribute_filters_match_callable_conditions(netro, indexed_attributes):
+    words = make_attributed_words()
+    indexed = netro.AutoComplete(words, indexed_attributes=indexed_attributes)
+    unindexed = netro.AutoComplete(make_attributed_words())
+    assert (indexed._get_attribute_node_filter({'colour': 'red'}) is not None) == bool(indexed_attributes)
+    assert_filters_match_conditions(indexed, unindexed)
+
+
+def test_attribute_index_follows_added_replaced_and_removed_words(netro):
+    indexed = netro.AutoComplete(make_attributed_words(), indexed_attributes=['colour', 'size', 'shape'])
+    unindexed = netro.AutoComplete(make_attributed_words())
+    rng = random.Random(1)
+    replaced_words = rng.sample(sorted(indexed.words), 60)
+    changes = sorted(make_attributed_words(60, seed=2).items()) + [(word, {'count': 1}) for word in replaced_words]
+    for word, value in changes:
+        value['colour'] = rng.choice(['red', 'purple'])
+    removed_words = rng.sample(sorted(set(indexed.words) - set(replaced_words)), 40)
+    for autocomplete in (indexed, unindexed):
+        for word, value in changes:
+            autocomplete.add_word(word, dict(value))
+        for word in removed_words:
+            autocomplete.remove_word(word)
+        autocomplete.add_word('abzz', {'count': 1, 'colour': 'red', 'shape': 'round'})
+    assert_filters_match_conditions(indexed, unindexed)
+    rebuilt = netro.AutoComplete({word: dict(value) for word, value in indexed.words.items()}, \
+    indexed_attributes=['colour', 'size', 'shape'])
+    assert_filters_match_conditions(rebuilt, indexed, ordered=False) # its nodes' children were added in another order
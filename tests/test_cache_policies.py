@@ -0,0 +1,193 @@
+import random
+
+import pytest
+
+
+class ReferenceLFU:
+    """
+    a slow LFU cache to check LFUCache against: it evicts the least frequently used key, and among those the one
+    least recently used
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = {} # key -> [value, frequency, time of last use]
+        self.time = 0
+
+    def get_value(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return -1
+        self._touch(entry)
+        return entry[0]
+
+    def set_value(self, key, value):
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._touch(entry)
+            return
+        if len(self.entries) >= self.capacity:
+            del self.entries[min(self.entries, key=lambda k: self.entries[k][1:])]
+        self.time += 1
+        self.entries[key] = [value, 1, self.time]
+
+    def _touch(self, entry):
+        self.time += 1
+        entry[1] += 1
+        entry[2] = self.time
+
+
+@pytest.mark.parametrize('capacity', [1, 2, 5, 30])
+def test_lfu_cache_matches_reference(netro, capacity):
+    rng = random.Random(capacity)
+    cache, reference = netro.LFUCache(capacity), ReferenceLFU(capacity)
+    for i in range(3000):
+        key = rng.randrange(capacity * 3)
+        if rng.random() < 0.5:
+            assert cache.get_value(key) == reference.get_value(key)
+        else:
+            cache.set_value(key, i)
+            reference.set_value(key, i)
+        assert len(cache) == len(reference.entries)
+    assert sorted((key, value, frequency) for key, value, frequency in cache.get_entries()) == \
+    sorted((key, entry[0], entry[1]) for key, entry in reference.entries.items())
+
+
+def test_lfu_cache_keeps_frequently_used_keys(netro):
+    cache = netro.LFUCache(2)
+    cache.set_value('a', 1)
+    cache.set_value('b', 2)
+    cache.get_value('a')
+    cache.set_value('c', 3)
+    assert cache.get_value('a') == 1
+    assert cache.get_value('b') == -1
+    assert cache.get_value('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2, 'capacity': 2}
+
+
+def test_lfu_cache_with_zero_capacity_caches_nothing(netro):
+    cache = netro.LFUCache(0)
+    cache.set_value('a', 1)
+    assert cache.get_value('a') == -1
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize('shards', [1, 4])
+def test_lfu_cache_invalidate_and_entries(netro, shards):
+    cache = netro.LFUCache(100, shards=shards)
+    for i in range(50):
+        cache.set_value(i, str(i))
+    for _ in range(3):
+        cache.get_value(8)
+    assert cache.invalidate(lambda key, value: key % 2) == 25
+    assert len(cache) == 25
+    assert cache.get_value(9) == -1
+    entries = cache.get_entries(limit=5)
+    assert entries[0] == (8, '8', 4)
+    assert len(entries) == 5
+
+    warmed = netro.LFUCache(10, shards=shards)
+    warmed.set_entries(cache.get_entries())
+    assert len(warmed) <= 10
+    assert warmed.get_value(8) == '8'
+
+
+def test_sharded_lfu_cache_stays_within_capacity(netro):
+    cache = netro.LFUCache(10, shards=3)
+    for i in range(1000):
+        cache.set_value(i, i)
+    assert len(cache) <= 10
+    assert cache.stats()['evictions'] == 1000 - len(cache)
+
+
+POLICIES = ['LRUCache', 'AgingLFUCache', 'TinyLFUCache', 'TTLCache']
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+@pytest.mark.parametrize('capacity', [1, 2, 3, 10, 100])
+def test_cache_policies_stay_within_capacity(netro, policy, capacity):
+    rng = random.Random(capacity)
+    cache = getattr(netro, policy)(capacity)
+    for i in range(2000):
+        key = int(rng.paretovariate(1)) if rng.random() < 0.7 else rng.randrange(capacity * 5)
+        if rng.random() < 0.4:
+            cache.get_value(key)
+        else:
+            cache.set_value(key, i)
+            assert cache.get_value(key) == i
+        assert len(cache) <= capacity
+    assert cache.stats()['size'] == len(cache)
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_cache_policies_invalidate_and_warm(netro, policy):
+    cache = getattr(netro, policy)(50)
+    for i in range(40):
+        cache.set_value(i, -i)
+    assert cache.invalidate(lambda key, value: key < 10) == 10
+    assert len(cache) == 30
+    assert cache.get_value(5) == -1
+
+    warmed = getattr(netro, policy)(20)
+    warmed.set_entries(cache.get_entries())
+    assert len(warmed) == 20
+    assert all(warmed.get_value(key) == value for key, value, _ in warmed.get_entries())
+
+
+def test_lru_cache_evicts_least_recently_used(netro):
+    cache = netro.LRUCache(2)
+    cache.set_value('a', 1)
+    cache.set_value('b', 2)
+    cache.get_value('a')
+    cache.set_value('c', 3)
+    assert (cache.get_value('a'), cache.get_value('b'), cache.get_value('c')) == (1, -1, 3)
+
+
+def test_aging_lfu_cache_evicts_least_frequently_used(netro):
+    cache = netro.AgingLFUCache(2, aging_period=100)
+    cache.set_value('a', 1)
+    cache.set_value('b', 2)
+    cache.get_value('a')
+    cache.get_value('b')
+    cache.get_value('b')
+    cache.set_value('c', 3)
+    assert (cache.get_value('a'), cache.get_value('b'), cache.get_value('c')) == (-1, 2, 3)
+
+
+def test_ttl_cache_expires_entries(netro):
+    now = [0]
+    cache = netro.TTLCache(10, ttl=5, timer=lambda: now[0])
+    cache.set_value('a', 1)
+    now[0] = 4
+    assert cache.get_value('a') == 1
+    now[0] = 5
+    assert cache.get_value('a') == -1
+    assert len(cache) == 0
+
+
+def test_tiny_lfu_cache_keeps_hot_keys_through_a_scan(netro):
+    cache = netro.TinyLFUCache(100)
+    for _ in range(20):
+        for key in range(50):
+            if cache.get_value(key) == -1:
+                cache.set_value(key, key)
+    for key in range(1000, 3000):
+        cache.set_value(key, key)
+    assert sum(cache.get_value(key) == key for key in range(50)) >= 45
+
+
+@pytest.mark.parametrize('capacity', [1, 2])
+def test_tiny_lfu_cache_with_a_tiny_capacity(netro, capacity):
+    cache = netro.TinyLFUCache(capacity)
+    assert cache.window_capacity + cache.probation_capacity + cache.protected_capacity == capacity
+    for key in 'abcabc':
+        cache.set_value(key, key.upper())
+        assert cache.get_value(key) == key.upper()
+        assert len(cache) <= capacity
+
+
+def test_make_cache(netro):
+    assert isinstance(netro.make_cache(), netro.LFUCache)
+    assert netro.make_cache(netro.LRUCache, capacity=7).capacity == 7
+    cache = netro.TTLCache(3)
+    assert netro.make_cache(cache) is cache
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from test_persistence import QUERIES, make_words
+
+
+def make_queries(words, n=150, seed=0):
+    """
+    generates queries from words with up to three edits each, besides QUERIES, so that some are found and some not
+    RETURNS: list of strings
+    """
+    rng = random.Random(seed)
+    queries = list(QUERIES) + ['', 'abc12', 'bedside', 'be-side', 'abcdefghabcdefgh']
+    for word in rng.sample(sorted(words), n):
+        query = list(word)
+        for _ in range(rng.randint(0, 3)):
+            position = rng.randrange(len(query) + 1)
+            if rng.random() < 0.5 or position == len(query):
+                query.insert(position, rng.choice('abcdefgh '))
+            else:
+                del query[position]
+        queries.append(''.join(query))
+    return queries
+
+
+@pytest.fixture(scope='module')
+def autocomplete(netro):
+    words = make_words()
+    words.update({'abc123': {'count': 3}, 'bed-side': {'count': 4}, 'Bedside': {'count': 5}})
+    return netro.AutoComplete(words)
+
+
+def scan_fuzzy_words(netro, autocomplete, word, max_cost):
+    """
+    the words less than max_cost edits from a word, by measuring its distance to every word's normalised form
+    RETURNS: list of (word, distance) in the order of autocomplete.words
+    """
+    matches = []
+    for _word in autocomplete.words:
+        distance = netro.levenshtein_distance(autocomplete.normaliser.normalise_node_name(_word), word)
+        if distance < max_cost:
+            matches.append((_word, distance))
+    return matches
+
+
+@pytest.mark.parametrize('max_cost', [1, 2, 3])
+def test_dawg_walk_matches_scanning_every_word(netro, autocomplete, max_cost):
+    for query in make_queries(autocomplete.words):
+        assert autocomplete._get_fuzzy_words(query, max_cost) == scan_fuzzy_words(netro, autocomplete, query, max_cost), \
+        query
+
+
+def test_dawg_walk_for_prefixes_matches_walking_each(netro, autocomplete):
+    for query in make_queries(autocomplete.words, seed=1):
+        prefixes = [query[:i] for i in range(len(query), 0, -2)]
+        memo = {}
+        autocomplete._prefetch_fuzzy_words(prefixes, 2, memo)
+        assert {prefix: memo[('fuzzy_words', prefix, 2)] for prefix in prefixes} == \
+        {prefix: autocomplete._get_fuzzy_words(prefix, 2) for prefix in prefixes}, query
+
+
+def copy_words(words):
+    return {word: dict(value) for word, value in words.items()}
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 2])
+def test_symspell_index_matches_the_dawg_walk(netro, autocomplete, max_distance):
+    indexed = netro.AutoComplete(copy_words(autocomplete.words), fuzzy_index=lambda: netro.SymSpellIndex(max_distance))
+    queries = make_queries(autocomplete.words, seed=2)
+    for max_cost in range(1, max_distance + 3):
+        for query in queries:
+            assert indexed._get_fuzzy_words(query, max_cost) == autocomplete._get_fuzzy_words(query, max_cost), \
+            (query, max_cost)
+        assert indexed.search_many(queries, max_cost, 5) == autocomplete.search_many(queries, max_cost, 5)
+
+
+def test_symspell_index_follows_added_and_removed_words(netro, autocomplete):
+    indexed = netro.AutoComplete(copy_words(autocomplete.words), fuzzy_index=lambda: netro.SymSpellIndex(2))
+    walked = netro.AutoComplete(copy_words(autocomplete.words))
+    for changed in (indexed, walked):
+        changed.add_word('bedsides', {'count': 6})
+        changed.add_word('abc1234', {'count': 1})
+        changed.remove_word('bed-side')
+    for query in make_queries(autocomplete.words, n=50, seed=3) + ['bedsid', 'abc 12345']:
+        assert indexed._get_fuzzy_words(query, 3) == walked._get_fuzzy_words(query, 3), query
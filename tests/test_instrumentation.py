@@ -0,0 +1,67 @@
+from collections import Counter
+
+import pytest
+
+from test_fuzzy_search import make_queries
+from test_persistence import make_words
+
+
+def test_searches_are_traced_and_passed_to_the_callback(netro):
+    traces = []
+    instrumentation = netro.SearchInstrumentation(callback=traces.append)
+    autocomplete = netro.AutoComplete(make_words(), instrumentation=instrumentation)
+    uninstrumented = netro.AutoComplete(make_words())
+    queries = make_queries(autocomplete.words, n=40)
+    for query in queries:
+        assert autocomplete.search_for_similar_words(query, 2, 5) == uninstrumented.search_for_similar_words(query, 2, 5)
+    assert [trace.word for trace in traces] == queries
+
+    searched_traces = [trace for trace in traces if trace.calls[netro.SearchStage.cache]] # empty queries stop before
+    assert searched_traces and all(trace.seconds[netro.SearchStage.search] > 0 for trace in traces)
+    for trace in searched_traces:
+        assert trace.calls[netro.SearchStage.search] == 1
+        assert all(seconds >= 0 for seconds in trace.seconds.values())
+        assert trace.cache_hit or trace.find_steps # every search that isn't cached goes through the FindSteps
+
+    stats = instrumentation.stats()
+    for stage in netro.SearchStage:
+        stage_stats = stats['stages'][stage.name]
+        assert stage_stats['calls'] == sum(trace.calls[stage] for trace in traces), stage
+        assert stage_stats['seconds'] == pytest.approx(sum(trace.seconds[stage] for trace in traces)), stage
+        assert sum(calls for _, calls in stage_stats['histogram']) == stage_stats['calls'], stage
+    assert stats['stages']['search']['calls'] == len(queries)
+    assert stats['find_steps'] == {step.name: count for step, count in \
+    Counter(step for trace in traces for step in trace.find_steps).items()}
+
+
+def test_cached_searches_are_marked_as_cache_hits(netro):
+    traces = []
+    autocomplete = netro.AutoComplete(make_words(), instrumentation=netro.SearchInstrumentation(callback=traces.append))
+    autocomplete.search_for_similar_words('abcd', 2, 5)
+    autocomplete.search_for_similar_words('abcd', 2, 5)
+    assert [trace.cache_hit for trace in traces] == [False, True]
+    assert traces[0].find_steps and not traces[1].find_steps
+    assert traces[1].calls[netro.SearchStage.fuzzy_scan] == traces[1].calls[netro.SearchStage.prefix_autofill] == 0
+
+
+def test_a_batch_is_recorded_as_one_trace(netro):
+    traces = []
+    instrumentation = netro.SearchInstrumentation(callback=traces.append)
+    autocomplete = netro.AutoComplete(make_words(), instrumentation=instrumentation)
+    queries = ['abcd', 'abce', 'gh', 'abcd']
+    autocomplete.search_many(queries, 2, 5)
+    assert len(traces) == 1 and traces[0].word == queries
+    assert traces[0].calls[netro.SearchStage.search] == 1
+    assert traces[0].calls[netro.SearchStage.normalisation] >= 1
+    assert instrumentation.stats()['stages']['search']['calls'] == 1
+
+
+def test_recorded_seconds_go_in_the_bucket_of_the_next_bound_up(netro):
+    instrumentation = netro.SearchInstrumentation(bucket_bounds=(0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.002, 0.5):
+        instrumentation.record(netro.SearchStage.cache, seconds)
+    stats = instrumentation.stats()['stages']['cache']
+    assert stats['histogram'] == [(0.001, 2), (0.01, 1), (float('inf'), 1)]
+    assert stats['calls'] == 4 and abs(stats['seconds'] - 0.5035) < 1e-12
+    instrumentation.reset()
+    assert instrumentation.stats()['stages']['cache']['calls'] == 0
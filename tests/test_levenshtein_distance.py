@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+
+def reference_distance(token1, token2):
+    """
+    the Levenshtein distance from the full dynamic programming table
+    RETURNS: integer
+    """
+    table = [[i + j if not i or not j else 0 for j in range(len(token2) + 1)] for i in range(len(token1) + 1)]
+    for i in range(1, len(token1) + 1):
+        for j in range(1, len(token2) + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1,
+            table[i - 1][j - 1] + (token1[i - 1] != token2[j - 1]))
+    return table[-1][-1]
+
+
+def make_pairs(n=400, seed=0):
+    """
+    generates pairs of strings over small alphabets, so they're often close, from empty up to past 64 characters
+    RETURNS: list of tuples
+    """
+    rng = random.Random(seed)
+    pairs = [('', ''), ('', 'abc'), ('abc', ''), ('kitten', 'sitting'), ('flaw', 'lawn'), ('中文', '中')]
+    for _ in range(n):
+        alphabet = rng.choice(['ab', 'abc', 'abcdefgh', 'aé中 '])
+        token1 = ''.join(rng.choices(alphabet, k=rng.choice([rng.randint(0, 8), rng.randint(0, 80)])))
+        token2 = list(token1)
+        for _ in range(rng.randint(0, 6)): # a few edits keep most pairs within a small distance
+            position = rng.randint(0, len(token2))
+            edit = rng.choice(['insert', 'delete', 'substitute'])
+            if edit == 'insert':
+                token2.insert(position, rng.choice(alphabet))
+            elif position < len(token2):
+                if edit == 'delete':
+                    del token2[position]
+                else:
+                    token2[position] = rng.choice(alphabet)
+        pairs.append((token1, ''.join(token2) if rng.random() < 0.8 else ''.join(rng.choices(alphabet, k=10))))
+    return pairs
+
+
+PAIRS = make_pairs()
+
+
+@pytest.mark.parametrize('engine', ['levenshtein_distance', 'bit_parallel_levenshtein_distance'])
+def test_distance_matches_reference(netro, engine):
+    distance = getattr(netro, engine)
+    for token1, token2 in PAIRS:
+        assert distance(token1, token2) == reference_distance(token1, token2), (token1, token2)
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 2, 3, 5])
+def test_banded_distance_matches_reference_within_the_band(netro, max_distance):
+    for token1, token2 in PAIRS:
+        assert netro.banded_levenshtein_distance(token1, token2, max_distance) == \
+        min(reference_distance(token1, token2), max_distance + 1), (token1, token2)
+
+
+def test_batched_distances_match_reference(netro):
+    if netro.np is None:
+        pytest.skip('levenshtein_distances needs numpy')
+    rng = random.Random(1)
+    strings = [token2 for _, token2 in PAIRS]
+    for token in [''] + rng.sample([token1 for token1, _ in PAIRS], 40) + ['a' * 70, 'ab' * 40]:
+        distances = netro.levenshtein_distances(token, netro.encode_strings(strings))
+        assert distances.tolist() == [reference_distance(token, string) for string in strings], token
+
+
+def test_batched_distances_of_no_strings(netro):
+    if netro.np is None:
+        pytest.skip('levenshtein_distances needs numpy')
+    assert netro.levenshtein_distances('abc', netro.encode_strings([])).tolist() == []
+
+
+@pytest.mark.parametrize('strings', [['', ''], ['', 'a', 'ab' * 40, 'a' * 70] + [token2 for _, token2 in PAIRS[:60]]])
+def test_batched_distances_by_rows_match_reference(netro, strings):
+    if netro.np is None:
+        pytest.skip('levenshtein_distances needs numpy')
+    encoded_strings = netro.encode_strings(strings)
+    for token in ['', 'a', 'ba', 'a' * 64, 'a' * 65, 'ab' * 33 + 'c', 'ba' * 45]:
+        expected = [reference_distance(token, string) for string in strings]
+        assert netro.levenshtein_distances(token, encoded_strings).tolist() == expected, token
+        assert netro._levenshtein_distances_by_rows(token, *encoded_strings).tolist() == expected, token
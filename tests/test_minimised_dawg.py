@@ -0,0 +1,66 @@
+import pytest
+
+from test_persistence import QUERIES, describe_dawg, make_words
+
+
+SYNONYMS = {'abga': ['xylophone', 'abg'], 'gh': ['hug'], 'ab': ['abx']}
+
+
+def build(netro, words, **kwargs):
+    return netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'synonyms': SYNONYMS}, {'synonyms': SYNONYMS, 'full_stop_words': ['ab']},
+{'ranking_weights': (1, 0.5, 0.2)}, {'top_k_descendants': 0}])
+def test_minimised_dawg_searches_like_the_built_one(netro, kwargs):
+    words = make_words(1500, seed=1)
+    words.update({'abga': {'count': 7}, 'gh': {'count': 3, 'original_key': 'GH'}, 'ab': {'count': 1}})
+    built = build(netro, words, **kwargs)
+    minimised = build(netro, words, minimise_dawg=True, **kwargs)
+
+    built_nodes, minimised_nodes = describe_dawg(built._dawg), describe_dawg(minimised._dawg)
+    assert [node[:4] for node in minimised_nodes] == [node[:4] for node in built_nodes]
+    assert all(node[4] is None or node[4] == built_node[4] for node, built_node in zip(minimised_nodes, built_nodes))
+    for query in QUERIES + list(words)[:150] + ['xylo', 'hug', 'abx', 'abxd']:
+        for max_cost in (0, 1, 2):
+            assert minimised.search_for_similar_words(query, max_cost, 5) == \
+            built.search_for_similar_words(query, max_cost, 5), (query, max_cost)
+
+
+def test_minimised_dawg_shares_suffixes(netro):
+    words = {f'{stem}{suffix}': {'count': i} for i, (stem, suffix) in
+    enumerate((stem, suffix) for stem in ['walk', 'talk', 'jump', 'pump', 'hunt'] for suffix in ['', 'ed', 'ing', 's'])}
+    built = build(netro, words)
+    minimised = build(netro, words, minimise_dawg=True)
+
+    report = minimised.memory_report()
+    assert report['nodes'] < built.memory_report()['nodes'] / 3
+    assert report['word_nodes'] == len(words)
+    for word, value in words.items():
+        node = minimised._get_word_node(word)
+        assert (node.word, node.count) == (word, value['count'])
+    assert minimised.search_for_similar_words('tal', 0, 3) == [['talks'], ['talking'], ['talked']]
+
+
+def test_minimised_dawg_is_read_only(netro):
+    minimised = build(netro, make_words(50), minimise_dawg=True)
+    with pytest.raises(TypeError):
+        minimised.add_word('new word', {'count': 1})
+    with pytest.raises(TypeError):
+        minimised.remove_word(next(iter(minimised.words)))
+
+
+def test_minimised_dawg_snapshot_and_freeze(netro, tmp_path):
+    words = make_words(300)
+    built = build(netro, words, synonyms=SYNONYMS)
+    minimised = build(netro, words, synonyms=SYNONYMS, minimise_dawg=True)
+    minimised.save(tmp_path / 'words.snapshot')
+    minimised.freeze(tmp_path / 'words.dawg')
+    loaded = netro.AutoComplete.load(tmp_path / 'words.snapshot')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg')
+
+    assert isinstance(loaded._dawg, netro._MinimisedDawgNode)
+    for query in QUERIES + ['xylo', 'hug']:
+        expected = built.search_for_similar_words(query, 1, 5)
+        assert loaded.search_for_similar_words(query, 1, 5) == expected, query
+        assert frozen.search_for_similar_words(query, 1, 5) == expected, query
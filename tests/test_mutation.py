@@ -0,0 +1,122 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from test_persistence import QUERIES, make_words
+
+
+def build(netro, words, **kwargs):
+    return netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+
+
+def test_cached_root_completion_is_invalidated(netro):
+    autocomplete = build(netro, {'apple': {'count': 1}, 'banana': {'count': 2}})
+    assert autocomplete.search_for_similar_words('zq') == [['banana'], ['apple']]
+    autocomplete.add_word('cherry', {'count': 100})
+    assert autocomplete.search_for_similar_words('zq') == [['cherry'], ['banana'], ['apple']]
+    autocomplete.remove_word('cherry')
+    assert autocomplete.search_for_similar_words('zq') == [['banana'], ['apple']]
+
+
+def test_add_remove_and_update_count(netro):
+    autocomplete = build(netro, {'apple': {'count': 1}, 'apply': {'count': 2}})
+    autocomplete.add_word('applet', {'count': 5, 'original_key': 'Applet'})
+    assert autocomplete.search_for_similar_words('appl', 0) == [['Applet'], ['apply'], ['apple']]
+    assert autocomplete.update_count('apple', 9)
+    assert autocomplete.search_for_similar_words('appl', 0) == [['apple'], ['Applet'], ['apply']]
+    assert autocomplete.remove_word('applet')
+    assert not autocomplete.remove_word('applet')
+    assert not autocomplete.update_count('applet', 1)
+    assert autocomplete.search_for_similar_words('appl', 0) == [['apple'], ['apply']]
+    assert 'applet' not in autocomplete.words
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('synonyms', [None, {'abga': ['xylophone'], 'gh': ['hug']}])
+def test_cached_searches_match_a_fresh_build_after_changes(netro, seed, synonyms):
+    rng = random.Random(seed)
+    words = make_words(200, seed=seed)
+    autocomplete = build(netro, words, synonyms=synonyms)
+    queries = QUERIES + ['xylo', 'hug'] + rng.sample(list(words), 10)
+    for step in range(20):
+        for query in queries:
+            autocomplete.search_for_similar_words(query, 1, 5)
+
+        word = rng.choice(list(autocomplete.words))
+        change = rng.choice(['add', 'remove', 'update'])
+        if change == 'add':
+            autocomplete.add_word(word[::-1] + rng.choice('abc'), {'count': rng.randint(0, 60)})
+        elif change == 'remove' and word not in (synonyms or {}):
+            autocomplete.remove_word(word)
+        else:
+            autocomplete.update_count(word, rng.randint(0, 60))
+
+        fresh = build(netro, autocomplete.words, synonyms=synonyms)
+        for query in queries:
+            assert autocomplete.search_for_similar_words(query, 1, 5) == fresh.search_for_similar_words(query, 1, 5), \
+            (step, change, word, query)
+
+
+def test_searches_run_safely_alongside_changes(netro):
+    words = make_words(300)
+    autocomplete = build(netro, words, cache=lambda capacity: netro.LRUCache(0))
+    queries = QUERIES + list(words)[:40]
+    changed_words = list(words)[:60]
+    errors = []
+    done = threading.Event()
+
+    def search():
+        try:
+            while not done.is_set():
+                for query in queries:
+                    autocomplete.search_for_similar_words(query, 2, 5)
+                autocomplete.search_many(queries[:10], 1, 5)
+        except Exception as error:
+            errors.append(error)
+
+    def change():
+        try:
+            for i in range(30):
+                for word in changed_words:
+                    autocomplete.remove_word(word)
+                for word in changed_words:
+                    autocomplete.add_word(word, {'count': i})
+        finally:
+            done.set()
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [threading.Thread(target=search) for _ in range(3)] + [threading.Thread(target=change)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert not errors, errors[:3]
+
+    fresh = build(netro, autocomplete.words)
+    for query in queries:
+        assert autocomplete.search_for_similar_words(query, 2, 5) == fresh.search_for_similar_words(query, 2, 5)
+
+
+def test_read_write_lock_lets_writers_wait_for_readers(netro):
+    lock = netro._ReadWriteLock()
+    events = []
+
+    def write():
+        with lock.writing():
+            with lock.reading(): # a thread can read while it writes
+                events.append('wrote')
+
+    writer = threading.Thread(target=write)
+    with lock.reading():
+        with lock.reading(): # and read again while it reads
+            writer.start()
+            writer.join(0.05)
+            assert events == []
+    writer.join()
+    assert events == ['wrote']
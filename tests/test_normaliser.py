@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+
+def reference_normalised_name(normaliser, name, extra_chars=None):
+    """
+    the normalised form of a name, a character at a time as Normaliser used to find it, comparing each character with
+    the one before it (the last one, for the first)
+    RETURNS: string
+    """
+    name = name.lower()
+    result = []
+    for i, char in enumerate(name):
+        if char in normaliser.valid_chars_for_node_name or (extra_chars and char in extra_chars):
+            if char == '-' and name[i - 1] == '-':
+                continue
+            if char in normaliser.valid_chars_for_integer and name[i - 1] in normaliser.valid_chars_for_string or \
+            char in normaliser.valid_chars_for_string and name[i - 1] in normaliser.valid_chars_for_integer:
+                result.append(' ')
+            result.append(char)
+    return ''.join(result).strip()
+
+
+def reference_without_special_characters(normaliser, name):
+    """
+    a name without the characters that can't be in a node's name, a character at a time as Normaliser used to
+    remove them, dropping any dash straight after another
+    RETURNS: string
+    """
+    result = []
+    previous_char = ''
+    for char in name.lower()[:normaliser.max_word_length]:
+        if char in normaliser.valid_chars_for_node_name and not char == '-' == previous_char:
+            result.append(char)
+        previous_char = char
+    return ''.join(result).strip()
+
+
+def make_names(n=3000, seed=0):
+    """
+    generates names mixing letters, digits, dashes, separators and characters that aren't valid, some longer than
+    a Normaliser keeps
+    RETURNS: list of strings
+    """
+    rng = random.Random(seed)
+    names = ['', '-', '--', '-a-', 'a1', '1a', 'abc123def', 'A-1', '--1--a--', 'x' * 45 + '1', 'İstanbul9']
+    for _ in range(n):
+        alphabet = rng.choice(['ab1-', 'aAbZ09-- :_', 'abc-01-!.', 'aé1ß-İ .', 'abcdefghijklmnopqrstuvwxyz0123456789'])
+        names.append(''.join(rng.choices(alphabet, k=rng.choice([rng.randint(0, 8), rng.randint(0, 50)]))))
+    return names
+
+
+NAMES = make_names()
+
+
+@pytest.mark.parametrize('valid_chars', [(None, None), ('abc-', '01-'), ('abcé', '0123'), ('ab', '-1')])
+@pytest.mark.parametrize('extra_chars', [None, '.', '!-'])
+def test_normalised_names_match_the_character_loop(netro, valid_chars, extra_chars):
+    normaliser = netro.Normaliser(*valid_chars)
+    for name in NAMES:
+        assert normaliser._get_normalised_node_name(name, extra_chars) == \
+        reference_normalised_name(normaliser, name, extra_chars), name
+    expected = [reference_normalised_name(normaliser, name[:normaliser.max_word_length], extra_chars) for name in NAMES]
+    assert [normaliser.normalise_node_name(name, extra_chars) for name in NAMES] == expected
+    assert list(netro.Normaliser(*valid_chars).normalise_many(NAMES, extra_chars)) == expected
+
+
+@pytest.mark.parametrize('valid_chars', [(None, None), ('abc-', '01-'), ('abcé', '0123')])
+def test_removing_special_characters_matches_the_character_loop(netro, valid_chars):
+    normaliser = netro.Normaliser(*valid_chars)
+    for name in NAMES:
+        assert normaliser.remove_any_special_character(name) == reference_without_special_characters(normaliser, name), \
+        name
@@ -0,0 +1,31 @@
+import sys
+
+from test_persistence import QUERIES, describe_dawg, make_words
+
+
+SYNONYMS = {'abga': ['xylophone', 'abg'], 'gh': ['hug']}
+
+
+def build(netro, words, **kwargs):
+    return netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+
+
+def test_parallel_build_matches_the_serial_one(netro):
+    words = make_words(600, seed=2)
+    words.update({'abga': {'count': 7}, 'gh': {'count': 3, 'original_key': 'GH'}})
+    assert netro.AutoComplete._can_build_in_processes()
+    serial = build(netro, words, synonyms=SYNONYMS)
+    parallel = build(netro, words, synonyms=SYNONYMS, build_workers=2)
+
+    assert describe_dawg(parallel._dawg) == describe_dawg(serial._dawg)
+    assert list(parallel.words) == list(serial.words)
+    for query in QUERIES + ['xylo', 'hug']:
+        assert parallel.search_for_similar_words(query, 2, 5) == serial.search_for_similar_words(query, 2, 5), query
+
+
+def test_parallel_build_falls_back_to_serial_when_the_modules_cant_be_imported(netro, monkeypatch):
+    words = make_words(100)
+    monkeypatch.delitem(sys.modules, 'netro')
+    assert not netro.AutoComplete._can_build_in_processes()
+    parallel = build(netro, words, build_workers=2)
+    assert describe_dawg(parallel._dawg) == describe_dawg(build(netro, words)._dawg)
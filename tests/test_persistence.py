@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+
+def make_words(n=400, seed=0):
+    """
+    generates words sharing prefixes and suffixes, with a few original keys
+    RETURNS: dictionary (word -> value)
+    """
+    rng = random.Random(seed)
+    stems = [''.join(rng.choices('abcdefgh', k=rng.randint(2, 5))) for _ in range(60)]
+    words = {}
+    while len(words) < n:
+        word = rng.choice(stems) + rng.choice(['', 'ing', 'er', ' ' + rng.choice(stems)])
+        words[word] = {'count': rng.randint(0, 50)}
+        if rng.random() < 0.1:
+            words[word]['original_key'] = word.upper()
+    return words
+
+
+QUERIES = ['a', 'b', 'ab', 'abc', 'bca', 'gh', 'hgf', 'cab de', 'dd', 'zz', 'efing', 'fader']
+
+
+@pytest.fixture
+def words():
+    return make_words()
+
+
+def test_frozen_dawg_searches_like_a_fresh_build(netro, words, tmp_path):
+    built = netro.AutoComplete({word: dict(value) for word, value in words.items()})
+    built.freeze(tmp_path / 'words.dawg')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg')
+
+    assert dict(frozen.words.items()) == words
+    for query in QUERIES:
+        for max_cost in (0, 1, 2):
+            assert frozen.search_for_similar_words(query, max_cost, 10) == \
+            built.search_for_similar_words(query, max_cost, 10), (query, max_cost)
+
+
+def test_frozen_dawg_keeps_rankings_and_synonyms(netro, words, tmp_path):
+    synonyms = {'abga': ['xylophone', 'abg'], 'gh': ['hug']}
+    built = netro.AutoComplete({word: dict(value) for word, value in words.items()}, synonyms=synonyms)
+    built.freeze(tmp_path / 'words.dawg')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg')
+
+    for prefix in ['', 'a', 'ab', 'd', 'gh']:
+        assert get_ranking(frozen._dawg, prefix) == get_ranking(built._dawg, prefix), prefix
+    assert get_ranking(frozen._dawg, 'd') is not None
+    for query in QUERIES + ['xylo', 'xylophon', 'hug', 'abg']:
+        for max_cost in (0, 2):
+            assert frozen.search_for_similar_words(query, max_cost, 5) == \
+            built.search_for_similar_words(query, max_cost, 5), (query, max_cost)
+
+
+def test_frozen_dawg_ranks_by_traversal_with_other_stop_words(netro, words, tmp_path):
+    built = netro.AutoComplete({word: dict(value) for word, value in words.items()})
+    built.freeze(tmp_path / 'words.dawg')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg', full_stop_words=['ab'])
+    assert frozen._dawg.top_descendants is None
+
+    fresh = netro.AutoComplete({word: dict(value) for word, value in words.items()}, full_stop_words=['ab'])
+    for query in QUERIES:
+        assert frozen.search_for_similar_words(query, 1, 5) == fresh.search_for_similar_words(query, 1, 5), query
+
+
+def test_frozen_dawg_is_read_only(netro, words, tmp_path):
+    built = netro.AutoComplete(words)
+    built.freeze(tmp_path / 'words.dawg')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg')
+    with pytest.raises(TypeError):
+        frozen.add_word('new word', {'count': 1})
+
+
+def test_thawed_frozen_dawg_matches_the_built_one(netro, words, tmp_path):
+    built = netro.AutoComplete(words)
+    built.freeze(tmp_path / 'words.dawg')
+    frozen_dawg = netro._FrozenDawg(str(tmp_path / 'words.dawg'))
+    try:
+        thawed = frozen_dawg.thaw()[0]
+    finally:
+        frozen_dawg.close()
+    assert describe_dawg(thawed) == describe_dawg(built._dawg)
+
+
+@pytest.mark.parametrize('ranking_weights', [None, (1, 0.5, 0.2)])
+def test_snapshot_searches_like_a_fresh_build(netro, words, tmp_path, ranking_weights):
+    synonyms = {'abga': ['xylophone', 'abg'], 'gh': ['hug']}
+    kwargs = {'synonyms': synonyms, 'full_stop_words': ['ab'], 'ranking_weights': ranking_weights}
+    built = netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+    for query in QUERIES[:6]:
+        built.search_for_similar_words(query, 1, 5)
+    built.save(tmp_path / 'words.snapshot')
+    loaded = netro.AutoComplete.load(tmp_path / 'words.snapshot')
+
+    assert dict(loaded.words.items()) == dict(built.words.items())
+    assert describe_dawg(loaded._dawg) == describe_dawg(built._dawg)
+    assert len(loaded._lfu_cache) == len(built._lfu_cache)
+    fresh = netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+    for query in QUERIES + ['xylo', 'hug', 'abg']:
+        for max_cost in (0, 2):
+            assert loaded.search_for_similar_words(query, max_cost, 5) == \
+            fresh.search_for_similar_words(query, max_cost, 5), (query, max_cost)
+
+    loaded.add_word('abgz', {'count': 1000})
+    fresh.add_word('abgz', {'count': 1000})
+    for query in QUERIES[:6]:
+        assert loaded.search_for_similar_words(query, 1, 5) == fresh.search_for_similar_words(query, 1, 5), query
+
+
+def test_frozen_dawg_memory_report_visits_every_node(netro, words, tmp_path):
+    built = netro.AutoComplete({word: dict(value) for word, value in words.items()},
+    synonyms={'abga': ['xylophone'], 'gh': ['hug']})
+    built.freeze(tmp_path / 'words.dawg')
+    frozen = netro.AutoComplete.load_frozen(tmp_path / 'words.dawg')
+
+    report, built_report = frozen._dawg.memory_report(), built._dawg.memory_report()
+    assert {name: report[name] for name in built_report if name != 'bytes'} == \
+    {name: count for name, count in built_report.items() if name != 'bytes'}
+    assert frozen._dawg.get_shared_values() == built._dawg.get_shared_values()
+
+
+def describe_dawg(root):
+    """
+    lists every node's word, original key, count, edges and top descendants in breadth-first order, with nodes
+    referred to by their numbers
+    RETURNS: list
+    """
+    node_ids = {root: 0}
+    nodes = [root]
+    for node in nodes:
+        for child_node in node.children.values():
+            if child_node not in node_ids:
+                node_ids[child_node] = len(nodes)
+                nodes.append(child_node)
+    return [(node.word, node.original_key, node.count,
+    [(letter, node_ids[child_node]) for letter, child_node in node.children.items()],
+    None if node.top_descendants is None else [node_ids[descendant] for descendant in node.top_descendants])
+    for node in nodes]
+
+
+def get_ranking(root, prefix):
+    """
+    gets the words of the top descendants of the node at the end of a prefix
+    RETURNS: list (None for a node left to be ranked by traversal)
+    """
+    node = root
+    for letter in prefix:
+        node = node.children[letter]
+    return None if node.top_descendants is None else [descendant.word for descendant in node.top_descendants]
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+
+WORDS = {word: {'count': count} for count, word in enumerate(['apple', 'apply', 'banana', 'band', 'bandana'], 1)}
+
+
+def make_router(netro, tmp_path, names, **kwargs):
+    """
+    a router with a snapshot of the same words for each name
+    RETURNS: AutoCompleteRouter
+    """
+    router = netro.AutoCompleteRouter(str(tmp_path), **kwargs)
+    for name in names:
+        router.add(name, netro.AutoComplete({word: dict(value) for word, value in WORDS.items()}))
+        router.evict(name)
+    return router
+
+
+def test_max_bytes_counts_the_memory_loaded_shards_take(netro, tmp_path):
+    router = make_router(netro, tmp_path, ['a', 'b', 'c'])
+    shard_bytes = router.get('a').memory_report()['bytes']['total']
+    assert router.stats()['shards'] == {'a': shard_bytes}
+
+    router = make_router(netro, tmp_path, [], max_bytes=2 * shard_bytes)
+    for name in ['a', 'b', 'c']:
+        router.get(name)
+    assert list(router.stats()['shards']) == ['b', 'c']
+    assert router.stats()['bytes'] == 2 * shard_bytes
+
+
+def test_load_locks_are_dropped_once_shards_are_loaded(netro, tmp_path):
+    router = make_router(netro, tmp_path, ['a', 'b'], max_shards=1)
+    barrier = threading.Barrier(4)
+    loaded = []
+
+    def use(name):
+        barrier.wait()
+        loaded.append(router.get(name))
+
+    threads = [threading.Thread(target=use, args=(name,)) for name in ['a', 'a', 'b', 'b']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loaded) == 4 and router._load_locks == {}
+    with pytest.raises(KeyError):
+        router.get('missing')
+    assert router._load_locks == {}
+
+
+def test_shards_saved_with_other_valid_chars_are_not_loaded(netro, tmp_path):
+    router = make_router(netro, tmp_path, ['a'])
+    words = {'apple1': {'count': 1}, 'apple2': {'count': 2}}
+    netro.AutoComplete(words, valid_chars_for_string='abcdefghijklmnopqrstuvwxyz', valid_chars_for_integer='12').save( \
+    str(tmp_path / 'b.snapshot'))
+    assert router.search_for_similar_words('a', 'appl', 0) == [['apply'], ['apple']]
+    with pytest.raises(ValueError):
+        router.get('b')
+    assert 'b' not in router.stats()['shards']
@@ -0,0 +1,38 @@
+import pytest
+
+from test_fuzzy_search import make_queries
+from test_persistence import make_words
+
+
+def build(netro, words, **kwargs):
+    return netro.AutoComplete({word: dict(value) for word, value in words.items()}, **kwargs)
+
+
+def test_ranking_counts_words_shown_by_their_original_key(netro):
+    words = {'apple': {'count': 1}, 'apply': {'count': 2}, 'applet': {'count': 1000, 'original_key': 'Applet'}}
+    autocomplete = build(netro, words, ranking_weights=(1, 1, 0))
+    assert autocomplete.search_for_similar_words('appl', 0, 5) == [['Applet'], ['apply'], ['apple']]
+
+    autocomplete.add_word('applejack', {'count': 500, 'original_key': 'AppleJack'})
+    autocomplete.update_count('applet', 0)
+    assert autocomplete.search_for_similar_words('appl', 0, 5) == [['AppleJack'], ['apply'], ['apple'], ['Applet']]
+
+
+def test_ranking_by_count_orders_results_by_count(netro):
+    words = {f'ab{letter}': {'count': count} for letter, count in zip('cdefg', [3, 50, 1, 20, 8])}
+    autocomplete = build(netro, words, ranking_weights=(1, 1, 0), top_k_descendants=0)
+    assert autocomplete.search_for_similar_words('ab', 0, 3) == [['abd'], ['abf'], ['abg']]
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'synonyms': {'abga': ['xylophone', 'abg'], 'gh': ['hug']}},
+{'full_stop_words': ['ab']}, {'ranking_weights': (1, 0.5, 0.2)}])
+def test_batched_searches_match_searching_one_at_a_time(netro, kwargs):
+    words = make_words()
+    queries = make_queries(words, n=100) + ['Abc', 'ABC', 'xylo', 'hugs', 'a b c', 'abc!']
+    queries += queries[::7] # repeated queries are answered once
+    for max_cost, size in [(1, 3), (2, 5), (3, 10)]:
+        searched_one_at_a_time = build(netro, words, **kwargs)
+        expected = [searched_one_at_a_time.search_for_similar_words(query, max_cost, size) for query in queries]
+        batched = build(netro, words, **kwargs)
+        assert batched.search_many(queries, max_cost, size) == expected, (max_cost, size)
+        assert batched.search_many(queries, max_cost, size) == expected, (max_cost, size) # from the cache
@@ -0,0 +1,123 @@
+import random
+from collections import Counter
+from statistics import StatisticsError
+from types import MappingProxyType
+
+import pytest
+
+
+DOCUMENT = ('Keyword extraction finds the keywords of documents. Keyword extraction ranks candidate keywords by the '
+'features of their words. Documents with more sentences give keyword extraction more features to rank by.')
+
+
+def test_extract_many_keeps_going_past_failing_documents(keyword_extractor):
+    documents = MappingProxyType({'short': 'Hello.', 'not text': None, 'document': DOCUMENT})
+    errors = []
+    results = dict(keyword_extractor.extract_many(documents, workers=1, on_error=lambda *error: errors.append(error)))
+    assert list(results) == ['short', 'document']
+    assert results['short'] == []
+    assert results['document'] == keyword_extractor.YAKE().extract_keywords(DOCUMENT)
+    assert results['document'] and all(isinstance(weight, float) for _, weight in results['document'])
+    assert [(doc_id, type(error)) for doc_id, error in errors] == [('not text', AttributeError)]
+
+
+def test_extract_many_skips_failing_documents_across_processes(keyword_extractor):
+    documents = [(i, None if i % 3 == 1 else DOCUMENT) for i in range(7)]
+    errors = []
+    results = list(keyword_extractor.extract_many(documents, workers=2, ordered=True, max_pending=2, \
+    on_error=lambda *error: errors.append(error)))
+    assert [doc_id for doc_id, _ in results] == [0, 2, 3, 5, 6]
+    assert all(keywords == results[0][1] for _, keywords in results)
+    assert sorted(doc_id for doc_id, _ in errors) == [1, 4]
+    assert all(isinstance(error, AttributeError) for _, error in errors)
+
+
+def test_extract_many_logs_failing_documents_by_default(keyword_extractor, caplog):
+    results = list(keyword_extractor.extract_many([('not text', None), ('document', DOCUMENT)], workers=1))
+    assert [doc_id for doc_id, _ in results] == ['document']
+    assert len(caplog.records) == 1 and "'not text'" in caplog.records[0].getMessage()
+    assert caplog.records[0].exc_info[0] is AttributeError
+
+
+def test_extract_many_takes_pairs(keyword_extractor):
+    results = list(keyword_extractor.extract_many(iter([(1, DOCUMENT), (2, 'Hello.')]), top_k=3, workers=1))
+    assert [doc_id for doc_id, _ in results] == [1, 2]
+    assert len(results[0][1]) == 3
+    assert results[1][1] == []
+
+
+def make_document(n_sentences=40, seed=0):
+    """
+    generates a document of sentences over a small vocabulary, with capitalised words and acronyms, so words recur
+    across sentences and contexts
+    RETURNS: string
+    """
+    rng = random.Random(seed)
+    vocabulary = ['keyword', 'extraction', 'ranks', 'the', 'of', 'candidate', 'phrases', 'NASA', 'Python', 'features',
+    'documents', 'and', 'with', 'words', 'statistics', 'a', 'corpus']
+    return ' '.join(' '.join(rng.choices(vocabulary, k=rng.randint(3, 12))).capitalize() + '.' \
+    for _ in range(n_sentences))
+
+
+def get_features(keyword_extractor, text):
+    """
+    the features YAKE computes for a document's words, with its top keywords
+    RETURNS: tuple (dictionary of word -> features, list of (keyword, weight) tuples)
+    """
+    yake = keyword_extractor.YAKE()
+    keywords = yake.extract_keywords(text)
+    return dict(yake.features), keywords
+
+
+def test_feature_lists_match_feature_arrays(keyword_extractor, monkeypatch):
+    documents = [DOCUMENT] + [make_document(seed=seed) for seed in range(5)]
+    with_arrays = [get_features(keyword_extractor, document) for document in documents]
+    monkeypatch.setitem(keyword_extractor.YAKE._feature_extraction.__globals__, 'np', None)
+    with_lists = [get_features(keyword_extractor, document) for document in documents]
+    for (array_features, array_keywords), (list_features, list_keywords) in zip(with_arrays, with_lists):
+        assert array_features.keys() == list_features.keys()
+        for word, features in array_features.items():
+            assert features.keys() == list_features[word].keys(), word
+            assert list_features[word] == pytest.approx(features, rel=1e-12), word
+        assert [keyword for keyword, _ in list_keywords] == [keyword for keyword, _ in array_keywords]
+        assert [weight for _, weight in list_keywords] == pytest.approx([weight for _, weight in array_keywords])
+    with pytest.raises(StatisticsError):
+        keyword_extractor.YAKE().extract_keywords('Hello.')
+
+
+def reference_contexts(yake, window):
+    """
+    each word's left and right context words as lists, built as YAKE used to build them
+    RETURNS: dictionary (word -> (left context, right context))
+    """
+    contexts = {}
+    for sentence in yake.sentences:
+        block = []
+        for word in (w.lower() for w in sentence.words):
+            if word not in yake.words:
+                block = []
+                continue
+            left_context = block[max(0, len(block) - window):]
+            contexts.setdefault(word, ([], []))[0].extend(left_context)
+            for w in left_context:
+                contexts.setdefault(w, ([], []))[1].append(word)
+            block.append(word)
+    return contexts
+
+
+@pytest.mark.parametrize('window', [1, 2, 3])
+def test_context_counts_match_context_lists(keyword_extractor, window):
+    for document in [DOCUMENT] + [make_document(seed=seed) for seed in range(5)]:
+        yake = keyword_extractor.YAKE()
+        yake.load_document(document)
+        yake.candidate_selection(n=3)
+        yake._vocabulary_building()
+        yake._contexts_building(window=window)
+        contexts = reference_contexts(yake, window)
+        assert set(yake.contexts) == set(contexts)
+        for word, (left_context, right_context) in contexts.items():
+            assert yake.contexts[word] == (Counter(left_context), Counter(right_context)), word
+            assert yake.context_sizes[word] == [len(left_context), len(set(left_context)), len(right_context),
+            len(set(right_context))], word
+            for other_word in yake.words: # the counts the stopword probabilities of candidate_weighting take
+                assert yake.contexts[word][1][other_word] == right_context.count(other_word)